@@ -1,14 +1,81 @@
+import os
+from functools import partial
 from flask import Flask, render_template, session, redirect
-from pymongo import MongoClient
 from controllers.wardrobe_controller import wardrobe_bp
+from config import Config, get_mongo_client
+from dao.indexes import ensure_indexes, verify_indexes
+from services.catalog_cache import CatalogCache
+from services.generator_service import GarmentIndexCache
+from services.similarity_service import SimilarityIndex
+from services.password_hasher import PasswordHashPool
+from services.upload_pipeline import UploadPipeline
+from services.image_derivatives import srcset
+from services.storage import create_storage, image_url, with_image_urls
 
 def create_app():
     app = Flask(__name__)
-    app.secret_key = "dev-secret"
+    app.config.from_object(Config)
 
-    #MongoDB
-    client = MongoClient("mongodb://localhost:27017")
-    app.db = client["mismatch"]
+    #MongoDB (one shared client per process, see config.py)
+    app.mongo_client = get_mongo_client(app.config)
+    app.db = app.mongo_client[app.config["MONGO_DB_NAME"]]
+
+    if app.config["MONGO_ENSURE_INDEXES"]:
+        ensure_indexes(app.db)
+    if app.config["MONGO_VERIFY_INDEXES"]:
+        verify_indexes(app.db)
+
+    #Clothing catalog cache
+    app.catalog_cache = CatalogCache(
+        enabled=app.config["CATALOG_CACHE_ENABLED"],
+        max_entries=app.config["CATALOG_CACHE_MAX_ENTRIES"],
+        ttl=app.config["CATALOG_CACHE_TTL"]
+    )
+    app.garment_indexes = GarmentIndexCache(max_entries=app.config["CATALOG_CACHE_MAX_ENTRIES"])
+    # compatibility matrices per user (services/recommendation_service.py)
+    app.compatibility_indexes = GarmentIndexCache(max_entries=app.config["CATALOG_CACHE_MAX_ENTRIES"])
+    # embeddings of the whole catalog, shared by all users (visibility is checked per query)
+    app.similarity_index = SimilarityIndex(os.path.join(app.root_path, app.config["SIMILARITY_INDEX_DIR"]))
+    # items each user can see in the similarity results, per catalog version
+    app.similarity_views = GarmentIndexCache(max_entries=app.config["CATALOG_CACHE_MAX_ENTRIES"])
+
+    #Argon2 hashing pool
+    app.password_hasher = PasswordHashPool(
+        time_cost=app.config["ARGON2_TIME_COST"],
+        memory_cost=app.config["ARGON2_MEMORY_COST"],
+        parallelism=app.config["ARGON2_PARALLELISM"],
+        workers=app.config["PASSWORD_HASH_WORKERS"],
+        max_queue=app.config["PASSWORD_HASH_QUEUE"],
+        timeout=app.config["PASSWORD_HASH_TIMEOUT"]
+    )
+
+    #Image storage (static folder or S3-compatible bucket)
+    app.storage = create_storage(app.config, app.root_path)
+
+    #Background processing of uploaded images
+    app.upload_pipeline = UploadPipeline(
+        app.db,
+        app.storage,
+        cache=app.catalog_cache,
+        tmp_dir=app.config["UPLOAD_TMP_DIR"],
+        max_bytes=app.config["UPLOAD_MAX_BYTES"],
+        chunk_size=app.config["UPLOAD_CHUNK_SIZE"],
+        max_dimension=app.config["UPLOAD_MAX_DIMENSION"],
+        workers=app.config["UPLOAD_WORKERS"]
+    )
+
+    #Template helpers for (fingerprinted) image URLs and responsive thumbnails
+    app.jinja_env.filters["image_url"] = partial(image_url, app.storage)
+    app.jinja_env.filters["with_image_urls"] = lambda items: [with_image_urls(app.storage, item) for item in items]
+    app.jinja_env.globals["srcset"] = partial(srcset, url=app.storage.url)
+
+    #Request and MongoDB metrics (/metrics)
+    if app.config["METRICS_ENABLED"]:
+        from services.metrics import init_metrics
+        init_metrics(app)
+
+        from controllers.metrics_controller import metrics_bp
+        app.register_blueprint(metrics_bp)
 
     #Blueprints
     from controllers.auth_controller import auth_bp
@@ -29,6 +96,12 @@ def create_app():
     from controllers.wardrobe_controller import wardrobe_bp
     app.register_blueprint(wardrobe_bp)
 
+    from controllers.health_controller import health_bp
+    app.register_blueprint(health_bp)
+
+    from controllers.image_controller import image_bp
+    app.register_blueprint(image_bp)
+
     #Root Route
     @app.route("/")
     def index():
@@ -0,0 +1,65 @@
+"""
+ASGI entry point (async mode)
+The outfit and upload JSON API is served by Quart with pymongo's AsyncMongoClient,
+so one process can keep many I/O-bound requests in flight. Every other route
+is the regular Flask app from app.py.
+
+    hypercorn asgi:app --bind 127.0.0.1:8000
+"""
+
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from quart import Quart
+from app import create_app
+from config import Config, create_async_mongo_client
+
+# path prefixes handled by the async API, everything else goes to Flask
+ASYNC_ROUTES = (
+    "/api/outfits",
+    "/api/save-outfit",
+    "/api/update-outfit/",
+    "/api/delete-outfit/",
+    "/api/upload-clothing",
+    "/api/delete-clothing/",
+)
+
+def create_async_api(flask_app):
+    api = Quart(__name__)
+    api.config.from_object(Config)
+
+    # shared with the Flask app: uploads still write through the sync client
+    api.sync_db = flask_app.db
+    api.catalog_cache = flask_app.catalog_cache
+    api.upload_pipeline = flask_app.upload_pipeline
+    api.storage = flask_app.storage
+
+    @api.before_serving
+    async def connect():
+        api.mongo_client = create_async_mongo_client(api.config)
+        api.db = api.mongo_client[api.config["MONGO_DB_NAME"]]
+
+    @api.after_serving
+    async def disconnect():
+        await api.mongo_client.close()
+
+    from controllers.async_outfit_controller import async_outfit_bp
+    api.register_blueprint(async_outfit_bp)
+
+    from controllers.async_upload_controller import async_upload_bp
+    api.register_blueprint(async_upload_bp)
+
+    return api
+
+def create_asgi_app():
+    flask_app = create_app()
+    api = create_async_api(flask_app)
+    wsgi = AsyncioWSGIMiddleware(flask_app)
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan" or scope.get("path", "").startswith(ASYNC_ROUTES):
+            await api(scope, receive, send)
+        else:
+            await wsgi(scope, receive, send)
+
+    return app
+
+app = create_asgi_app()
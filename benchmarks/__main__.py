@@ -0,0 +1,97 @@
+"""
+MisMatch Benchmark Suite
+Seeds a throwaway database with synthetic users, uploads and outfits, times
+the service methods and drives concurrent HTTP load against the app. Results
+are printed and written as JSON (with the git commit), so runs on different
+commits can be compared.
+
+Needs a running mongod. Run from the project root:
+    python -m benchmarks all --users 200 --output results.json
+    python -m benchmarks seed --users 1000 --uploads 20 --outfits 50
+    python -m benchmarks micro
+    python -m benchmarks load --concurrency 16 --duration 30 [--url http://127.0.0.1:8000]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from pymongo import MongoClient
+
+from benchmarks.load import run_load, start_server
+from benchmarks.micro import run_micro
+from benchmarks.seed import seed
+from config import Config
+
+DATABASE_NAME = "mismatch_bench"
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_stats(title, results):
+    print(f"\n{title}")
+    print(f"{'':<30} {'count':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in results.items():
+        print(f"{name:<30} {stats['count']:>6} {stats['mean_ms']:>9.2f} {stats['p50_ms']:>9.2f} "
+              f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MisMatch benchmark suite")
+    parser.add_argument("command", choices=["seed", "micro", "load", "all"])
+    parser.add_argument("--mongo-uri", default=Config.MONGO_URI, help="default: MONGO_URI of config.py")
+    parser.add_argument("--db", default=DATABASE_NAME, help="throwaway database, dropped and refilled by seed")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--uploads", type=int, default=10, help="uploads per user")
+    parser.add_argument("--outfits", type=int, default=20, help="saved outfits per user")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the data and the request mix")
+    parser.add_argument("--iterations", type=int, default=200, help="calls per micro-benchmark")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent HTTP clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of HTTP load")
+    parser.add_argument("--url", help="load test this server instead of starting the app in-process")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    client = MongoClient(args.mongo_uri)
+    db = client[args.db]
+    results = {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("command", "output")}
+    }
+
+    if args.command in ("seed", "all"):
+        results["seed"] = seed(db, args.users, args.uploads, args.outfits, seed=args.seed)
+        print(f"Seeded {args.db}: {results['seed']}")
+
+    if args.command in ("micro", "all"):
+        results["micro"] = run_micro(db, iterations=args.iterations, seed=args.seed)
+        print_stats("Service methods", results["micro"])
+
+    if args.command in ("load", "all"):
+        url = args.url
+        if not url:
+            url, _ = start_server(args.mongo_uri, args.db)
+        usernames = [user["username"] for user in db.users.find({}, {"username": 1}).sort("username", 1)]
+        results["load"] = run_load(url, usernames, args.concurrency, args.duration, args.seed)
+        print_stats(f"HTTP load ({args.concurrency} clients, {results['load']['requests_per_s']} req/s)",
+                    results["load"]["routes"])
+        if results["load"]["errors"]:
+            print(f"Errors: {results['load']['errors']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Sync vs Async Load Test
+Drives concurrent GET /api/outfits requests against the WSGI app and the
+ASGI app and compares throughput and latency.
+
+Start both servers first (same MongoDB):
+    python app.py                                  -> http://127.0.0.1:5000
+    hypercorn asgi:app --bind 127.0.0.1:8000       -> http://127.0.0.1:8000
+
+Run from the project root: python -m benchmarks.bench_asgi
+"""
+
+import statistics
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+from http.cookiejar import CookieJar
+
+TARGETS = {
+    "sync (flask)": "http://127.0.0.1:5000",
+    "async (asgi)": "http://127.0.0.1:8000",
+}
+CONCURRENCY = [1, 8, 32, 64]
+REQUESTS_PER_CLIENT = 20
+SAVED_OUTFITS = 50
+
+
+def login(base_url):
+    """registers a throwaway user and returns its session cookie header"""
+    jar = CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    password = "bench-password"
+    form = urllib.parse.urlencode({
+        "username": f"bench_{uuid.uuid4().hex[:8]}",
+        "password": password,
+        "password_repeat": password
+    }).encode()
+    opener.open(base_url + "/register", form)
+
+    cookie = next(c for c in jar if c.name == "session")
+    return f"session={cookie.value}"
+
+
+def save_outfits(base_url, cookie):
+    for i in range(SAVED_OUTFITS):
+        request = urllib.request.Request(
+            base_url + "/api/save-outfit",
+            data=f'{{"outfit_name": "Bench {i}"}}'.encode(),
+            headers={"Content-Type": "application/json", "Cookie": cookie},
+            method="POST"
+        )
+        urllib.request.urlopen(request).read()
+
+
+def run(base_url, cookie, clients):
+    """returns (requests/s, median ms, p95 ms, errors)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def client():
+        for _ in range(REQUESTS_PER_CLIENT):
+            request = urllib.request.Request(base_url + "/api/outfits", headers={"Cookie": cookie})
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(request, timeout=30).read()
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - start
+
+    if not latencies:
+        return 0.0, 0.0, 0.0, errors[0]
+
+    latencies.sort()
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    return len(latencies) / total, statistics.median(latencies), p95, errors[0]
+
+
+def main():
+    # both apps share the session secret, so one login works for both
+    login_url = next(iter(TARGETS.values()))
+    cookie = login(login_url)
+    save_outfits(login_url, cookie)
+
+    print(f"{'app':<14} {'clients':>7} | {'req/s':>8} {'median ms':>10} {'p95 ms':>8} {'errors':>7}")
+    print("-" * 62)
+
+    for name, base_url in TARGETS.items():
+        for clients in CONCURRENCY:
+            throughput, median, p95, errors = run(base_url, cookie, clients)
+            print(f"{name:<14} {clients:>7} | {throughput:>8.1f} {median:>10.1f} {p95:>8.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
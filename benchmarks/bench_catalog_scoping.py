@@ -0,0 +1,112 @@
+"""
+Catalog Scoping Benchmark
+Shows that the cost of one user's wardrobe query stays flat as the number of
+users grows: for every user count it times ClothingService.get_catalog(user_id)
+(uncached, defaults + the caller's uploads, served by the (user_id, category)
+index) against the old unscoped query that returned everybody's uploads, and
+reports the returned documents and the index keys examined.
+
+Needs a running mongod, writes only into the throwaway database below.
+Run from the project root: python -m benchmarks.bench_catalog_scoping
+"""
+
+import statistics
+import time
+from datetime import datetime
+
+from pymongo import MongoClient
+
+from dao.indexes import INDEXES
+from dao.projections import CATALOG_CARD
+from services.clothing_service import CATEGORIES, READY, ClothingService, visible_to
+
+MONGODB_URI = "mongodb://localhost:27017/"
+DATABASE_NAME = "mismatch_bench"
+
+DEFAULT_ITEMS = 54
+UPLOADS_PER_USER = 20
+USER_COUNTS = [10, 100, 1000, 5000]
+REPEAT = 20
+
+
+def seed(db, users, start):
+    """adds the uploads of users start..users-1"""
+    uploads = [{
+        "category": CATEGORIES[i % 3],
+        "subcategory": "custom",
+        "subcategory_name": "custom_upload",
+        "color": "custom",
+        "image_path": f"static/images/uploads/{user}_{i}.jpg",
+        "status": "ready",
+        "is_default": False,
+        "user_id": f"user{user}",
+        "created_at": datetime.utcnow()
+    } for user in range(start, users) for i in range(UPLOADS_PER_USER)]
+    if uploads:
+        db.clothing.insert_many(uploads)
+
+
+def seed_defaults(db):
+    db.clothing.drop()
+    for keys, options in INDEXES["clothing"]:
+        db.clothing.create_index(keys, **options)
+
+    db.clothing.insert_many([{
+        "category": CATEGORIES[i % 3],
+        "subcategory": "1a",
+        "subcategory_name": "oversized_tshirt",
+        "color": "black",
+        "image_path": f"static/images/clothing/tops/{i}_black_round.png",
+        "is_default": True,
+        "created_at": datetime.utcnow()
+    } for i in range(DEFAULT_ITEMS)])
+
+
+def median_ms(fn):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def keys_examined(collection, query):
+    stats = collection.find(query).explain().get("executionStats", {})
+    return stats.get("totalKeysExamined", 0), stats.get("totalDocsExamined", 0)
+
+
+def main():
+    client = MongoClient(MONGODB_URI)
+    db = client[DATABASE_NAME]
+    seed_defaults(db)
+    service = ClothingService(db)
+
+    print(f"{'users':>6} {'scoped ms':>10} {'docs':>6} {'keys':>6} {'unscoped ms':>12} {'docs':>7} {'keys':>7}")
+    print("-" * 62)
+
+    seeded = 0
+    for users in USER_COUNTS:
+        seed(db, users, seeded)
+        seeded = users
+        user_id = f"user{users // 2}"
+
+        scoped_query = {"category": {"$in": CATEGORIES}, **visible_to(user_id), **READY}
+        scoped_ms = median_ms(lambda: service.get_catalog(user_id))
+        scoped_docs = sum(len(items) for items in service.get_catalog(user_id).values())
+        scoped_keys, _ = keys_examined(db.clothing, scoped_query)
+
+        # before the scoping every dashboard loaded all uploads
+        unscoped_query = {"category": {"$in": CATEGORIES}, **READY}
+        unscoped_ms = median_ms(lambda: list(db.clothing.find(unscoped_query, CATALOG_CARD)))
+        unscoped_docs = db.clothing.count_documents(unscoped_query)
+        unscoped_keys, _ = keys_examined(db.clothing, unscoped_query)
+
+        print(f"{users:>6} {scoped_ms:>10.2f} {scoped_docs:>6} {scoped_keys:>6} "
+              f"{unscoped_ms:>12.2f} {unscoped_docs:>7} {unscoped_keys:>7}")
+
+    client.drop_database(DATABASE_NAME)
+
+
+if __name__ == "__main__":
+    main()
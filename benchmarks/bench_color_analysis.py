@@ -0,0 +1,121 @@
+"""
+Color Analysis Benchmark
+Times the dominant-color extraction of services/color_analysis.py per image:
+the catalog photos in static/images/clothing and synthetic uploads at the
+maximum upload size, split into decode + downsample and the vectorized
+quantization. Also compares the vectorized quantization against a plain
+Python loop and reports how often the detected color matches the filename.
+
+Needs no database. Run from the project root: python -m benchmarks.bench_color_analysis
+"""
+
+import os
+import statistics
+import time
+
+import numpy as np
+from PIL import Image
+
+from services.color_analysis import PALETTE, analyze_colors, foreground_pixels, quantize, to_lab
+
+CLOTHING_FOLDER = "static/images/clothing"
+SYNTHETIC_SIZES = [(800, 1000), (1600, 1600)]
+SYNTHETIC_COUNT = 10
+# filename colors that are spelled differently or mistyped
+COLOR_ALIASES = {"gray": "grey", "grown": "brown"}
+
+
+def catalog_images():
+    """(path, color from the filename) of the catalog photos"""
+    images = []
+    for folder in sorted(os.listdir(CLOTHING_FOLDER)):
+        directory = os.path.join(CLOTHING_FOLDER, folder)
+        for filename in sorted(os.listdir(directory)):
+            parts = os.path.splitext(filename)[0].split("_")
+            if len(parts) >= 2 and parts[0] != "default":
+                images.append((os.path.join(directory, filename), COLOR_ALIASES.get(parts[1], parts[1])))
+    return images
+
+
+def synthetic_image(size, seed):
+    """a noisy garment-like blob on a light background"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    pixels = np.full((height, width, 3), 249, dtype=np.uint8)
+    color = rng.integers(20, 230, 3)
+    y, x = np.ogrid[:height, :width]
+    inside = ((x - width / 2) / (width / 3)) ** 2 + ((y - height / 2) / (height / 2.5)) ** 2 < 1
+    noise = rng.normal(0, 12, (height, width, 3))
+    pixels[inside] = np.clip(color + noise[inside], 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels)
+
+
+def quantize_loop(lab):
+    """reference: nearest palette color per pixel in pure Python"""
+    palette = to_lab(np.array(list(PALETTE.values()))).tolist()
+    labels = []
+    for l, a, b in lab.tolist():
+        distances = [(l - pl) ** 2 + (a - pa) ** 2 + (b - pb) ** 2 for pl, pa, pb in palette]
+        labels.append(distances.index(min(distances)))
+    return labels
+
+
+def report(name, timings):
+    timings.sort()
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(f"{name:<28} {len(timings):>6} {statistics.mean(timings):>10.2f} {statistics.median(timings):>10.2f} {p95:>8.2f}")
+
+
+def main():
+    print(f"{'images':<28} {'count':>6} {'mean ms':>10} {'median ms':>10} {'p95 ms':>8}")
+    print("-" * 66)
+
+    matches = 0
+    catalog = catalog_images()
+    total, prepare, quantization = [], [], []
+    for path, expected in catalog:
+        start = time.perf_counter()
+        with Image.open(path) as image:
+            image.load()
+            decoded = time.perf_counter()
+            lab = foreground_pixels(image)
+            prepared = time.perf_counter()
+            color, _ = analyze_colors(image)
+        end = time.perf_counter()
+
+        quantize_start = time.perf_counter()
+        quantize(lab)
+        quantization.append((time.perf_counter() - quantize_start) * 1000)
+        prepare.append((prepared - decoded) * 1000)
+        total.append((end - start) * 1000)
+        matches += color == expected
+
+    report("catalog (full analysis)", total)
+    report("catalog (downsample+mask)", prepare)
+    report("catalog (quantize)", quantization)
+
+    for size in SYNTHETIC_SIZES:
+        images = [synthetic_image(size, seed) for seed in range(SYNTHETIC_COUNT)]
+        timings = []
+        for image in images:
+            start = time.perf_counter()
+            analyze_colors(image)
+            timings.append((time.perf_counter() - start) * 1000)
+        report(f"upload {size[0]}x{size[1]}", timings)
+
+    # vectorized vs loop on the same pixels
+    with Image.open(catalog[0][0]) as image:
+        lab = foreground_pixels(image)
+    start = time.perf_counter()
+    quantize(lab)
+    vectorized = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    quantize_loop(lab)
+    loop = (time.perf_counter() - start) * 1000
+
+    print(f"\nQuantizing {len(lab)} pixels: numpy {vectorized:.2f} ms, python loop {loop:.2f} ms ({loop / vectorized:.0f}x)")
+    print(f"Detected color matches the filename: {matches}/{len(catalog)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Login Throughput Benchmark
+Runs concurrent Argon2 verifications (the expensive part of a login) once
+inline in the calling threads, like before, and once through the bounded
+PasswordHashPool. Reports logins/s, latency and fast 503 rejections.
+
+Needs no database. Run from the project root: python -m benchmarks.bench_login
+"""
+
+import statistics
+import threading
+import time
+
+from argon2 import PasswordHasher
+
+from services.password_hasher import HasherBusyError, PasswordHashPool
+
+CONCURRENCY = [1, 4, 16, 64]
+LOGINS_PER_CLIENT = 5
+PASSWORD = "correct horse battery staple"
+
+
+def run(verify, clients):
+    """returns (logins/s, median ms, p95 ms, rejected) for the given number of clients"""
+    latencies = []
+    rejected = [0]
+    lock = threading.Lock()
+
+    def client():
+        for _ in range(LOGINS_PER_CLIENT):
+            start = time.perf_counter()
+            try:
+                verify()
+            except HasherBusyError:
+                with lock:
+                    rejected[0] += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - start
+
+    if not latencies:
+        return 0.0, 0.0, 0.0, rejected[0]
+
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    return len(latencies) / total, statistics.median(latencies), p95, rejected[0]
+
+
+def main():
+    inline = PasswordHasher()
+    pool = PasswordHashPool()
+    password_hash = inline.hash(PASSWORD)
+
+    modes = [
+        ("inline", lambda: inline.verify(password_hash, PASSWORD)),
+        ("pool", lambda: pool.verify(password_hash, PASSWORD)),
+    ]
+
+    print(f"{'mode':<7} {'clients':>7} | {'logins/s':>9} {'median ms':>10} {'p95 ms':>8} {'503s':>6}")
+    print("-" * 56)
+
+    for name, verify in modes:
+        for clients in CONCURRENCY:
+            throughput, median, p95, rejected = run(verify, clients)
+            print(f"{name:<7} {clients:>7} | {throughput:>9.1f} {median:>10.1f} {p95:>8.1f} {rejected:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Projection Micro-Benchmark
+Compares wire size and fetch/decode time of full documents against the
+named projections in dao/projections.py.
+
+Needs a running mongod, writes only into the throwaway database below.
+Run from the project root: python -m benchmarks.bench_projections
+"""
+
+import time
+from datetime import datetime
+
+from bson.raw_bson import RawBSONDocument
+from pymongo import MongoClient
+
+from dao.projections import AUTH_CHECK, CATALOG_CARD, OUTFIT_THUMBNAIL
+
+MONGODB_URI = "mongodb://localhost:27017/"
+DATABASE_NAME = "mismatch_bench"
+
+CLOTHING_COUNT = 2000
+REPEAT = 20
+
+
+def seed(db):
+    db.clothing.delete_many({})
+    db.users.delete_many({})
+
+    db.clothing.insert_many([{
+        "category": ["top", "bottom", "footwear"][i % 3],
+        "subcategory": "1a",
+        "subcategory_name": "oversized_tshirt",
+        "color": "black",
+        "neckline": "round",
+        "length": None,
+        "image_path": f"static/images/clothing/tops/{i}_black_round.png",
+        "is_default": False,
+        "created_at": datetime.utcnow()
+    } for i in range(CLOTHING_COUNT)])
+
+    db.users.insert_one({
+        "username": "bench_user",
+        "password_hash": "$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 80,
+        "avatar": "🙂",
+        "created_at": datetime.utcnow()
+    })
+
+
+def wire_bytes(collection, query, projection):
+    """total BSON size of all returned documents"""
+    raw = collection.with_options(codec_options=collection.codec_options.with_options(
+        document_class=RawBSONDocument))
+    return sum(len(doc.raw) for doc in raw.find(query, projection))
+
+
+def fetch_ms(fn):
+    """best time of fn in ms"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(name, collection, query, projection, fetch):
+    full_bytes = wire_bytes(collection, query, None)
+    lean_bytes = wire_bytes(collection, query, projection)
+    full_ms = fetch_ms(lambda: fetch(None))
+    lean_ms = fetch_ms(lambda: fetch(projection))
+
+    print(f"{name:<18} | {full_bytes:>10} {lean_bytes:>10} | {full_ms:>8.2f} {lean_ms:>8.2f}")
+
+
+def main():
+    client = MongoClient(MONGODB_URI)
+    db = client[DATABASE_NAME]
+    seed(db)
+
+    print(f"{'projection':<18} | {'full bytes':>10} {'lean bytes':>10} | {'full ms':>8} {'lean ms':>8}")
+    print("-" * 64)
+
+    report("CATALOG_CARD", db.clothing, {}, CATALOG_CARD,
+           lambda projection: list(db.clothing.find({}, projection)))
+    report("OUTFIT_THUMBNAIL", db.clothing, {}, OUTFIT_THUMBNAIL,
+           lambda projection: list(db.clothing.find({}, projection)))
+    report("AUTH_CHECK", db.users, {"username": "bench_user"}, AUTH_CHECK,
+           lambda projection: db.users.find_one({"username": "bench_user"}, projection))
+
+    client.drop_database(DATABASE_NAME)
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
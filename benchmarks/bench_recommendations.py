@@ -0,0 +1,117 @@
+"""
+Recommendation Benchmark
+Times the compatibility matrices of services/recommendation_service.py on
+synthetic wardrobes: building the matrices from scratch, adding and removing
+one garment incrementally, and top-K outfits against a brute-force ranking of
+every tops x bottoms x footwear combination. The same wardrobe as shared
+default items plus a user's uploads (WardrobeIndex) shows the top-K time with
+uploads and the memory stored per user next to the shared matrices.
+
+Needs no database. Run from the project root: python -m benchmarks.bench_recommendations
+"""
+
+import itertools
+import statistics
+import time
+
+import numpy as np
+
+from services.color_analysis import PALETTE_NAMES
+from services.recommendation_service import CompatibilityIndex, SUBCATEGORY_STYLES, WardrobeIndex
+
+WARDROBE_SIZES = [20, 100, 400]
+K = 10
+UPLOADS = 10
+RUNS = 5
+# brute force in Python is only timed up to this many items per category
+BRUTE_FORCE_MAX = 100
+
+
+def wardrobe(size, seed):
+    """size synthetic items per category with random histograms"""
+    rng = np.random.default_rng(seed)
+    subcategories = list(SUBCATEGORY_STYLES)
+    items = []
+    for category in ["top", "bottom", "footwear"]:
+        for i in range(size):
+            histogram = rng.dirichlet(np.full(len(PALETTE_NAMES), 0.3))
+            items.append({
+                "_id": f"{category}-{i}",
+                "category": category,
+                "subcategory_name": subcategories[rng.integers(len(subcategories))],
+                "color_histogram": histogram.tolist()
+            })
+    return items
+
+
+def brute_force(index, k):
+    scores = []
+    tb, bf, tf = (index.scores[pair] for pair in [("top", "bottom"), ("bottom", "footwear"), ("top", "footwear")])
+    for t, b, f in itertools.product(range(tb.shape[0]), range(bf.shape[0]), range(bf.shape[1])):
+        scores.append(tb[t, b] + bf[b, f] + tf[t, f])
+    return sorted(scores, reverse=True)[:k]
+
+
+def matrix_kb(matrices):
+    return sum(matrix.nbytes for matrix in matrices) / 1024
+
+
+def timed(function):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    print(f"{'items/category':>14} {'build ms':>10} {'add ms':>8} {'remove ms':>10} {'top-k ms':>9} {'brute ms':>10} "
+          f"{'uploads top-k ms':>17} {'shared KB':>10} {'per user KB':>12}")
+    print("-" * 108)
+
+    for size in WARDROBE_SIZES:
+        items = wardrobe(size, size)
+
+        def build():
+            index = CompatibilityIndex()
+            index.add(items)
+            return index
+
+        build_ms, index = timed(build)
+        extra = wardrobe(1, size + 1)[0]
+        start = time.perf_counter()
+        index.add([extra])
+        add_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index.remove({extra["_id"]})
+        remove_ms = (time.perf_counter() - start) * 1000
+
+        top_k_ms, best = timed(lambda: index.top_k(K))
+
+        brute = "-"
+        if size <= BRUTE_FORCE_MAX:
+            brute_ms, expected = timed(lambda: brute_force(index, K))
+            assert np.allclose([score for score, *_ in best], [score / 3 for score in expected])
+            brute = f"{brute_ms:.2f}"
+
+        # UPLOADS uploads per category of one user on top of the shared matrices
+        uploads = [dict(item, _id=f"upload-{item['_id']}") for item in wardrobe(UPLOADS, size + 2)]
+        user = WardrobeIndex(index)
+        user.uploads.add(uploads)
+        user.rebase(index)
+        uploads_ms, user_best = timed(lambda: user.top_k(K))
+
+        combined = CompatibilityIndex()
+        combined.add(items + uploads)
+        assert np.allclose([score for score, *_ in user_best], [score for score, *_ in combined.top_k(K)])
+
+        shared_kb = matrix_kb(index.scores.values())
+        user_kb = matrix_kb([*user.rows.values(), *user.columns.values(), *user.uploads.scores.values()])
+
+        print(f"{size:>14} {build_ms:>10.2f} {add_ms:>8.2f} {remove_ms:>10.2f} {top_k_ms:>9.2f} {brute:>10} "
+              f"{uploads_ms:>17.2f} {shared_kb:>10.0f} {user_kb:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
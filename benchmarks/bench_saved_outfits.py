@@ -0,0 +1,122 @@
+"""
+Saved Outfits Benchmark
+Compares Mongo round trips and latency of OutfitService.get_user_outfits
+(one $in query for all garments) against the old three find_one calls per outfit.
+
+Needs a running mongod, writes only into the throwaway database below.
+Run from the project root: python -m benchmarks.bench_saved_outfits
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import MongoClient, monitoring
+
+from services.outfit_service import OutfitService
+
+MONGODB_URI = "mongodb://localhost:27017/"
+DATABASE_NAME = "mismatch_bench"
+
+OUTFIT_COUNTS = [10, 100, 300, 1000]
+GARMENTS_PER_CATEGORY = 50
+REPEAT = 5
+BENCH_USER = "bench_user"
+
+
+class CommandCounter(monitoring.CommandListener):
+    """counts every command sent to the server (= round trips)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def legacy_get_user_outfits(db, user_id):
+    """old implementation: one find_one per garment and outfit"""
+    outfits = list(db.outfits.find({"user_id": user_id}).sort("created_at", -1))
+
+    for outfit in outfits:
+        outfit['_id'] = str(outfit['_id'])
+        outfit['top'] = db.clothing.find_one({"_id": ObjectId(outfit['top_id'])})
+        outfit['bottom'] = db.clothing.find_one({"_id": ObjectId(outfit['bottom_id'])})
+        outfit['footwear'] = db.clothing.find_one({"_id": ObjectId(outfit['footwear_id'])})
+
+    return outfits
+
+
+def seed(db, outfit_count):
+    """creates garments and outfit_count outfits for the benchmark user"""
+    db.clothing.delete_many({})
+    db.outfits.delete_many({})
+
+    garments = {}
+    for category in ['top', 'bottom', 'footwear']:
+        docs = [{
+            "category": category,
+            "subcategory": "1",
+            "subcategory_name": "bench",
+            "color": "black",
+            "image_path": f"static/images/clothing/{category}/{i}.png",
+            "is_default": False,
+            "created_at": datetime.utcnow()
+        } for i in range(GARMENTS_PER_CATEGORY)]
+        garments[category] = [str(_id) for _id in db.clothing.insert_many(docs).inserted_ids]
+
+    now = datetime.utcnow()
+    db.outfits.insert_many([{
+        "user_id": BENCH_USER,
+        "outfit_name": f"My Outfit {i + 1}",
+        "top_id": random.choice(garments['top']),
+        "bottom_id": random.choice(garments['bottom']),
+        "footwear_id": random.choice(garments['footwear']),
+        "created_at": now - timedelta(minutes=i)
+    } for i in range(outfit_count)])
+
+
+def measure(counter, fn):
+    """returns (round trips, best latency in ms) of fn"""
+    best = None
+    trips = 0
+    for _ in range(REPEAT):
+        counter.count = 0
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        trips = counter.count
+        best = elapsed if best is None else min(best, elapsed)
+    return trips, best
+
+
+def main():
+    counter = CommandCounter()
+    client = MongoClient(MONGODB_URI, event_listeners=[counter])
+    db = client[DATABASE_NAME]
+    service = OutfitService(db)
+
+    print(f"{'outfits':>8} | {'legacy trips':>12} {'legacy ms':>10} | {'batched trips':>13} {'batched ms':>10}")
+    print("-" * 64)
+
+    for outfit_count in OUTFIT_COUNTS:
+        seed(db, outfit_count)
+
+        legacy_trips, legacy_ms = measure(counter, lambda: legacy_get_user_outfits(db, BENCH_USER))
+        batched_trips, batched_ms = measure(counter, lambda: service.get_user_outfits(BENCH_USER))
+
+        print(f"{outfit_count:>8} | {legacy_trips:>12} {legacy_ms:>10.1f} | {batched_trips:>13} {batched_ms:>10.1f}")
+
+    client.drop_database(DATABASE_NAME)
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Similarity Search Benchmark
+Times /api/similar's index (services/similarity_service.py) on synthetic
+catalogs up to 100k items: writing and memory-mapping the on-disk index,
+adding uploads to the in-memory part, and the query latency (one
+matrix-vector product plus top-k) with all items visible and with half of
+them hidden (other users' uploads), compared with an exhaustive Python loop.
+The request path of /api/similar (SimilarityService.similar) is timed on an
+in-memory catalog: with the user's cached view (the usual request, plus one
+catalog version lookup in MongoDB not included here) and right after a
+catalog version change, which rebuilds the view.
+
+Needs no database. Run from the project root: python -m benchmarks.bench_similarity
+"""
+
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from services.embeddings import EMBEDDING_SIZE
+from services.generator_service import GarmentIndexCache
+from services.similarity_service import SIMILARITY_CATEGORIES, SimilarityIndex, SimilarityService
+
+CATALOG_SIZES = [1_000, 10_000, 100_000]
+QUERIES = 200
+K = 12
+UPLOADS = 100
+# the Python loop is only timed up to this many items
+LOOP_MAX = 10_000
+
+
+def catalog(size, seed):
+    """size items with random unit-length embeddings"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(size, EMBEDDING_SIZE))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [
+        {"_id": f"{i:024x}", "category": SIMILARITY_CATEGORIES[i % 3], "embedding": vector.tolist()}
+        for i, vector in enumerate(vectors.round(4))
+    ]
+
+
+class MemoryCatalog:
+    """the ClothingService methods SimilarityService uses, served from lists"""
+
+    def __init__(self, defaults, uploads):
+        self.defaults = defaults
+        self.uploads = uploads
+        self.items = {item["_id"]: item for item in defaults + uploads}
+        self.versions = (1, 1)
+
+    def get_catalog_versions(self, user_id=None):
+        return self.versions
+
+    def get_catalog(self, user_id=None, versions=None):
+        items = self.defaults + (self.uploads if user_id else [])
+        return {category: [item for item in items if item["category"] == category] for category in SIMILARITY_CATEGORIES}
+
+    def get_items(self, item_ids, projection=None):
+        return [self.items[item_id] for item_id in item_ids]
+
+
+def search_loop(items, query_item, k):
+    """reference: cosine similarity of every item in pure Python"""
+    query = query_item["embedding"]
+    scores = [
+        (sum(a * b for a, b in zip(query, item["embedding"])), item["_id"])
+        for item in items
+        if item["category"] == query_item["category"] and item["_id"] != query_item["_id"]
+    ]
+    return sorted(scores, reverse=True)[:k]
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return statistics.median(timings), timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+
+def main():
+    print(f"{'items':>8} {'save ms':>9} {'mmap ms':>9} {'add ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'hidden p50':>11} "
+          f"{'loop ms':>9} {'similar p50':>12} {'similar p95':>12} {'rebuild ms':>11}")
+    print("-" * 118)
+
+    for size in CATALOG_SIZES:
+        items = catalog(size, size)
+        built = SimilarityIndex()
+        built.add(items)
+
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            built.save(directory)
+            save_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            index = SimilarityIndex(directory)
+            mmap_ms = (time.perf_counter() - start) * 1000
+
+            uploads = [dict(item, _id=f"u{item['_id']}") for item in catalog(UPLOADS, size + 1)]
+            start = time.perf_counter()
+            index.add(uploads)
+            add_ms = (time.perf_counter() - start) * 1000
+
+            rng = random.Random(size)
+            queries = [items[rng.randrange(size)] for _ in range(QUERIES)]
+            visible = {item["_id"] for item in items if rng.random() < 0.5}
+
+            timings, hidden = [], []
+            for query in queries:
+                start = time.perf_counter()
+                index.search(query["_id"], K)
+                timings.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                index.search(query["_id"], K, visible=visible)
+                hidden.append((time.perf_counter() - start) * 1000)
+
+            loop = "-"
+            if size <= LOOP_MAX:
+                start = time.perf_counter()
+                expected = search_loop(items, queries[0], K)
+                loop = f"{(time.perf_counter() - start) * 1000:.2f}"
+                # the uploads are not part of the reference
+                found = index.search(queries[0]["_id"], K, visible={item["_id"] for item in items})
+                assert [item_id for _, item_id in found] == [item_id for _, item_id in expected]
+
+            # the whole request path, the user sees the default items and their uploads
+            catalog_service = MemoryCatalog(items, uploads)
+            service = SimilarityService(catalog_service, index, GarmentIndexCache())
+            start = time.perf_counter()
+            service.similar("user", queries[0]["_id"], K)
+            rebuild_ms = (time.perf_counter() - start) * 1000
+
+            similar = []
+            for query in queries:
+                start = time.perf_counter()
+                service.similar("user", query["_id"], K)
+                similar.append((time.perf_counter() - start) * 1000)
+
+            p50, p95 = percentiles(timings)
+            similar_p50, similar_p95 = percentiles(similar)
+            print(f"{size:>8} {save_ms:>9.2f} {mmap_ms:>9.2f} {add_ms:>8.2f} {p50:>8.2f} {p95:>8.2f} "
+                  f"{percentiles(hidden)[0]:>11.2f} {loop:>9} {similar_p50:>12.2f} {similar_p95:>12.2f} {rebuild_ms:>11.2f}")
+
+            # the mapping keeps the files open
+            del index, service
+
+
+if __name__ == "__main__":
+    main()
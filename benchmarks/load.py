@@ -0,0 +1,123 @@
+"""
+HTTP load test of the benchmark suite (python -m benchmarks)
+Concurrent clients log in as the seeded users and request a fixed mix of
+pages and API routes for a while, against a running server (--url) or the
+Flask app started in-process on a free port.
+"""
+
+import http.client
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.micro import summarize
+from benchmarks.seed import PASSWORD
+
+# (method, path, weight) requested by every logged-in client
+ROUTES = [
+    ("GET", "/dashboard", 3),
+    # browsers only fetch the catalog when its version changed
+    ("GET", "/api/catalog", 1),
+    ("GET", "/saved-outfits", 2),
+    ("GET", "/api/outfits", 3),
+    ("GET", "/api/generate-outfit", 3),
+    ("GET", "/wardrobe/top", 1),
+]
+
+
+class Client:
+    """one keep-alive connection with the session cookie of one user"""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        self.cookie = None
+
+    def request(self, method, path, body=None):
+        headers = {"Content-Type": "application/x-www-form-urlencoded"} if body else {}
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        response.read()
+
+        cookie = response.getheader("Set-Cookie")
+        if cookie:
+            self.cookie = cookie.split(";", 1)[0]
+        return response.status
+
+    def login(self, username):
+        return self.request("POST", "/login", urlencode({"username": username, "password": PASSWORD}))
+
+
+def start_server(mongo_uri, db_name):
+    """the Flask app on a free local port in a background thread, returns (url, server)"""
+    from werkzeug.serving import make_server
+
+    from config import Config
+    Config.MONGO_URI = mongo_uri
+    Config.MONGO_DB_NAME = db_name
+    Config.MONGO_VERIFY_INDEXES = False
+    from app import create_app
+
+    # no access log line per request
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def run_load(url, usernames, concurrency=8, duration=10, seed=0):
+    """returns {"routes": {route: stats}, "requests", "errors", "requests_per_s"}"""
+    timings = {}
+    errors = {}
+    lock = threading.Lock()
+    paths = [(method, path) for method, path, _ in ROUTES]
+    weights = [weight for _, _, weight in ROUTES]
+    deadline = time.perf_counter() + duration
+
+    def record(route, elapsed, status):
+        with lock:
+            timings.setdefault(route, []).append(elapsed)
+            if status >= 400:
+                errors[route] = errors.get(route, 0) + 1
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        client = Client(url)
+
+        start = time.perf_counter()
+        status = client.login(usernames[index % len(usernames)])
+        # a successful login redirects to the dashboard
+        record("POST /login", time.perf_counter() - start, 400 if status != 302 else status)
+
+        while time.perf_counter() < deadline:
+            method, path = rng.choices(paths, weights)[0]
+            start = time.perf_counter()
+            try:
+                status = client.request(method, path)
+            except (OSError, http.client.HTTPException):
+                # the server dropped the connection, log in again on a new one
+                client = Client(url)
+                client.login(usernames[index % len(usernames)])
+                status = 599
+            record(f"{method} {path}", time.perf_counter() - start, status)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in timings.values())
+    return {
+        "routes": {route: summarize(values) for route, values in sorted(timings.items())},
+        "errors": errors,
+        "requests": total,
+        "requests_per_s": round(total / elapsed, 1)
+    }
@@ -0,0 +1,94 @@
+"""
+Service micro-benchmarks of the benchmark suite (python -m benchmarks)
+Times the service methods behind the hot pages directly, without HTTP, on the
+data of benchmarks/seed.py. Users are drawn with a fixed seed.
+"""
+
+import random
+import statistics
+import time
+
+from config import Config
+from services.catalog_cache import CatalogCache
+from services.clothing_service import ClothingService
+from services.outfit_service import OutfitService
+from services.password_hasher import PasswordHashPool
+from services.user_service import UserService
+from benchmarks.seed import PASSWORD
+
+
+def summarize(timings):
+    """latency stats in ms of a list of seconds"""
+    timings = sorted(t * 1000 for t in timings)
+
+    def percentile(p):
+        return timings[min(int(len(timings) * p), len(timings) - 1)]
+
+    return {
+        "count": len(timings),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(percentile(0.5), 3),
+        "p95_ms": round(percentile(0.95), 3),
+        "p99_ms": round(percentile(0.99), 3),
+        "max_ms": round(timings[-1], 3),
+        "ops_per_s": round(len(timings) / (sum(timings) / 1000), 1) if sum(timings) else None
+    }
+
+
+def measure(operation, users, iterations, warmup=3):
+    """calls operation(user) iterations times, returns the latency stats"""
+    for user in users[:warmup]:
+        operation(user)
+
+    timings = []
+    for i in range(iterations):
+        user = users[i % len(users)]
+        start = time.perf_counter()
+        operation(user)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def run_micro(db, iterations=200, login_iterations=20, seed=0):
+    """returns {operation: stats}"""
+    rng = random.Random(seed)
+    users = list(db.users.find({}, {"username": 1}))
+    rng.shuffle(users)
+    user_ids = [str(user["_id"]) for user in users]
+
+    outfits = OutfitService(db)
+    uncached = ClothingService(db)
+    cached = ClothingService(db, CatalogCache())
+    hasher = PasswordHashPool(
+        time_cost=Config.ARGON2_TIME_COST,
+        memory_cost=Config.ARGON2_MEMORY_COST,
+        parallelism=Config.ARGON2_PARALLELISM,
+        workers=1
+    )
+    accounts = UserService(db, hasher)
+
+    garments = {
+        category: str(db.clothing.find_one({"category": category, "user_id": None}, {"_id": 1})["_id"])
+        for category in ["top", "bottom", "footwear"]
+    }
+    # outfits saved by the benchmark are removed again so repeated runs see the same data
+    saved = []
+
+    def save_outfit(user_id):
+        # "" gets the default name, numbered by the per-user counter in outfit_counters (one $inc)
+        saved.append(outfits.save_outfit(user_id, "", garments["top"], garments["bottom"], garments["footwear"]))
+
+    results = {
+        "get_user_outfits": measure(lambda user_id: outfits.get_user_outfits(user_id), user_ids, iterations),
+        "get_user_outfits_page": measure(lambda user_id: outfits.get_user_outfits_page(user_id), user_ids, iterations),
+        "get_by_category": measure(lambda user_id: uncached.get_by_category("top", user_id), user_ids, iterations),
+        "get_by_category_cached": measure(lambda user_id: cached.get_by_category("top", user_id), user_ids, iterations),
+        "save_outfit": measure(save_outfit, user_ids, iterations),
+        "authenticate_user": measure(
+            lambda user: accounts.authenticate_user(user, PASSWORD),
+            [user["username"] for user in users], login_iterations, warmup=1)
+    }
+
+    for outfit_id in saved:
+        outfits.delete_outfit(outfit_id)
+    return results
@@ -0,0 +1,114 @@
+"""
+Synthetic data for the benchmark suite (python -m benchmarks)
+Seeds a throwaway database with default items, users, their uploads and
+saved outfits. The same parameters and seed always produce the same data, so
+runs on different commits measure the same workload.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from argon2 import PasswordHasher
+
+from config import Config
+from dao.indexes import ensure_indexes
+from services.color_analysis import PALETTE_NAMES
+
+CATEGORIES = ["top", "bottom", "footwear"]
+SUBCATEGORIES = {
+    "top": ["oversized_tshirt", "slimfit_tshirt", "hoodie", "shirt_blouse"],
+    "bottom": ["jeans", "skirt", "shorts", "sweatpants"],
+    "footwear": ["sneakers", "boots", "heels", "loafer_mules"]
+}
+# every benchmark user logs in with this password
+PASSWORD = "benchmark-password"
+START = datetime(2025, 1, 1)
+
+
+def username(index):
+    return f"bench_user_{index}"
+
+
+def clothing_document(rng, category, index, user_id=None):
+    document = {
+        "category": category,
+        "subcategory": "custom" if user_id else "1a",
+        "subcategory_name": "custom_upload" if user_id else rng.choice(SUBCATEGORIES[category]),
+        "color": rng.choice(PALETTE_NAMES),
+        "neckline": None,
+        "length": None,
+        "image_path": f"static/images/clothing/bench/{category}_{user_id or 'default'}_{index}.png",
+        "is_default": user_id is None,
+        "created_at": START + timedelta(minutes=index)
+    }
+    if user_id:
+        document.update({"user_id": user_id, "status": "ready"})
+    return document
+
+
+def seed(db, users=100, uploads_per_user=10, outfits_per_user=20, defaults_per_category=18, seed=0):
+    """
+    drops and refills clothing, users and outfits of db, returns a summary of what was written
+    uploads and outfits are spread evenly over the users, outfits use default items and own uploads
+    """
+    rng = random.Random(seed)
+    for name in ["clothing", "users", "outfits", "outfit_counters", "catalog_versions"]:
+        db.drop_collection(name)
+    ensure_indexes(db)
+
+    defaults = [
+        clothing_document(rng, category, i)
+        for category in CATEGORIES for i in range(defaults_per_category)
+    ]
+    db.clothing.insert_many(defaults)
+    default_ids = {
+        category: [str(item["_id"]) for item in defaults if item["category"] == category]
+        for category in CATEGORIES
+    }
+
+    # one Argon2 hash for everybody, hashing thousands of users would dominate the seeding
+    # (same parameters as the app, so logins don't rehash)
+    password_hash = PasswordHasher(
+        time_cost=Config.ARGON2_TIME_COST,
+        memory_cost=Config.ARGON2_MEMORY_COST,
+        parallelism=Config.ARGON2_PARALLELISM
+    ).hash(PASSWORD)
+    result = db.users.insert_many([{
+        "username": username(i),
+        "password_hash": password_hash,
+        "avatar": "🙂",
+        "created_at": START
+    } for i in range(users)])
+    user_ids = [str(user_id) for user_id in result.inserted_ids]
+
+    uploads = 0
+    outfits = 0
+    for user_id in user_ids:
+        items = [clothing_document(rng, CATEGORIES[i % 3], i, user_id) for i in range(uploads_per_user)]
+        if items:
+            db.clothing.insert_many(items)
+            uploads += len(items)
+
+        choices = {category: list(default_ids[category]) for category in CATEGORIES}
+        for item in items:
+            choices[item["category"]].append(str(item["_id"]))
+
+        documents = [{
+            "user_id": user_id,
+            "outfit_name": f"Outfit {rng.randrange(10000):04d}",
+            "top_id": rng.choice(choices["top"]),
+            "bottom_id": rng.choice(choices["bottom"]),
+            "footwear_id": rng.choice(choices["footwear"]),
+            "created_at": START + timedelta(hours=i)
+        } for i in range(outfits_per_user)]
+        if documents:
+            db.outfits.insert_many(documents)
+            outfits += len(documents)
+
+    return {
+        "users": users,
+        "default_items": len(defaults),
+        "uploads": uploads,
+        "outfits": outfits,
+        "seed": seed
+    }
@@ -0,0 +1,197 @@
+import os
+import threading
+from pymongo import AsyncMongoClient, MongoClient, monitoring
+
+def env_flag(name, default):
+    """reads a boolean switch like 1/0, true/false, on/off from the environment"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def env_int(name, default):
+    """reads an integer from the environment, empty means None"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return int(value) if value.strip() else None
+
+class Config:
+    SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret")
+
+    # MongoDB
+    MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017")
+    MONGO_DB_NAME = os.environ.get("MONGO_DB_NAME", "mismatch")
+    # connection pool, None keeps the pymongo default
+    MONGO_MAX_POOL_SIZE = env_int("MONGO_MAX_POOL_SIZE", 100)
+    MONGO_MIN_POOL_SIZE = env_int("MONGO_MIN_POOL_SIZE", 0)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)
+    # primary, primaryPreferred, secondary, secondaryPreferred or nearest
+    MONGO_READ_PREFERENCE = os.environ.get("MONGO_READ_PREFERENCE", "primary")
+    # comma separated, e.g. "zstd,snappy,zlib" (zstd/snappy need extra packages)
+    MONGO_COMPRESSORS = os.environ.get("MONGO_COMPRESSORS", "")
+    # create indexes on startup and fail if a hot query would scan a collection (dao/indexes.py)
+    MONGO_ENSURE_INDEXES = env_flag("MONGO_ENSURE_INDEXES", True)
+    MONGO_VERIFY_INDEXES = env_flag("MONGO_VERIFY_INDEXES", True)
+
+    # Argon2 parameters and hashing pool (services/password_hasher.py)
+    ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", 3))
+    ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", 65536))
+    ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", 4))
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", 16))
+    PASSWORD_HASH_TIMEOUT = int(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))
+
+    # Uploads (services/upload_pipeline.py), MAX_CONTENT_LENGTH rejects oversized requests early
+    UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+    MAX_CONTENT_LENGTH = UPLOAD_MAX_BYTES + 1024 * 1024
+    UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", 64 * 1024))
+    UPLOAD_TMP_DIR = os.environ.get("UPLOAD_TMP_DIR")
+    UPLOAD_MAX_DIMENSION = int(os.environ.get("UPLOAD_MAX_DIMENSION", 1600))
+    UPLOAD_WORKERS = int(os.environ.get("UPLOAD_WORKERS", 2))
+    # uploads still pending after this long lost their job (crashed or redeployed worker)
+    UPLOAD_STALE_SECONDS = int(os.environ.get("UPLOAD_STALE_SECONDS", 900))
+
+    # Image storage (services/storage.py): "local" (static folder) or "s3" (AWS, MinIO, ...)
+    STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "local")
+    S3_BUCKET = os.environ.get("S3_BUCKET", "mismatch")
+    S3_PREFIX = os.environ.get("S3_PREFIX", "")
+    # e.g. http://localhost:9000 for MinIO, unset for AWS
+    S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL")
+    S3_REGION = os.environ.get("S3_REGION")
+    S3_ACCESS_KEY_ID = os.environ.get("S3_ACCESS_KEY_ID")
+    S3_SECRET_ACCESS_KEY = os.environ.get("S3_SECRET_ACCESS_KEY")
+    # public base URL of the bucket or a CDN in front of it
+    S3_PUBLIC_URL = os.environ.get("S3_PUBLIC_URL")
+
+    # /img/<hash>/<path> (controllers/image_controller.py): "" sends the file from Python,
+    # "x-sendfile" (Apache, lighttpd) or "x-accel-redirect" (nginx) let the front server send it
+    IMAGE_SENDFILE = os.environ.get("IMAGE_SENDFILE", "")
+    USE_X_SENDFILE = IMAGE_SENDFILE == "x-sendfile"
+    # nginx internal location that maps to the app folder
+    IMAGE_ACCEL_REDIRECT_PREFIX = os.environ.get("IMAGE_ACCEL_REDIRECT_PREFIX", "/_files/")
+
+    # Clothing catalog cache (services/catalog_cache.py)
+    CATALOG_CACHE_ENABLED = env_flag("CATALOG_CACHE_ENABLED", True)
+    CATALOG_CACHE_MAX_ENTRIES = int(os.environ.get("CATALOG_CACHE_MAX_ENTRIES", 256))
+    CATALOG_CACHE_TTL = int(os.environ.get("CATALOG_CACHE_TTL", 300))
+
+    # memory-mapped similarity index (scripts/build_similarity_index.py), relative to the app folder
+    SIMILARITY_INDEX_DIR = os.environ.get("SIMILARITY_INDEX_DIR", "data/similarity")
+
+    # per-route latency and MongoDB command metrics on /metrics (services/metrics.py), off: no hooks at all
+    METRICS_ENABLED = env_flag("METRICS_ENABLED", False)
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """counts connection pool events of the shared client (reported by /healthz)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.check_out_started = 0
+        self.check_out_failed = 0
+        self.wait_queue_timeouts = 0
+        self.cleared = 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "idle": self.open - self.checked_out,
+                "check_out_started": self.check_out_started,
+                "check_out_failed": self.check_out_failed,
+                "wait_queue_timeouts": self.wait_queue_timeouts,
+                "cleared": self.cleared
+            }
+
+    def _add(self, name, value=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add("cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add("open")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add("open", -1)
+
+    def connection_check_out_started(self, event):
+        self._add("check_out_started")
+
+    def connection_check_out_failed(self, event):
+        self._add("check_out_failed")
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            self._add("wait_queue_timeouts")
+
+    def connection_checked_out(self, event):
+        self._add("checked_out")
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+_client = None
+_client_pid = None
+_pool_stats = None
+_client_lock = threading.Lock()
+
+def _setting(config, name):
+    return config[name] if isinstance(config, dict) else getattr(config, name)
+
+def _client_options(config):
+    options = {
+        "maxPoolSize": _setting(config, "MONGO_MAX_POOL_SIZE"),
+        "minPoolSize": _setting(config, "MONGO_MIN_POOL_SIZE"),
+        "waitQueueTimeoutMS": _setting(config, "MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+        "serverSelectionTimeoutMS": _setting(config, "MONGO_SERVER_SELECTION_TIMEOUT_MS"),
+        "readPreference": _setting(config, "MONGO_READ_PREFERENCE"),
+        "compressors": _setting(config, "MONGO_COMPRESSORS") or None,
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+def get_mongo_client(config=Config):
+    """
+    the MongoClient of this process, created on first use
+    config: Flask app.config or the Config class
+    a forked worker gets its own client, pymongo clients are not fork-safe
+    """
+    global _client, _client_pid, _pool_stats
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _pool_stats = PoolStats()
+            listeners = [_pool_stats]
+            if _setting(config, "METRICS_ENABLED"):
+                from services.metrics import metrics
+                listeners.append(metrics.listener)
+
+            _client = MongoClient(
+                _setting(config, "MONGO_URI"),
+                event_listeners=listeners,
+                **_client_options(config)
+            )
+            _client_pid = os.getpid()
+        return _client
+
+def create_async_mongo_client(config=Config):
+    """AsyncMongoClient with the same pool settings, create it inside the running event loop"""
+    return AsyncMongoClient(_setting(config, "MONGO_URI"), **_client_options(config))
+
+def get_pool_stats():
+    """pool counters of this process' client (None before the first get_mongo_client)"""
+    return _pool_stats
@@ -0,0 +1,97 @@
+from quart import Blueprint, request, session, current_app, jsonify
+from services.async_outfit_service import AsyncOutfitService
+from services.outfit_service import PAGE_SIZE
+from controllers.outfit_controller import MAX_PAGE_SIZE, outfit_to_json
+
+# async variant of the outfit API in outfit_controller.py, served by asgi.py
+async_outfit_bp = Blueprint("async_outfit", __name__)
+
+@async_outfit_bp.route("/api/outfits")
+async def list_outfits():
+    """one page of saved outfits as JSON, follow next_cursor for the next page"""
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    sort = request.args.get("sort", "newest")
+    cursor = request.args.get("cursor")
+    limit = min(max(request.args.get("limit", PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+
+    service = AsyncOutfitService(current_app.db)
+    try:
+        outfits, next_cursor = await service.get_user_outfits_page(
+            session.get("user_id"), sort=sort, cursor=cursor, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "outfits": [outfit_to_json(outfit, current_app.storage) for outfit in outfits],
+        "next_cursor": next_cursor,
+        "total": await service.get_outfit_total(session.get("user_id"))
+    })
+
+@async_outfit_bp.route("/api/save-outfit", methods=["POST"])
+async def save_outfit():
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    data = await request.get_json()
+
+    service = AsyncOutfitService(current_app.db)
+    outfit_id = await service.save_outfit(
+        user_id=session.get("user_id"),
+        outfit_name=data.get("outfit_name", "My Outfit"),
+        top_id=data.get("top_id"),
+        bottom_id=data.get("bottom_id"),
+        footwear_id=data.get("footwear_id")
+    )
+
+    return jsonify({"success": True, "outfit_id": outfit_id})
+
+@async_outfit_bp.route("/api/update-outfit/<outfit_id>", methods=["PUT"])
+async def update_outfit(outfit_id):
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    data = await request.get_json()
+
+    service = AsyncOutfitService(current_app.db)
+    await service.update_outfit(
+        outfit_id=outfit_id,
+        outfit_name=data.get("outfit_name"),
+        top_id=data.get("top_id"),
+        bottom_id=data.get("bottom_id"),
+        footwear_id=data.get("footwear_id")
+    )
+
+    return jsonify({"success": True})
+
+@async_outfit_bp.route("/api/delete-outfit/<outfit_id>", methods=["DELETE"])
+async def delete_outfit(outfit_id):
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    service = AsyncOutfitService(current_app.db)
+    await service.delete_outfit(outfit_id)
+
+    return jsonify({"success": True})
+
+@async_outfit_bp.route("/api/outfits/batch", methods=["POST"])
+async def batch_outfits():
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    data = await request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object with operations"}), 400
+
+    service = AsyncOutfitService(current_app.db)
+    try:
+        results = await service.apply_batch(session.get("user_id"), data.get("operations"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "success": all(result["success"] for result in results),
+        "results": results,
+        "total": await service.get_outfit_total(session.get("user_id"))
+    })
@@ -0,0 +1,63 @@
+import asyncio
+from quart import Blueprint, request, session, current_app, jsonify
+from werkzeug.datastructures import FileStorage
+from services.upload_service import UploadService
+from services.upload_pipeline import UploadTooLargeError
+from controllers.upload_controller import allowed_file
+
+# async variant of upload_controller.py, served by asgi.py
+# streaming to the temp file and the insert run in a worker thread so the event loop keeps serving
+async_upload_bp = Blueprint("async_upload", __name__)
+
+@async_upload_bp.route("/api/upload-clothing", methods=["POST"])
+async def upload_clothing():
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    files = await request.files
+    form = await request.form
+
+    if 'image' not in files:
+        return jsonify({"error": "No image provided"}), 400
+
+    file = files['image']
+    category = form.get('category')
+
+    if not category or category not in ['top', 'bottom', 'footwear']:
+        return jsonify({"error": "Invalid category"}), 400
+
+    if file.filename == '':
+        return jsonify({"error": "No file selected"}), 400
+
+    if file and allowed_file(file.filename):
+        # UploadService expects werkzeug's synchronous FileStorage
+        upload = FileStorage(stream=file.stream, filename=file.filename, content_type=file.content_type)
+
+        service = UploadService(current_app.sync_db, current_app.upload_pipeline, current_app.catalog_cache)
+        try:
+            item_id, status = await asyncio.to_thread(
+                service.save_upload, session.get("user_id"), category, upload)
+        except UploadTooLargeError as e:
+            return jsonify({"error": str(e)}), 413
+
+        # a pending upload is processed in the background, poll /api/upload-status/<item_id>
+        return jsonify({
+            "success": True,
+            "status": status,
+            "item_id": item_id
+        }), 202 if status == "pending" else 201
+
+    return jsonify({"error": "Invalid file type"}), 400
+
+
+@async_upload_bp.route("/api/delete-clothing/<item_id>", methods=["DELETE"])
+async def delete_clothing(item_id):
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    service = UploadService(current_app.sync_db, current_app.upload_pipeline, current_app.catalog_cache)
+
+    if await asyncio.to_thread(service.delete_upload, session.get("user_id"), item_id):
+        return jsonify({"success": True})
+    else:
+        return jsonify({"error": "Item not found or not yours"}), 404
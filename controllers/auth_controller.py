@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, current_app, session
 from services.user_service import UserService
+from services.password_hasher import HasherBusyError
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -16,7 +17,7 @@ def register_user():
             error = "Passwords don't match!"
             return render_template("register.html", error=error) 
 
-        service = UserService(current_app.db)
+        service = UserService(current_app.db, current_app.password_hasher)
 
         try:
             user = service.register_user(username, password)
@@ -28,6 +29,8 @@ def register_user():
             return redirect("/dashboard")
         except ValueError as e:
             error = str(e)
+        except HasherBusyError as e:
+            return render_template("register.html", error=str(e)), 503
         
     return render_template("register.html", error=error)
 
@@ -39,7 +42,7 @@ def login():
         username = request.form["username"]
         password = request.form["password"]
 
-        service = UserService(current_app.db)
+        service = UserService(current_app.db, current_app.password_hasher)
 
         try:
             user = service.authenticate_user(username, password)
@@ -51,6 +54,8 @@ def login():
             return redirect("/dashboard")
         except ValueError as e:
             error = str(e)
+        except HasherBusyError as e:
+            return render_template("index.html", error=str(e)), 503
         
     return render_template("index.html", error=error)
 
@@ -1,21 +1,143 @@
-from flask import Blueprint, render_template, session, redirect, current_app, jsonify
+import hashlib
+from flask import Blueprint, render_template, session, redirect, current_app, jsonify, request, make_response
 from services.clothing_service import ClothingService
+from services.generator_service import GeneratorService, GENERATOR_CATEGORIES
+from services.recommendation_service import RecommendationService, RECOMMENDATION_CATEGORIES
+from services.similarity_service import SimilarityService
+from services.storage import with_image_urls
 
 generator_bp = Blueprint("generator", __name__)
 
+MAX_GENERATED_OUTFITS = 50
+MAX_RECOMMENDATIONS = 50
+MAX_SIMILAR_ITEMS = 100
+
+# the browser revalidates the catalog, it is per user
+CATALOG_CACHE_CONTROL = "private, no-cache"
+
+def catalog_version(user_id, versions, storage):
+    """
+    version string (and ETag) of a user's catalog: the default items, their uploads and
+    the user plus the image URL base (every image_url changes with the storage), so users
+    sharing a browser never get each other's cached catalog
+    """
+    defaults, uploads = versions
+    owner = hashlib.sha256(f"{user_id}|{storage.base_url}".encode()).hexdigest()[:12]
+    return f"{defaults}.{uploads}.{owner}"
+
 @generator_bp.route("/dashboard")
 def dashboard():
     if not session.get("username"):
         return redirect("/login")
     
-    service = ClothingService(current_app.db)
+    service = ClothingService(current_app.db, current_app.catalog_cache)
     
-    # retrieve all items
-    tops = service.get_by_category("top")
-    bottoms = service.get_by_category("bottom")
-    footwear = service.get_by_category("footwear")
+    # the items come from /api/catalog (cached by the browser), the page only carries the version
+    versions = service.get_catalog_versions(session.get("user_id"))
     
     return render_template("dashboard.html", 
-                         tops=tops, 
-                         bottoms=bottoms, 
-                         footwear=footwear)
\ No newline at end of file
+                         catalog_version=catalog_version(session.get("user_id"), versions, current_app.storage))
+
+@generator_bp.route("/api/catalog")
+def catalog():
+    """
+    the default items and the uploads of the user for the generator
+    strong ETag (the catalog version), 304 on If-None-Match without loading the items
+    """
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    service = ClothingService(current_app.db, current_app.catalog_cache)
+    versions = service.get_catalog_versions(session.get("user_id"))
+    version = catalog_version(session.get("user_id"), versions, current_app.storage)
+
+    if request.if_none_match.contains(version):
+        response = make_response("", 304)
+    else:
+        items = service.get_catalog(session.get("user_id"), versions)
+        response = jsonify({
+            "version": version,
+            "tops": [with_image_urls(current_app.storage, item) for item in items["top"]],
+            "bottoms": [with_image_urls(current_app.storage, item) for item in items["bottom"]],
+            "footwear": [with_image_urls(current_app.storage, item) for item in items["footwear"]]
+        })
+
+    response.set_etag(version)
+    response.headers["Cache-Control"] = CATALOG_CACHE_CONTROL
+    response.vary.add("Cookie")
+    return response
+
+@generator_bp.route("/api/generate-outfit")
+def generate_outfit():
+    """
+    random outfits drawn on the server (FR-S2)
+    query: count, seed (reproducible), top_color / bottom_color / footwear_color
+    """
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    count = min(max(request.args.get("count", 1, type=int), 1), MAX_GENERATED_OUTFITS)
+    seed = request.args.get("seed", type=int)
+    colors = {
+        category: request.args.get(f"{category}_color")
+        for category in GENERATOR_CATEGORIES
+        if request.args.get(f"{category}_color") not in (None, "", "all")
+    }
+
+    clothing_service = ClothingService(current_app.db, current_app.catalog_cache)
+    service = GeneratorService(clothing_service, current_app.garment_indexes)
+    outfits, seed = service.generate(session.get("user_id"), count=count, seed=seed, colors=colors)
+    outfits = [
+        {category: with_image_urls(current_app.storage, item) for category, item in outfit.items()}
+        for outfit in outfits
+    ]
+
+    return jsonify({"outfits": outfits, "seed": seed})
+
+@generator_bp.route("/api/recommendations")
+def recommendations():
+    """
+    the best matching outfits by color and style compatibility
+    query: k (number of outfits), top_id / bottom_id / footwear_id to complete an outfit around
+    """
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    k = min(max(request.args.get("k", 10, type=int), 1), MAX_RECOMMENDATIONS)
+    anchors = {
+        category: request.args.get(f"{category}_id")
+        for category in RECOMMENDATION_CATEGORIES
+        if request.args.get(f"{category}_id")
+    }
+
+    clothing_service = ClothingService(current_app.db, current_app.catalog_cache)
+    service = RecommendationService(clothing_service, current_app.compatibility_indexes)
+    outfits = service.recommend(session.get("user_id"), k=k, anchors=anchors)
+
+    for outfit in outfits:
+        for category in RECOMMENDATION_CATEGORIES:
+            outfit[category] = with_image_urls(current_app.storage, outfit[category])
+
+    return jsonify({"outfits": outfits})
+
+@generator_bp.route("/api/similar/<item_id>")
+def similar_items(item_id):
+    """
+    catalog items of the same category that look like item_id (color and shape embeddings)
+    query: k (number of items)
+    """
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    k = min(max(request.args.get("k", 12, type=int), 1), MAX_SIMILAR_ITEMS)
+
+    clothing_service = ClothingService(current_app.db, current_app.catalog_cache)
+    service = SimilarityService(clothing_service, current_app.similarity_index, current_app.similarity_views)
+    results = service.similar(session.get("user_id"), item_id, k=k)
+    if results is None:
+        return jsonify({"error": "Item not found"}), 404
+
+    for result in results:
+        result["item"] = with_image_urls(current_app.storage, result["item"])
+
+    return jsonify({"items": results})
@@ -0,0 +1,34 @@
+import time
+from flask import Blueprint, current_app, jsonify
+from pymongo.errors import PyMongoError
+from config import get_pool_stats
+
+health_bp = Blueprint("health", __name__)
+
+@health_bp.route("/healthz")
+def healthz():
+    """liveness of the app and MongoDB plus connection pool stats"""
+    client = current_app.mongo_client
+    pool_options = client.options.pool_options
+
+    mongo = {"ok": True}
+    try:
+        start = time.perf_counter()
+        client.admin.command("ping")
+        mongo["ping_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    except PyMongoError as e:
+        mongo = {"ok": False, "error": str(e)}
+
+    pool_stats = get_pool_stats()
+
+    return jsonify({
+        "status": "ok" if mongo["ok"] else "error",
+        "mongo": mongo,
+        "pool": {
+            "max_pool_size": pool_options.max_pool_size,
+            "min_pool_size": pool_options.min_pool_size,
+            "wait_queue_timeout": pool_options.wait_queue_timeout,
+            **(pool_stats.snapshot() if pool_stats else {})
+        },
+        "catalog_cache": current_app.catalog_cache.stats()
+    }), 200 if mongo["ok"] else 503
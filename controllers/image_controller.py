@@ -0,0 +1,67 @@
+import mimetypes
+import os
+from flask import Blueprint, current_app, request, send_file, abort, make_response
+from werkzeug.security import safe_join
+from services.storage import IMMUTABLE_CACHE_CONTROL, fingerprint
+
+image_bp = Blueprint("image", __name__)
+
+# only images are served through /img
+IMAGE_PREFIX = "static/images/"
+
+def image_path(storage, key):
+    """
+    absolute path of an image key below static/images/ of the storage folder,
+    None for keys with .. segments, absolute keys or symlinks leading elsewhere
+    """
+    if ".." in key.split("/"):
+        return None
+    path = safe_join(storage.root_path, key)
+    if path is None:
+        return None
+
+    images = os.path.realpath(os.path.join(storage.root_path, IMAGE_PREFIX))
+    path = os.path.realpath(path)
+    if os.path.commonpath([images, path]) != images:
+        return None
+    return path
+
+@image_bp.route("/img/<fingerprint_>/<path:key>")
+def image(fingerprint_, key):
+    """
+    fingerprinted image URL of the local storage (storage.url(key, digest))
+    strong ETag (sha256 of the file), 304 on If-None-Match, Range requests,
+    cached forever as long as the fingerprint matches the current file
+    """
+    storage = current_app.storage
+    # the key is resolved before it is checked, the URL decodes %2f and %2e into / and .
+    path = image_path(storage, key) if hasattr(storage, "local_path") else None
+    if path is None:
+        abort(404)
+
+    try:
+        digest = storage.digest(key)
+    except ValueError:
+        abort(404)
+    if digest is None:
+        abort(404)
+
+    # an outdated fingerprint still gets the current file, but only with revalidation
+    cache_control = IMMUTABLE_CACHE_CONTROL if fingerprint(digest) == fingerprint_ else "no-cache"
+
+    if current_app.config["IMAGE_SENDFILE"] == "x-accel-redirect":
+        # nginx sends the bytes (and handles Range) from its internal location,
+        # image_path() rejected keys with .. segments so the header stays below it
+        if request.if_none_match.contains(digest):
+            response = make_response("", 304)
+        else:
+            response = make_response("")
+            response.headers["X-Accel-Redirect"] = current_app.config["IMAGE_ACCEL_REDIRECT_PREFIX"] + key
+            response.headers["Content-Type"] = mimetypes.guess_type(key)[0] or "application/octet-stream"
+        response.set_etag(digest)
+    else:
+        # with USE_X_SENDFILE (IMAGE_SENDFILE=x-sendfile) the front server reads the file
+        response = send_file(path, etag=digest, conditional=True)
+
+    response.headers["Cache-Control"] = cache_control
+    return response
@@ -0,0 +1,12 @@
+from flask import Blueprint, Response
+from config import get_pool_stats
+from services.metrics import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+@metrics_bp.route("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape endpoint, registered only with METRICS_ENABLED"""
+    pool_stats = get_pool_stats()
+    body = metrics.render(pool_stats.snapshot() if pool_stats else None)
+    return Response(body, mimetype="text/plain; version=0.0.4")
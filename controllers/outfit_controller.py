@@ -1,9 +1,12 @@
 from flask import Blueprint, render_template, request, redirect, session, current_app, jsonify
-from services.outfit_service import OutfitService
+from services.outfit_service import OutfitService, PAGE_SIZE
 from services.clothing_service import ClothingService
+from services.storage import with_image_urls
 
 outfit_bp = Blueprint("outfit", __name__)
 
+MAX_PAGE_SIZE = 100
+
 @outfit_bp.route("/saved-outfits")
 def saved_outfits():
     if not session.get("username"):
@@ -12,13 +15,68 @@ def saved_outfits():
     sort = request.args.get("sort", "newest")
 
     service = OutfitService(current_app.db)
-    outfits = service.get_user_outfits(session.get("user_id"), sort=sort)
+    outfits, next_cursor = service.get_user_outfits_page(session.get("user_id"), sort=sort)
 
     return render_template("saved_outfits.html", 
                          outfits=outfits, 
+                         total=service.get_outfit_total(session.get("user_id")),
+                         next_cursor=next_cursor,
                          sort=sort,
                          active_page='saved-outfits')
 
+@outfit_bp.route("/api/outfits")
+def list_outfits():
+    """one page of saved outfits as JSON, follow next_cursor for the next page"""
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    sort = request.args.get("sort", "newest")
+    cursor = request.args.get("cursor")
+    limit = min(max(request.args.get("limit", PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+
+    service = OutfitService(current_app.db)
+    try:
+        outfits, next_cursor = service.get_user_outfits_page(
+            session.get("user_id"), sort=sort, cursor=cursor, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "outfits": [outfit_to_json(outfit, current_app.storage) for outfit in outfits],
+        "next_cursor": next_cursor,
+        "total": service.get_outfit_total(session.get("user_id"))
+    })
+
+def outfit_to_json(outfit, storage):
+    """JSON-safe view of an outfit with its clothing images (URLs from storage)"""
+    def garment(item):
+        if not item:
+            return None
+        item = with_image_urls(storage, item)
+        return {
+            "_id": str(item['_id']),
+            "image_path": item.get('image_path'),
+            "image_url": item['image_url'],
+            "thumbnails": item['thumbnails']
+        }
+
+    def id_str(value):
+        return str(value) if value else None
+
+    created_at = outfit.get('created_at')
+
+    return {
+        "_id": outfit['_id'],
+        "outfit_name": outfit.get('outfit_name'),
+        "top_id": id_str(outfit.get('top_id')),
+        "bottom_id": id_str(outfit.get('bottom_id')),
+        "footwear_id": id_str(outfit.get('footwear_id')),
+        "created_at": created_at.isoformat() if created_at else None,
+        "top": garment(outfit.get('top')),
+        "bottom": garment(outfit.get('bottom')),
+        "footwear": garment(outfit.get('footwear'))
+    }
+
 @outfit_bp.route("/api/save-outfit", methods=["POST"])
 def save_outfit():
     if not session.get("user_id"):
@@ -65,22 +123,45 @@ def delete_outfit(outfit_id):
 
     return jsonify({"success": True})
 
+@outfit_bp.route("/api/outfits/batch", methods=["POST"])
+def batch_outfits():
+    """
+    applies {"operations": [{"op": "create"|"update"|"delete", "outfit_id", outfit fields}]}
+    in one bulk write, returns one result per operation
+    """
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object with operations"}), 400
+
+    service = OutfitService(current_app.db)
+    try:
+        results = service.apply_batch(session.get("user_id"), data.get("operations"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "success": all(result["success"] for result in results),
+        "results": results,
+        "total": service.get_outfit_total(session.get("user_id"))
+    })
+
 @outfit_bp.route("/edit-outfit/<outfit_id>")
 def edit_outfit(outfit_id):
     if not session.get("username"):
         return redirect("/login")
 
     outfit_service = OutfitService(current_app.db)
-    clothing_service = ClothingService(current_app.db)
+    clothing_service = ClothingService(current_app.db, current_app.catalog_cache)
 
     outfit = outfit_service.get_outfit_by_id(outfit_id)
-    tops = clothing_service.get_by_category("top")
-    bottoms = clothing_service.get_by_category("bottom")
-    footwear = clothing_service.get_by_category("footwear")
+    catalog = clothing_service.get_catalog(session.get("user_id"))
 
     return render_template("edit_outfit.html",
                            outfit=outfit,
-                           tops=tops,
-                           bottoms=bottoms,
-                           footwear=footwear,
+                           tops=catalog["top"],
+                           bottoms=catalog["bottom"],
+                           footwear=catalog["footwear"],
                            active_page='saved-outfits')
\ No newline at end of file
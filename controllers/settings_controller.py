@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, session, current_app
 from services.user_service import UserService
+from services.password_hasher import HasherBusyError
 
 settings_bp = Blueprint("settings", __name__)
 
@@ -8,9 +9,10 @@ def settings():
     if not session.get("user_id"):
         return redirect("/login")
 
-    service = UserService(current_app.db)
+    service = UserService(current_app.db, current_app.password_hasher)
     error = None
     success = None
+    status = 200
     
     if request.method == "POST":
         action = request.form.get("action")
@@ -38,6 +40,9 @@ def settings():
 
         except ValueError as e:
             error = str(e)
+        except HasherBusyError as e:
+            error = str(e)
+            status = 503
 
     return render_template(
         "settings.html",
@@ -45,4 +50,4 @@ def settings():
         error=error,
         success=success,
         active_page='settings'
-    )
\ No newline at end of file
+    ), status
\ No newline at end of file
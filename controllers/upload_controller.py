@@ -1,8 +1,8 @@
-import os
 from flask import Blueprint, request, jsonify, session, current_app
-from werkzeug.utils import secure_filename
-from datetime import datetime
 from bson import ObjectId
+from werkzeug.exceptions import RequestEntityTooLarge
+from services.upload_service import UploadService
+from services.upload_pipeline import UploadTooLargeError
 
 upload_bp = Blueprint("upload", __name__)
 
@@ -11,6 +11,11 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+@upload_bp.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    # the request body exceeded MAX_CONTENT_LENGTH
+    return jsonify({"error": "Image is too large"}), 413
+
 @upload_bp.route("/api/upload-clothing", methods=["POST"])
 def upload_clothing():
     if not session.get("user_id"):
@@ -29,59 +34,52 @@ def upload_clothing():
         return jsonify({"error": "No file selected"}), 400
 
     if file and allowed_file(file.filename):
-        # Create unique filename
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        unique_filename = f"{session.get('user_id')}_{timestamp}_{filename}"
-
-        # Save to uploads folder
-        upload_folder = os.path.join(current_app.root_path, 'static', 'images', 'uploads')
-        os.makedirs(upload_folder, exist_ok=True)
-
-        filepath = os.path.join(upload_folder, unique_filename)
-        file.save(filepath)
-
-        # Save to database
-        image_path = f"static/images/uploads/{unique_filename}"
-
-        document = {
-            "category": category,
-            "subcategory": "custom",
-            "subcategory_name": "custom_upload",
-            "color": "custom",
-            "neckline": None,
-            "length": None,
-            "image_path": image_path,
-            "is_default": False,
-            "user_id": session.get("user_id"),
-            "created_at": datetime.utcnow()
-        }
-
-        result = current_app.db.clothing.insert_one(document)
+        service = UploadService(current_app.db, current_app.upload_pipeline, current_app.catalog_cache)
+        try:
+            item_id, status = service.save_upload(session.get("user_id"), category, file)
+        except UploadTooLargeError as e:
+            return jsonify({"error": str(e)}), 413
 
+        # a pending upload is processed in the background, poll /api/upload-status/<item_id>
         return jsonify({
             "success": True,
-            "image_path": image_path,
-            "item_id": str(result.inserted_id)
-        })
+            "status": status,
+            "item_id": item_id
+        }), 202 if status == "pending" else 201
 
     return jsonify({"error": "Invalid file type"}), 400
 
 
-@upload_bp.route("/api/delete-clothing/<item_id>", methods=["DELETE"])
-def delete_clothing(item_id):
+@upload_bp.route("/api/upload-status/<item_id>")
+def upload_status(item_id):
     if not session.get("user_id"):
         return jsonify({"error": "Not logged in"}), 401
 
-    from bson import ObjectId
+    if not ObjectId.is_valid(item_id):
+        return jsonify({"error": "Item not found or not yours"}), 404
 
-    # Nur eigene Uploads löschen (mit user_id)
-    result = current_app.db.clothing.delete_one({
-        "_id": ObjectId(item_id),
-        "user_id": session.get("user_id")
+    service = UploadService(current_app.db, current_app.upload_pipeline)
+    item = service.get_status(session.get("user_id"), item_id)
+
+    if not item:
+        return jsonify({"error": "Item not found or not yours"}), 404
+
+    return jsonify({
+        "item_id": item_id,
+        "status": item.get("status", "ready"),
+        "image_path": item.get("image_path"),
+        "error": item.get("error")
     })
 
-    if result.deleted_count > 0:
+
+@upload_bp.route("/api/delete-clothing/<item_id>", methods=["DELETE"])
+def delete_clothing(item_id):
+    if not session.get("user_id"):
+        return jsonify({"error": "Not logged in"}), 401
+
+    service = UploadService(current_app.db, current_app.upload_pipeline, current_app.catalog_cache)
+
+    if service.delete_upload(session.get("user_id"), item_id):
         return jsonify({"success": True})
     else:
-        return jsonify({"error": "Item not found or not yours"}), 404
\ No newline at end of file
+        return jsonify({"error": "Item not found or not yours"}), 404
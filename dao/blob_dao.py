@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+
+class BlobDAO:
+    """
+    content-addressed upload files, one document per stored file:
+    {_id: sha256 of the stored bytes, path, size, thumbnails, color, color_histogram, embedding,
+     sources: [sha256 of raw uploads], refcount: number of clothing items using it, updated_at}
+    a blob whose refcount dropped to 0 is removed by scripts/gc_uploads.py
+    """
+
+    def __init__(self, db):
+        self.collection = db.blobs
+
+    def get(self, digest):
+        return self.collection.find_one({"_id": digest})
+
+    def acquire_source(self, source_digest):
+        """
+        takes a reference on the blob a raw upload was already stored as
+        returns the blob or None if these bytes were never uploaded
+        """
+        return self.collection.find_one_and_update(
+            {"sources": source_digest},
+            {"$inc": {"refcount": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def acquire(self, digest, source_digest, attributes=None):
+        """
+        takes a reference on the blob, creating it on the first use
+        attributes: path, size, thumbnails, ... of a new blob (None for a known blob)
+        """
+        update = {
+            "$inc": {"refcount": 1},
+            "$set": {"updated_at": datetime.utcnow()},
+            "$addToSet": {"sources": source_digest}
+        }
+        if attributes:
+            update["$setOnInsert"] = attributes
+
+        return self.collection.find_one_and_update(
+            {"_id": digest},
+            update,
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    def fill(self, digest, attributes):
+        """
+        sets the attributes of a blob acquire() created without them (the garbage
+        collection deleted the known blob in between), returns the blob
+        """
+        return self.collection.find_one_and_update(
+            {"_id": digest},
+            {"$set": attributes},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def release(self, digest):
+        """drops one reference, the file stays until the garbage collection"""
+        self.collection.update_one(
+            {"_id": digest, "refcount": {"$gt": 0}},
+            {"$inc": {"refcount": -1}, "$set": {"updated_at": datetime.utcnow()}}
+        )
+
+    def get_unreferenced(self, grace_seconds):
+        """blobs without references that were not touched during the grace period"""
+        cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+        return list(self.collection.find({"refcount": {"$lte": 0}, "updated_at": {"$lt": cutoff}}))
+
+    def delete_unreferenced(self, digest, grace_seconds):
+        """
+        deletes the blob document unless it got a new reference in the meantime
+        returns True if the files may be removed
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+        result = self.collection.delete_one(
+            {"_id": digest, "refcount": {"$lte": 0}, "updated_at": {"$lt": cutoff}}
+        )
+        return result.deleted_count > 0
+
+    def get_paths(self):
+        """paths of all stored files and their thumbnails"""
+        paths = set()
+        for blob in self.collection.find({}, {"path": 1, "thumbnails.path": 1}):
+            paths.add(blob["path"])
+            paths.update(thumbnail["path"] for thumbnail in blob.get("thumbnails") or [])
+        return paths
+
+    def recount(self, clothing):
+        """recomputes every refcount from the clothing items, returns the number of fixed blobs"""
+        counts = {
+            row["_id"]: row["count"]
+            for row in clothing.aggregate([
+                {"$match": {"blob": {"$exists": True}}},
+                {"$group": {"_id": "$blob", "count": {"$sum": 1}}}
+            ])
+        }
+
+        fixed = 0
+        for blob in self.collection.find({}, {"refcount": 1}):
+            count = counts.get(blob["_id"], 0)
+            if blob.get("refcount") != count:
+                self.collection.update_one(
+                    {"_id": blob["_id"]},
+                    {"$set": {"refcount": count, "updated_at": datetime.utcnow()}}
+                )
+                fixed += 1
+        return fixed
@@ -0,0 +1,22 @@
+DEFAULTS = "defaults"
+
+class CatalogVersionDAO:
+    """
+    catalog versions in catalog_versions, one document per owner of clothing items:
+    {_id: "defaults" (the default items) or user_id (their uploads), version}
+    every change of the items bumps the version, so all app processes and the browsers
+    caching /api/catalog can tell whether a catalog changed without loading it
+    """
+
+    def __init__(self, db):
+        self.collection = db.catalog_versions
+
+    def bump(self, user_id=None):
+        """after a change of the uploads of user_id, or of the default items if no user is given"""
+        self.collection.update_one({"_id": user_id or DEFAULTS}, {"$inc": {"version": 1}}, upsert=True)
+
+    def get(self, user_id=None):
+        """(version of the default items, version of the uploads of user_id), 0 if never bumped"""
+        owners = [DEFAULTS, user_id] if user_id else [DEFAULTS]
+        versions = {doc["_id"]: doc["version"] for doc in self.collection.find({"_id": {"$in": owners}})}
+        return versions.get(DEFAULTS, 0), versions.get(user_id, 0)
@@ -0,0 +1,98 @@
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# counts saved outfits: created numbers the default names ("My Outfit N"), total is the current count
+def saved(count):
+    return {"$inc": {"created": count, "total": count}}
+
+def deleted(count):
+    return {"$inc": {"total": -count}}
+
+def initial_counter(user_id, count):
+    return {"_id": user_id, "created": count, "total": count}
+
+class CounterDAO:
+    """
+    per-user outfit counters, one document per user in outfit_counters:
+    {_id: user_id, created: outfits ever saved, total: outfits saved now}
+    saving costs one $inc however many outfits a user has, concurrent saves get different numbers
+    users from before the counters get theirs from one count of their outfits on first use
+    """
+
+    def __init__(self, db):
+        self.collection = db.outfit_counters
+        self.outfits = db.outfits
+
+    def outfit_saved(self, user_id):
+        """counts a new outfit (before it is inserted), returns its number"""
+        return self.outfits_saved(user_id, 1)
+
+    def outfits_saved(self, user_id, count):
+        """counts count new outfits with one $inc, returns the number of the first one"""
+        counter = self.collection.find_one_and_update(
+            {"_id": user_id}, saved(count), return_document=ReturnDocument.AFTER)
+        if counter:
+            return counter["created"] - count + 1
+
+        existing = self.outfits.count_documents({"user_id": user_id})
+        try:
+            self.collection.insert_one(initial_counter(user_id, existing + count))
+        except DuplicateKeyError:
+            # a concurrent save created the counter first
+            return self.outfits_saved(user_id, count)
+        return existing + 1
+
+    def outfits_deleted(self, user_id, count=1):
+        # without a counter there is nothing to correct, it is created from a fresh count
+        self.collection.update_one({"_id": user_id}, deleted(count))
+
+    def total(self, user_id):
+        """number of saved outfits of the user"""
+        counter = self.collection.find_one({"_id": user_id}, {"total": 1})
+        if counter:
+            return counter["total"]
+
+        count = self.outfits.count_documents({"user_id": user_id})
+        try:
+            self.collection.insert_one(initial_counter(user_id, count))
+        except DuplicateKeyError:
+            return self.total(user_id)
+        return count
+
+class AsyncCounterDAO:
+    """CounterDAO for the ASGI app (db from pymongo's AsyncMongoClient)"""
+
+    def __init__(self, db):
+        self.collection = db.outfit_counters
+        self.outfits = db.outfits
+
+    async def outfit_saved(self, user_id):
+        return await self.outfits_saved(user_id, 1)
+
+    async def outfits_saved(self, user_id, count):
+        counter = await self.collection.find_one_and_update(
+            {"_id": user_id}, saved(count), return_document=ReturnDocument.AFTER)
+        if counter:
+            return counter["created"] - count + 1
+
+        existing = await self.outfits.count_documents({"user_id": user_id})
+        try:
+            await self.collection.insert_one(initial_counter(user_id, existing + count))
+        except DuplicateKeyError:
+            return await self.outfits_saved(user_id, count)
+        return existing + 1
+
+    async def outfits_deleted(self, user_id, count=1):
+        await self.collection.update_one({"_id": user_id}, deleted(count))
+
+    async def total(self, user_id):
+        counter = await self.collection.find_one({"_id": user_id}, {"total": 1})
+        if counter:
+            return counter["total"]
+
+        count = await self.outfits.count_documents({"user_id": user_id})
+        try:
+            await self.collection.insert_one(initial_counter(user_id, count))
+        except DuplicateKeyError:
+            return await self.total(user_id)
+        return count
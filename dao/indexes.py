@@ -0,0 +1,105 @@
+"""
+MisMatch Index Bootstrap
+Creates all indexes the app relies on and checks with explain() that the
+hot queries use them. Runs on app startup (see create_app) or by hand:
+
+    python -m dao.indexes
+"""
+
+from datetime import datetime
+from pymongo import ASCENDING
+
+# collection -> index keys, every entry is created with create_index (idempotent)
+INDEXES = {
+    "users": [
+        ([("username", ASCENDING)], {"unique": True}),
+    ],
+    "outfits": [
+        # saved outfits sorted by newest/oldest and a-z, counts per user
+        ([("user_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], {}),
+        ([("user_id", ASCENDING), ("outfit_name", ASCENDING), ("_id", ASCENDING)], {}),
+    ],
+    "clothing": [
+        ([("category", ASCENDING)], {}),
+        ([("color", ASCENDING)], {}),
+        ([("is_default", ASCENDING)], {}),
+        ([("category", ASCENDING), ("color", ASCENDING)], {}),
+        # wardrobe of one user: default items (user_id null) + their uploads, per category
+        ([("user_id", ASCENDING), ("category", ASCENDING)], {}),
+        # uploads stuck in processing (UploadPipeline.sweep), only pending items are indexed
+        ([("created_at", ASCENDING)], {"partialFilterExpression": {"status": "pending"}}),
+    ],
+    "blobs": [
+        # re-uploads of known bytes, unreferenced blobs for the garbage collection
+        ([("sources", ASCENDING)], {}),
+        ([("refcount", ASCENDING), ("updated_at", ASCENDING)], {}),
+    ],
+}
+
+# (description, collection, filter, sort) of the queries that must not scan the collection
+HOT_QUERIES = [
+    ("saved outfits newest/oldest", "outfits", {"user_id": ""}, [("created_at", -1), ("_id", -1)]),
+    ("saved outfits a-z", "outfits", {"user_id": ""}, [("outfit_name", 1), ("_id", 1)]),
+    ("outfit count per user", "outfits", {"user_id": ""}, None),
+    ("clothing by category", "clothing", {"category": "top"}, None),
+    ("uploads of a user", "clothing", {"user_id": "", "category": "top"}, None),
+    ("wardrobe of a user", "clothing", {"category": "top", "user_id": {"$in": [None, ""]}}, None),
+    ("default items", "clothing", {"user_id": None}, None),
+    ("stale pending uploads", "clothing", {"status": "pending", "created_at": {"$lt": datetime(1970, 1, 1)}}, None),
+    ("user by username", "users", {"username": ""}, None),
+    ("blob of a re-upload", "blobs", {"sources": ""}, None),
+]
+
+def ensure_indexes(db):
+    """creates missing indexes, returns the names of all managed indexes"""
+    names = []
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        for keys, options in indexes:
+            names.append(collection.create_index(keys, **options))
+    return names
+
+def _stages(plan):
+    """all stage names of an explain() plan tree"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _stages(value)
+
+def verify_indexes(db):
+    """raises RuntimeError if a hot query falls back to a collection scan"""
+    collscans = []
+    for description, collection_name, query, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+
+        plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in set(_stages(plan)):
+            collscans.append(f"{description} ({collection_name} {query})")
+
+    if collscans:
+        raise RuntimeError("Queries without index (COLLSCAN): " + ", ".join(collscans))
+
+def main():
+    from config import Config, get_mongo_client
+
+    client = get_mongo_client(Config)
+    db = client[Config.MONGO_DB_NAME]
+
+    print("Creating indexes...")
+    for name in ensure_indexes(db):
+        print(f"  ✓ {name}")
+
+    print("\nVerifying query plans...")
+    verify_indexes(db)
+    print("  ✓ No hot query uses a collection scan")
+
+    client.close()
+
+if __name__ == "__main__":
+    main()
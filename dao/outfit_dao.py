@@ -1,16 +1,19 @@
 from datetime import datetime
 from bson import ObjectId
+from dao.counter_dao import CounterDAO
+from dao.projections import OUTFIT_SUMMARY
 
 class OutfitDAO:
     def __init__(self, db):
         self.collection = db.outfits
+        self.counters = CounterDAO(db)
 
     def create_outfit(self, user_id, top_id, bottom_id, footwear_id, outfit_name=None):
         """Create a new outfit"""
+        number = self.counters.outfit_saved(user_id)
         # Generate outfit name if not provided
         if not outfit_name:
-            count = self.collection.count_documents({"user_id": user_id})
-            outfit_name = f"Outfit {count + 1}"
+            outfit_name = f"Outfit {number}"
         
         outfit_doc = {
             "user_id": user_id,
@@ -21,17 +24,22 @@ class OutfitDAO:
             "created_at": datetime.utcnow()
         }
         
-        result = self.collection.insert_one(outfit_doc)
+        try:
+            result = self.collection.insert_one(outfit_doc)
+        except Exception:
+            # the outfit was counted before the insert, the number stays used
+            self.counters.outfits_deleted(user_id)
+            raise
         outfit_doc['_id'] = result.inserted_id
         return outfit_doc
 
     def get_user_outfits(self, user_id):
         """Get all outfits for a specific user"""
-        return list(self.collection.find({"user_id": user_id}).sort("created_at", -1))
+        return list(self.collection.find({"user_id": user_id}, OUTFIT_SUMMARY).sort("created_at", -1))
 
-    def get_outfit_by_id(self, outfit_id):
+    def get_outfit_by_id(self, outfit_id, projection=OUTFIT_SUMMARY):
         """Get a specific outfit by ID"""
-        return self.collection.find_one({"_id": ObjectId(outfit_id)})
+        return self.collection.find_one({"_id": ObjectId(outfit_id)}, projection)
 
     def delete_outfit(self, outfit_id, user_id):
         """Delete an outfit (only if it belongs to the user)"""
@@ -39,6 +47,8 @@ class OutfitDAO:
             "_id": ObjectId(outfit_id),
             "user_id": user_id
         })
+        if result.deleted_count:
+            self.counters.outfits_deleted(user_id)
         return result.deleted_count > 0
 
     def update_outfit_name(self, outfit_id, user_id, new_name):
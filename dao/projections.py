@@ -0,0 +1,64 @@
+"""
+Named field projections, one per use case
+only the fields a caller actually reads are sent over the wire and decoded
+"""
+
+# clothing card in the generator, edit page and wardrobe
+CATALOG_CARD = {
+    "category": 1,
+    "subcategory": 1,
+    "subcategory_name": 1,
+    "color": 1,
+    "image_path": 1,
+    "image_digest": 1,
+    "thumbnails": 1
+}
+
+# features of the compatibility matrices (services/recommendation_service.py)
+COMPATIBILITY_FEATURES = {
+    "category": 1,
+    "subcategory_name": 1,
+    "color": 1,
+    "color_histogram": 1
+}
+
+# embeddings of the similarity index (services/similarity_service.py)
+SIMILARITY_FEATURES = {
+    "category": 1,
+    "embedding": 1
+}
+
+# garment image on a saved outfit card
+OUTFIT_THUMBNAIL = {
+    "image_path": 1,
+    "image_digest": 1,
+    "thumbnails": 1
+}
+
+# saved outfit list and edit page (without updated_at)
+OUTFIT_SUMMARY = {
+    "user_id": 1,
+    "outfit_name": 1,
+    "top_id": 1,
+    "bottom_id": 1,
+    "footwear_id": 1,
+    "created_at": 1
+}
+
+# password verification on login and password change
+AUTH_CHECK = {
+    "username": 1,
+    "password_hash": 1,
+    "avatar": 1
+}
+
+# session data after registration (no password hash)
+USER_SESSION = {
+    "username": 1,
+    "avatar": 1
+}
+
+# existence checks
+ID_ONLY = {
+    "_id": 1
+}
@@ -12,11 +12,11 @@ class UserDAO:
             "created_at": datetime.utcnow()
         })
 
-    def get_by_username(self,username):
-        return self.collection.find_one({"username": username})
+    def get_by_username(self, username, projection=None):
+        return self.collection.find_one({"username": username}, projection)
     
-    def get_by_id(self, user_id):
-        return self.collection.find_one({"_id": ObjectId(user_id)})
+    def get_by_id(self, user_id, projection=None):
+        return self.collection.find_one({"_id": ObjectId(user_id)}, projection)
     
     def update_username(self, user_id, new_username):
         self.collection.update_one(
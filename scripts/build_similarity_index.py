@@ -0,0 +1,77 @@
+"""
+MisMatch Similarity Index Script
+Writes the embeddings of all clothing items to the memory-mapped similarity
+index (SIMILARITY_INDEX_DIR, see services/similarity_service.py). A running
+app picks the new files up on its next start, until then it adds new items
+to its in-memory part. With --backfill it first computes the embeddings of
+items that have none (catalog items and uploads from before the similarity
+search), running apps pick those up with the catalog version it bumps.
+
+Run from the project root: python -m scripts.build_similarity_index [--backfill]
+"""
+
+import io
+import os
+import sys
+
+from PIL import Image
+
+from config import Config, get_mongo_client
+from dao.catalog_version_dao import CatalogVersionDAO
+from dao.projections import SIMILARITY_FEATURES
+from services.color_analysis import analyze_colors
+from services.embeddings import EMBEDDING_SIZE, image_embedding
+from services.similarity_service import SimilarityIndex
+from services.storage import create_storage
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def backfill(collection, storage):
+    """computes missing embeddings (and color histograms), returns (processed, failed)"""
+    query = {
+        "image_path": {"$ne": None},
+        "$or": [{"embedding": {"$exists": False}}, {"embedding": {"$size": 0}}]
+    }
+    processed = 0
+    failed = 0
+
+    for item in collection.find(query, {"image_path": 1, "color_histogram": 1}):
+        try:
+            with Image.open(io.BytesIO(storage.get(item["image_path"]))) as image:
+                color_histogram = item.get("color_histogram") or analyze_colors(image)[1]
+                embedding = image_embedding(image, color_histogram)
+        except (OSError, ValueError) as e:
+            print(f"  ✗ {item['image_path']}: {e}")
+            failed += 1
+            continue
+
+        collection.update_one(
+            {"_id": item["_id"]},
+            {"$set": {"embedding": embedding, "color_histogram": color_histogram}}
+        )
+        processed += 1
+
+    return processed, failed
+
+def build_index(collection, directory):
+    """writes every item with an embedding to directory, returns the index"""
+    index = SimilarityIndex()
+    index.add(collection.find({"embedding": {"$size": EMBEDDING_SIZE}}, SIMILARITY_FEATURES))
+    index.save(directory)
+    return index
+
+if __name__ == "__main__":
+    client = get_mongo_client(Config)
+    collection = client[Config.MONGO_DB_NAME].clothing
+    directory = os.path.join(PROJECT_ROOT, Config.SIMILARITY_INDEX_DIR)
+
+    if "--backfill" in sys.argv:
+        print("Computing missing embeddings...")
+        processed, failed = backfill(collection, create_storage(Config, PROJECT_ROOT))
+        print(f"  {processed} items (failed: {failed})")
+        if processed:
+            # running apps look up the embeddings of items that had none again
+            CatalogVersionDAO(client[Config.MONGO_DB_NAME]).bump()
+
+    index = build_index(collection, directory)
+    print(f"Similarity index: {len(index)} items -> {directory}")
@@ -0,0 +1,129 @@
+"""
+MisMatch Upload Garbage Collection
+Removes uploaded images no clothing item uses anymore:
+  1. uploads still pending after --stale seconds are marked failed (their job
+     was lost with a crashed or redeployed worker), old temp files are removed
+  2. blobs whose refcount dropped to 0 (file + thumbnails + blob document)
+  3. orphaned files below static/images/uploads and static/images/derived/uploads
+     that neither a blob nor a clothing item references (e.g. left behind by
+     the old {user_id}_{timestamp}_{filename} uploads)
+Files and blobs younger than the grace period are kept, they may belong to
+an upload that is still being processed. Works with every storage backend
+(STORAGE_BACKEND, see services/storage.py).
+
+Run from the project root:
+    python -m scripts.gc_uploads [--dry-run] [--recount] [--grace SECONDS] [--stale SECONDS]
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+from config import Config, get_mongo_client
+from dao.blob_dao import BlobDAO
+from services.storage import create_storage
+from services.upload_pipeline import UploadPipeline
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_FOLDERS = ["static/images/uploads", "static/images/derived/uploads"]
+DEFAULT_GRACE_SECONDS = 3600
+
+def remove(storage, path, dry_run):
+    """deletes a stored file, returns its size (0 if it is gone)"""
+    size = storage.size(path)
+    if size is None:
+        return 0
+    if not dry_run:
+        storage.delete(path)
+    return size
+
+def collect_blobs(storage, blobs, grace, dry_run):
+    """returns (removed blobs, freed bytes)"""
+    removed = 0
+    freed = 0
+
+    for blob in blobs.get_unreferenced(grace):
+        # the delete is conditional, a blob that was re-acquired in the meantime is kept
+        if not dry_run and not blobs.delete_unreferenced(blob["_id"], grace):
+            continue
+
+        paths = [blob["path"]] + [thumbnail["path"] for thumbnail in blob.get("thumbnails") or []]
+        freed += sum(remove(storage, path, dry_run) for path in paths)
+        removed += 1
+        print(f"  ✗ {blob['path']}")
+
+    return removed, freed
+
+def referenced_paths(db, blobs):
+    """paths of all files still in use"""
+    paths = blobs.get_paths()
+    for item in db.clothing.find({"image_path": {"$ne": None}}, {"image_path": 1, "thumbnails.path": 1}):
+        paths.add(item["image_path"])
+        paths.update(thumbnail["path"] for thumbnail in item.get("thumbnails") or [])
+    return paths
+
+def collect_orphans(storage, db, blobs, grace, dry_run):
+    """returns (removed files, freed bytes)"""
+    referenced = referenced_paths(db, blobs)
+    cutoff = time.time() - grace
+
+    removed = 0
+    freed = 0
+
+    for folder in UPLOAD_FOLDERS:
+        for path, size, modified in sorted(storage.list(folder)):
+            if path in referenced or modified > cutoff:
+                continue
+
+            if not dry_run:
+                storage.delete(path)
+            freed += size
+            removed += 1
+            print(f"  ✗ {path}")
+
+    return removed, freed
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove uploaded images that are no longer used")
+    parser.add_argument("--dry-run", action="store_true", help="only list what would be removed")
+    parser.add_argument("--recount", action="store_true", help="recompute the refcounts from the clothing items first")
+    parser.add_argument("--grace", type=int, default=DEFAULT_GRACE_SECONDS,
+                        help=f"keep files touched within this many seconds (default {DEFAULT_GRACE_SECONDS})")
+    parser.add_argument("--stale", type=int, default=Config.UPLOAD_STALE_SECONDS,
+                        help=f"fail uploads pending for this many seconds (default {Config.UPLOAD_STALE_SECONDS})")
+    args = parser.parse_args()
+
+    client = get_mongo_client(Config)
+    db = client[Config.MONGO_DB_NAME]
+    blobs = BlobDAO(db)
+    storage = create_storage(Config, PROJECT_ROOT)
+
+    if args.recount:
+        print(f"Refcounts fixed: {blobs.recount(db.clothing)}")
+
+    print("Interrupted uploads...")
+    if args.dry_run:
+        stale = db.clothing.count_documents({"status": "pending",
+                                             "created_at": {"$lt": datetime.utcnow() - timedelta(seconds=args.stale)}})
+        print(f"  {stale} pending uploads")
+    else:
+        pipeline = UploadPipeline(db, storage, tmp_dir=Config.UPLOAD_TMP_DIR, workers=1)
+        failed, temp_files = pipeline.sweep(args.stale)
+        print(f"  {failed} pending uploads failed, {temp_files} temp files removed")
+
+    print("Unreferenced blobs...")
+    blob_count, blob_bytes = collect_blobs(storage, blobs, args.grace, args.dry_run)
+
+    print("Orphaned files...")
+    orphan_count, orphan_bytes = collect_orphans(storage, db, blobs, args.grace, args.dry_run)
+
+    print(f"\n{'='*50}")
+    print(f"{'Would remove' if args.dry_run else 'Removed'}: {blob_count} blobs, {orphan_count} orphaned files")
+    print(f"Disk space {'to reclaim' if args.dry_run else 'reclaimed'}: {(blob_bytes + orphan_bytes) / 1024:.0f} KB")
+    print(f"{'='*50}")
+
+    client.close()
+
+if __name__ == "__main__":
+    main()
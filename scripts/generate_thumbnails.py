@@ -0,0 +1,81 @@
+"""
+MisMatch Thumbnail Script
+Generates the responsive WebP/AVIF thumbnails for every clothing item that
+has none yet (or all with --force), stores their paths and the content hashes
+for the fingerprinted image URLs on the documents and prints how many bytes
+the thumbnails save compared to the full images.
+
+Run from the project root: python -m scripts.generate_thumbnails [--force]
+"""
+
+import os
+import sys
+
+from config import Config, get_mongo_client
+from dao.catalog_version_dao import CatalogVersionDAO
+from services.image_derivatives import THUMBNAIL_FORMATS, THUMBNAIL_WIDTHS, generate_derivatives
+from services.storage import create_storage, file_digest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def generate_all(collection, storage, force=False):
+    """returns (original bytes, {(format, width): bytes}, processed, failed)"""
+    query = {"image_path": {"$ne": None}}
+    if not force:
+        # also items from before the fingerprinted URLs (no content hashes yet)
+        query["$or"] = [
+            {"thumbnails": {"$exists": False}},
+            {"image_digest": {"$exists": False}},
+            {"thumbnails.0.digest": {"$exists": False}}
+        ]
+
+    original_bytes = 0
+    derived_bytes = {}
+    processed = 0
+    failed = 0
+
+    for item in collection.find(query, {"image_path": 1}):
+        try:
+            data = storage.get(item["image_path"])
+            thumbnails = generate_derivatives(storage, item["image_path"])
+        except (OSError, ValueError) as e:
+            print(f"  ✗ {item['image_path']}: {e}")
+            failed += 1
+            continue
+
+        collection.update_one(
+            {"_id": item["_id"]},
+            {"$set": {"thumbnails": thumbnails, "image_digest": file_digest(data)}}
+        )
+
+        original_bytes += len(data)
+        for thumbnail in thumbnails:
+            key = (thumbnail["format"], thumbnail["width"])
+            derived_bytes[key] = derived_bytes.get(key, 0) + thumbnail["bytes"]
+        processed += 1
+
+    return original_bytes, derived_bytes, processed, failed
+
+def print_report(original_bytes, derived_bytes, processed, failed):
+    print(f"\n{'='*50}")
+    print(f"Items processed: {processed} (failed: {failed})")
+    print(f"Full-size images: {original_bytes / 1024:.0f} KB")
+
+    for image_format in THUMBNAIL_FORMATS:
+        for width in THUMBNAIL_WIDTHS:
+            size = derived_bytes.get((image_format, width))
+            if size is None:
+                continue
+            saved = 100 * (1 - size / original_bytes) if original_bytes else 0
+            print(f"  - {image_format} {width}w: {size / 1024:.0f} KB ({saved:.1f}% smaller)")
+    print(f"{'='*50}")
+
+if __name__ == "__main__":
+    client = get_mongo_client(Config)
+    db = client[Config.MONGO_DB_NAME]
+    storage = create_storage(Config, PROJECT_ROOT)
+
+    print("Generating thumbnails...")
+    print_report(*generate_all(db.clothing, storage, force="--force" in sys.argv))
+    # the image URLs changed, the default version is part of every user's catalog version
+    CatalogVersionDAO(db).bump()
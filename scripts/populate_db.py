@@ -1,17 +1,51 @@
 """
 MisMatch Database Population Script
 Populates MongoDB with clothing items from image files
+
+Incremental: new and changed images (by content hash) are upserted, unchanged
+ones are skipped, so it can run against the live database.
+    python populate_db.py              sync the catalog
+    python populate_db.py --prune      also remove items whose image is gone
+    python populate_db.py --rebuild    build in a staging collection, swap in with one rename
 """
 
+import argparse
 import os
 import re
-from pymongo import MongoClient
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from pymongo import MongoClient, UpdateOne
 from datetime import datetime
 
+# make the app modules importable when run from the scripts folder
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config import Config
+from dao.catalog_version_dao import CatalogVersionDAO
+from dao.indexes import INDEXES
+from services.color_analysis import analyze_colors
+from services.embeddings import image_embedding
+from services.image_derivatives import generate_derivatives
+from services.storage import create_storage, file_digest
+
 # MongoDB connection
-MONGODB_URI = "mongodb://localhost:27017/"  # Update if your MongoDB is hosted elsewhere
-DATABASE_NAME = "mismatch"
+MONGODB_URI = Config.MONGO_URI  # set MONGO_URI if your MongoDB is hosted elsewhere
+DATABASE_NAME = Config.MONGO_DB_NAME
 COLLECTION_NAME = "clothing"
+STAGING_COLLECTION = "clothing_staging"
+
+# Image tree: static/images/clothing/<folder>/...
+CLOTHING_FOLDER = "static/images/clothing"
+CATEGORY_FOLDERS = {
+    "top": "tops",
+    "bottom": "bottoms",
+    "footwear": "footwear"
+}
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+BATCH_SIZE = 1000
 
 # Define subcategory mappings
 TOPS_SUBCATEGORIES = {
@@ -108,17 +142,42 @@ def parse_filename(filename, category):
         'is_default': False
     }
 
-def create_clothing_document(filename, category, image_folder):
-    """Create a MongoDB document for a clothing item"""
+def create_clothing_document(category, image_path, storage):
+    """Create a MongoDB document for a clothing item (image_path relative to the project root)"""
     
+    filename = os.path.basename(image_path)
     metadata = parse_filename(filename, category)
     
     if metadata is None:
         return None
-    
-    # Construct image path (relative to static directory)
-    # Updated to use clothing subfolder
-    image_path = f"static/images/clothing/{image_folder}/{filename}"
+
+    # copy the image into the storage backend (local storage already holds the source file)
+    try:
+        source = os.path.join(PROJECT_ROOT, image_path)
+        with open(source, "rb") as f:
+            data = f.read()
+        local_path = getattr(storage, "local_path", None)
+        if not local_path or local_path(image_path) != os.path.abspath(source):
+            storage.put(image_path, data)
+    except Exception as e:
+        print(f"  ⚠ Could not store {filename}: {e}")
+        return None
+
+    # responsive WebP/AVIF thumbnails (static/images/derived/...)
+    try:
+        thumbnails = generate_derivatives(storage, image_path)
+    except Exception as e:
+        print(f"  ⚠ No thumbnails for {filename}: {e}")
+        thumbnails = []
+
+    # color histogram (the color name itself comes from the filename) and similarity embedding
+    try:
+        with Image.open(source) as image:
+            color_histogram = analyze_colors(image)[1]
+            embedding = image_embedding(image, color_histogram)
+    except Exception as e:
+        print(f"  ⚠ No color histogram for {filename}: {e}")
+        color_histogram, embedding = [], []
     
     document = {
         'category': category,
@@ -128,132 +187,153 @@ def create_clothing_document(filename, category, image_folder):
         'neckline': metadata['neckline'],
         'length': metadata['length'],
         'image_path': image_path,
+        # content hash for the fingerprinted image URL
+        'image_digest': file_digest(data),
         'is_default': metadata['is_default'],
+        'thumbnails': thumbnails,
+        'color_histogram': color_histogram,
+        'embedding': embedding,
         'created_at': datetime.utcnow()
     }
     
     return document
 
-def populate_database():
-    """Main function to populate the database"""
+def scan_images():
+    """(category, image_path) of every image below static/images/clothing/<folder>, subfolders included"""
+    images = []
+    for category, folder in CATEGORY_FOLDERS.items():
+        top = os.path.join(PROJECT_ROOT, CLOTHING_FOLDER, folder)
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    path = os.path.relpath(os.path.join(dirpath, filename), PROJECT_ROOT)
+                    images.append((category, path.replace(os.sep, "/")))
+    return images
+
+def process_image(category, image_path, known_digest, storage, force=False):
+    """
+    runs in a worker thread: hashes the file and builds the document if it is new or changed
+    returns ("unchanged", None), ("changed", document) or ("skipped", None)
+    """
+    with open(os.path.join(PROJECT_ROOT, image_path), "rb") as f:
+        digest = file_digest(f.read())
+
+    if digest == known_digest and not force:
+        return "unchanged", None
+
+    document = create_clothing_document(category, image_path, storage)
+    return ("changed", document) if document else ("skipped", None)
+
+def sync_catalog(collection, storage, prune=False, force=False, workers=None, batch_size=BATCH_SIZE):
+    """
+    brings the catalog items of the collection in line with the image tree
+    new and changed images are upserted by image_path (unordered bulk_write batches),
+    so existing items keep the _id saved outfits refer to; uploads (user_id) are never touched
+    returns counters for the summary
+    """
+    catalog = {"user_id": {"$exists": False}}
+    known = {
+        item["image_path"]: item.get("image_digest")
+        for item in collection.find(catalog, {"image_path": 1, "image_digest": 1})
+    }
+    images = scan_images()
+    stats = {"scanned": len(images), "unchanged": 0, "inserted": 0, "updated": 0, "skipped": 0, "removed": 0}
+    pending = []
+
+    def flush():
+        if not pending:
+            return
+        result = collection.bulk_write(pending, ordered=False)
+        stats["inserted"] += result.upserted_count
+        stats["updated"] += result.modified_count
+        print(f"  ✓ Wrote {len(pending)} items")
+        pending.clear()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            lambda image: process_image(image[0], image[1], known.get(image[1]), storage, force),
+            images
+        )
+
+        for (category, image_path), (state, document) in zip(images, results):
+            if state != "changed":
+                stats[state] += 1
+                continue
+
+            created_at = document.pop('created_at')
+            pending.append(UpdateOne(
+                {"image_path": image_path, **catalog},
+                {"$set": document, "$setOnInsert": {"created_at": created_at}},
+                upsert=True
+            ))
+            if len(pending) >= batch_size:
+                flush()
+
+    flush()
+
+    if prune:
+        # catalog items whose image file is gone
+        missing = sorted(set(known) - {image_path for _, image_path in images})
+        for i in range(0, len(missing), batch_size):
+            result = collection.delete_many({"image_path": {"$in": missing[i:i + batch_size]}, **catalog})
+            stats["removed"] += result.deleted_count
+
+    return stats
+
+def populate_database(rebuild=False, prune=False, force=False, workers=None, batch_size=BATCH_SIZE):
+    """
+    Main function to populate the database
+    incremental by default: only new and changed images are written while the app keeps running
+    rebuild: builds the complete collection in a staging collection and swaps it in with one rename
+             (uploads saved while it runs are not in the copy, pause uploads for a rebuild)
+    """
+    start = time.perf_counter()
     
     # Connect to MongoDB
     print("Connecting to MongoDB...")
     client = MongoClient(MONGODB_URI)
     db = client[DATABASE_NAME]
     collection = db[COLLECTION_NAME]
-    
-    # Clear existing data (optional - comment out if you want to keep existing data)
-    print("Clearing existing clothing data...")
-    collection.delete_many({})
-    
-    # Image data organized by category
-    image_data = {
-        'top': {
-            'folder': 'tops',
-            'files': [
-                '1a_black_round.png',
-                '1a_grey_round.png',
-                '1a_marineblue_round.png',
-                '1a_white_round.png',
-                '1a_yellow_round.png',
-                '1b_bordeaux_round.png',
-                '1b_white_round.png',
-                '2_beige_round.png',
-                '2_black_round.png',
-                '2_brown_round.png',
-                '2_grey_round.png',
-                '2_white_round.png',
-                '3_black_round.png',
-                '3_bordeaux_round.png',
-                '3_brown_round.png',
-                '3_green_round.png',
-                '3_grey_round.png',
-                '3_marineblue_round.png',
-                '3_yellow_round.png',
-                '6_black_v.png',
-                '6_white_round.png',
-
-            ]
-        },
-        'bottom': {
-            'folder': 'bottoms',
-            'files': [
-                '1_black.png',
-                '1_darkblue.png',
-                '1_darkgray.png',
-                '1_lightblue.png',
-                '1_lightgray.png',
-                '1_middleblue.png',
-                '1_white.png',
-                '2_beige.png',
-                '2_black.png',
-                '2_brown.png',
-                '2_gray.png',
-                '2_red.png',
-                '4_black.png',
-                '5_black_long.png',
-                '5_black_mini.png',
-                '5_bordeaux_long.png',
-                '5_jeans_mini.png',
-                '6_black.png',
-                '6_gray.png',
-                '6_grown.png',
-                '6_lightblue.png',
-                '6_middleblue.png',
-                '7_black.png',
-                '7_lightgray.png',
-
-            ]
-        },
-        'footwear': {
-            'folder': 'footwear',
-            'files': [
-                '1_black.jpeg',
-                '1_black.png',
-                '1_blue.png',
-                '1_grey.png',
-                '1_red.png',
-                '1_white.png',
-                '2_black.png',
-                '3_beige.png',
-                '3_black.png',
-
-
-            ]
-        }
-    }
-    
-    # Insert documents
-    total_inserted = 0
-    
-    for category, data in image_data.items():
-        print(f"\nProcessing {category}s...")
-        folder = data['folder']
-        files = data['files']
-        
-        for filename in files:
-            document = create_clothing_document(filename, category, folder)
-            
-            if document:
-                result = collection.insert_one(document)
-                print(f"  ✓ Inserted: {filename} (ID: {result.inserted_id})")
-                total_inserted += 1
-            else:
-                print(f"  ✗ Skipped: {filename}")
-    
-    # Create indexes
+
+    # Image storage (STORAGE_BACKEND, see services/storage.py)
+    storage = create_storage(Config, PROJECT_ROOT)
+
+    if rebuild:
+        # start from a copy, so uploads and unchanged items keep their _id
+        print(f"Copying {COLLECTION_NAME} into {STAGING_COLLECTION}...")
+        db.drop_collection(STAGING_COLLECTION)
+        collection.aggregate([{"$out": STAGING_COLLECTION}])
+        target = db[STAGING_COLLECTION]
+    else:
+        target = collection
+
+    print("Scanning images...")
+    stats = sync_catalog(target, storage, prune=prune, force=force, workers=workers, batch_size=batch_size)
+
+    # Create indexes (a renamed collection keeps its indexes)
     print("\nCreating indexes...")
-    collection.create_index([("category", 1)])
-    collection.create_index([("color", 1)])
-    collection.create_index([("is_default", 1)])
-    collection.create_index([("category", 1), ("color", 1)])
+    for keys, options in INDEXES[COLLECTION_NAME]:
+        target.create_index(keys, **options)
     print("  ✓ Indexes created")
+
+    if rebuild:
+        # atomic swap, readers see either the old or the new collection
+        target.rename(COLLECTION_NAME, dropTarget=True)
+        print(f"  ✓ Swapped {STAGING_COLLECTION} in as {COLLECTION_NAME}")
+
+    # browsers reload the catalog (/api/catalog) with the next dashboard visit
+    CatalogVersionDAO(db).bump()
     
     # Print summary
     print(f"\n{'='*50}")
-    print(f"Database population complete!")
-    print(f"Total items inserted: {total_inserted}")
+    print(f"Database population complete! ({time.perf_counter() - start:.1f}s)")
+    print(f"Images scanned: {stats['scanned']}")
+    print(f"  - Unchanged: {stats['unchanged']}")
+    print(f"  - Inserted: {stats['inserted']}")
+    print(f"  - Updated: {stats['updated']}")
+    print(f"  - Skipped: {stats['skipped']}")
+    print(f"  - Removed: {stats['removed']}")
     print(f"  - Tops: {collection.count_documents({'category': 'top'})}")
     print(f"  - Bottoms: {collection.count_documents({'category': 'bottom'})}")
     print(f"  - Footwear: {collection.count_documents({'category': 'footwear'})}")
@@ -264,6 +344,7 @@ def populate_database():
     client.close()
     print("\nMongoDB connection closed.")
 
+
 def verify_database():
     """Verify the database was populated correctly"""
     
@@ -324,12 +405,22 @@ def verify_database():
     print("\n" + "="*50)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync the clothing catalog with static/images/clothing")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="build the collection in a staging collection and swap it in atomically")
+    parser.add_argument("--prune", action="store_true", help="remove catalog items whose image file is gone")
+    parser.add_argument("--force", action="store_true", help="rewrite all items, even unchanged ones")
+    parser.add_argument("--workers", type=int, default=None, help="hashing/thumbnail threads")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="items per bulk_write")
+    args = parser.parse_args()
+
     print("="*50)
     print("MisMatch Database Population Script")
     print("="*50)
     
     try:
-        populate_database()
+        populate_database(rebuild=args.rebuild, prune=args.prune, force=args.force,
+                          workers=args.workers, batch_size=args.batch_size)
         verify_database()
         
         print("\n✅ SUCCESS! Your database is ready to use.")
@@ -3,12 +3,19 @@ Database Query Test Script
 Test various database queries to ensure everything works correctly
 """
 
+import os
+import sys
 from pymongo import MongoClient
 import random
 
-# MongoDB connection
-MONGODB_URI = "mongodb://localhost:27017/"
-DATABASE_NAME = "mismatch_db"
+# make the app modules importable when run from the scripts folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+# MongoDB connection (same database as the app and populate_db.py)
+MONGODB_URI = Config.MONGO_URI
+DATABASE_NAME = Config.MONGO_DB_NAME
 
 def test_basic_queries():
     """Test basic database queries"""
@@ -0,0 +1,60 @@
+"""
+Image Route Test Script
+Checks that /img (controllers/image_controller.py) only serves files below
+static/images/ and answers path traversal (also %2f / %2e encoded) with 404.
+Needs no database.
+
+Run from the project root: python -m scripts.test_image_route
+"""
+
+import os
+import sys
+
+from flask import Flask
+
+# make the app modules importable when run from the scripts folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.image_controller import image_bp
+from services.storage import LocalStorage
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TRAVERSALS = [
+    "/img/x/static/images/../../config.py",
+    "/img/x/static/images/..%2f..%2fconfig.py",
+    "/img/x/static/images/%2e%2e/%2e%2e/config.py",
+    "/img/x/static/images/uploads/..%2f..%2f..%2f.git/config",
+    "/img/x/config.py",
+]
+
+def create_test_app(sendfile=""):
+    app = Flask(__name__, root_path=PROJECT_ROOT)
+    app.config["IMAGE_SENDFILE"] = sendfile
+    app.config["IMAGE_ACCEL_REDIRECT_PREFIX"] = "/_files/"
+    app.storage = LocalStorage(PROJECT_ROOT)
+    app.register_blueprint(image_bp)
+    return app
+
+def test_image_is_served():
+    client = create_test_app().test_client()
+    response = client.get("/img/x/static/images/Logo.png")
+    assert response.status_code == 200, f"❌ Logo.png answered {response.status_code}"
+    response.close()
+
+def test_path_traversal_is_rejected():
+    for sendfile in ["", "x-accel-redirect"]:
+        client = create_test_app(sendfile).test_client()
+        for url in TRAVERSALS:
+            response = client.get(url)
+            assert response.status_code == 404, f"❌ {url} ({sendfile or 'send_file'}) answered {response.status_code}"
+            assert "X-Accel-Redirect" not in response.headers, f"❌ {url} was redirected to nginx"
+
+def main():
+    test_image_is_served()
+    print("✓ images below static/images/ are served")
+    test_path_traversal_is_rejected()
+    print("✓ path traversal answers 404")
+
+if __name__ == "__main__":
+    main()
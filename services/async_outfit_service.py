@@ -0,0 +1,111 @@
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from dao.counter_dao import AsyncCounterDAO
+from dao.projections import OUTFIT_SUMMARY, OUTFIT_THUMBNAIL
+from services.outfit_service import (
+    PAGE_SIZE, apply_write_errors, attach_garments, batch_requests, build_page_query,
+    garment_ids, mark_unmatched_updates, needs_default_name, new_outfit_document, outfit_update,
+    parse_batch, split_page, written_updates
+)
+
+class AsyncOutfitService:
+    """async counterpart of OutfitService for the ASGI app (db from pymongo's AsyncMongoClient)"""
+
+    def __init__(self, db):
+        self.collection = db.outfits
+        self.clothing = db.clothing
+        self.counters = AsyncCounterDAO(db)
+
+    async def save_outfit(self, user_id, outfit_name, top_id, bottom_id, footwear_id):
+        """Save a new outfit"""
+        number = await self.counters.outfit_saved(user_id)
+        if needs_default_name(outfit_name):
+            outfit_name = f"My Outfit {number}"
+
+        document = new_outfit_document(user_id, outfit_name, top_id, bottom_id, footwear_id)
+        try:
+            result = await self.collection.insert_one(document)
+        except Exception:
+            # the outfit was counted before the insert, the number stays used
+            await self.counters.outfits_deleted(user_id)
+            raise
+        return str(result.inserted_id)
+
+    async def get_user_outfits_page(self, user_id, sort="newest", cursor=None, limit=PAGE_SIZE):
+        """
+        Get one page of outfits with clothing details (keyset pagination)
+        returns (outfits, next_cursor), next_cursor is None on the last page
+        """
+        query, sort_spec = build_page_query(user_id, sort, cursor)
+
+        outfits = await self.collection.find(query, OUTFIT_SUMMARY).sort(sort_spec).limit(limit + 1).to_list()
+        outfits, next_cursor = split_page(outfits, sort, limit)
+
+        ids = garment_ids(outfits)
+        clothing = {}
+        if ids:
+            async for item in self.clothing.find({"_id": {"$in": ids}}, OUTFIT_THUMBNAIL):
+                clothing[str(item['_id'])] = item
+
+        attach_garments(outfits, clothing)
+
+        return outfits, next_cursor
+
+    async def get_outfit_by_id(self, outfit_id):
+        """Get a single outfit by ID"""
+        outfit = await self.collection.find_one({"_id": ObjectId(outfit_id)}, OUTFIT_SUMMARY)
+        if outfit:
+            outfit['_id'] = str(outfit['_id'])
+        return outfit
+
+    async def update_outfit(self, outfit_id, outfit_name, top_id, bottom_id, footwear_id):
+        """Update an existing outfit (FR-M8)"""
+        await self.collection.update_one(
+            {"_id": ObjectId(outfit_id)},
+            outfit_update(outfit_name, top_id, bottom_id, footwear_id)
+        )
+
+    async def delete_outfit(self, outfit_id):
+        """Delete an outfit"""
+        outfit = await self.collection.find_one_and_delete({"_id": ObjectId(outfit_id)}, {"user_id": 1})
+        if outfit:
+            await self.counters.outfits_deleted(outfit["user_id"])
+
+    async def apply_batch(self, user_id, operations):
+        """creates, updates and deletes outfits with one ownership query and one unordered bulk_write"""
+        ops, results = parse_batch(operations)
+
+        ids = [outfit_id for _, _, outfit_id, _ in ops if outfit_id]
+        owned = set()
+        if ids:
+            async for outfit in self.collection.find({"_id": {"$in": ids}, "user_id": user_id}, {"_id": 1}):
+                owned.add(outfit["_id"])
+
+        creates = sum(1 for _, op, _, _ in ops if op == "create")
+        number = await self.counters.outfits_saved(user_id, creates) if creates else None
+
+        requests, indexes = batch_requests(user_id, ops, owned, number, results)
+        if not requests:
+            return results
+
+        try:
+            details = (await self.collection.bulk_write(requests, ordered=False)).bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+
+        removed = details.get("nRemoved", 0) + apply_write_errors(details, indexes, results)
+        if removed:
+            await self.counters.outfits_deleted(user_id, removed)
+
+        updates = written_updates(results)
+        if details.get("nMatched", 0) < len(updates):
+            existing = set()
+            async for outfit in self.collection.find({"_id": {"$in": updates}, "user_id": user_id}, {"_id": 1}):
+                existing.add(outfit["_id"])
+            mark_unmatched_updates(results, existing)
+
+        return results
+
+    async def get_outfit_total(self, user_id):
+        """number of saved outfits of the user (from the counter, no count over the outfits)"""
+        return await self.counters.total(user_id)
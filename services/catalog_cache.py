@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULTS_KEY = "defaults"
+
+def uploads_key(user_id):
+    return f"uploads:{user_id}"
+
+class CatalogCache:
+    """
+    in-process cache for the clothing catalog
+    entries map a key (default items or uploads of an owner) to {category: [items]}
+    every invalidation bumps the version, loads started before it are not stored
+    entries can carry a stamp (the catalog version from dao/catalog_version_dao.py they were
+    loaded at), a get with another stamp treats them as missing
+    """
+
+    def __init__(self, enabled=True, max_entries=256, ttl=300):
+        self.enabled = enabled
+        self.max_entries = max(max_entries, 1)
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, stamp=None):
+        """cached buckets for key or None (also if stamp is given and differs)"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry and self.ttl and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+
+            # changed by another process since it was loaded
+            if entry and stamp is not None and entry[2] != stamp:
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, buckets, version, stamp=None):
+        """stores buckets loaded at the given version (ignored if outdated)"""
+        with self._lock:
+            if version != self.version:
+                return
+
+            self._entries[key] = (time.monotonic(), buckets, stamp)
+            self._entries.move_to_end(key)
+
+            # least recently used overlays go first, the default items stay
+            while len(self._entries) > self.max_entries:
+                oldest = next(k for k in self._entries if k != DEFAULTS_KEY)
+                del self._entries[oldest]
+
+    def invalidate(self, user_id=None):
+        """drops the uploads of user_id, or everything if no user is given"""
+        with self._lock:
+            self.version += 1
+
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(uploads_key(user_id), None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -1,26 +1,92 @@
+from bson import ObjectId
+from dao.catalog_version_dao import CatalogVersionDAO
+from dao.projections import CATALOG_CARD
+from services.catalog_cache import DEFAULTS_KEY, uploads_key
+
+CATEGORIES = ["top", "bottom", "footwear"]
+
+# uploads still being processed (or rejected) are not part of the catalog
+READY = {"status": {"$nin": ["pending", "failed"]}}
+
+def visible_to(user_id):
+    """the default items (no user_id) and the uploads of user_id, uses the (user_id, category) index"""
+    return {"user_id": {"$in": [None, user_id]}}
+
 class ClothingService:
-    def __init__(self, db):
+    def __init__(self, db, cache=None):
         self.collection = db.clothing
+        self.cache = cache
+        self.versions = CatalogVersionDAO(db)
 
-    def get_by_category(self, category):
+    def get_by_category(self, category, user_id=None, versions=None):
         """
-        retrieves all clothing items of each cetegory
+        retrieves the default items and the uploads of user_id of one cetegory
         category: "top", "bottom", "footwear"
+        user_id: owner of the uploads, None for the default items only
+        versions: catalog versions from get_catalog_versions, cached items of other versions are reloaded
         """
-        items = list(self.collection.find({"category": category}))
-        
-        # convert ObjectId to string for JSON
-        for item in items:
-            item['_id'] = str(item['_id'])
-        
-        return items
+        if not self.cache or not self.cache.enabled:
+            return self._find({"category": category, **visible_to(user_id), **READY}, CATALOG_CARD)
+
+        defaults_version, uploads_version = versions or (None, None)
+
+        defaults = self._cached(DEFAULTS_KEY, {"user_id": None}, defaults_version)
+        if user_id is None:
+            return defaults.get(category, [])
+
+        # every user has their own uploads entry on top of the shared defaults
+        uploads = self._cached(uploads_key(user_id), {"user_id": user_id, **READY}, uploads_version)
+        return defaults.get(category, []) + uploads.get(category, [])
+
+    def get_catalog(self, user_id=None, versions=None):
+        """
+        retrieves the items of all categories at once (default items and the uploads of user_id)
+        returns {"top": [...], "bottom": [...], "footwear": [...]}
+        """
+        if self.cache and self.cache.enabled:
+            return {category: self.get_by_category(category, user_id, versions) for category in CATEGORIES}
+
+        query = {"category": {"$in": CATEGORIES}, **visible_to(user_id), **READY}
+        return self._group(self._find(query, CATALOG_CARD))
+
+    def get_catalog_versions(self, user_id=None):
+        """
+        (version of the default items, version of the uploads of user_id), one query by _id
+        read them before the items, so the items are at least as new as the versions
+        """
+        return self.versions.get(user_id)
+
+    def get_items(self, item_ids, projection=None):
+        """retrieves the given items (string ids) with one query"""
+        return self._find({"_id": {"$in": [ObjectId(item_id) for item_id in item_ids]}}, projection)
 
     def get_all_clothing(self):
         """retrieves all clothing items"""
-        items = list(self.collection.find())
+        return self._find({})
+
+    def _cached(self, key, query, stamp=None):
+        """items matching query grouped by category, served from the cache if possible"""
+        buckets = self.cache.get(key, stamp)
+        if buckets is not None:
+            return buckets
+
+        version = self.cache.version
+        buckets = self._group(self._find(query, CATALOG_CARD))
+
+        self.cache.put(key, buckets, version, stamp)
+        return buckets
+
+    def _group(self, items):
+        buckets = {category: [] for category in CATEGORIES}
+        for item in items:
+            buckets.setdefault(item.get('category'), []).append(item)
+        return buckets
+
+    def _find(self, query, projection=None):
+        items = list(self.collection.find(query, projection))
         
         # convert ObjectId to string for JSON
         for item in items:
             item['_id'] = str(item['_id'])
         
-        return items
\ No newline at end of file
+        return items
@@ -0,0 +1,97 @@
+import numpy as np
+from PIL import Image
+
+# the color names of the clothing filenames (see scripts/populate_db.py), each measured as the
+# median garment color of the default catalog photos with that name (studio light, so muted)
+PALETTE = {
+    "black": (35, 36, 38),
+    "darkgray": (44, 45, 48),
+    "grey": (130, 129, 130),
+    "lightgray": (170, 170, 170),
+    "white": (211, 210, 209),
+    "beige": (166, 159, 152),
+    "brown": (98, 87, 80),
+    "bordeaux": (51, 28, 32),
+    "red": (137, 63, 61),
+    "yellow": (235, 222, 198),
+    "green": (100, 122, 104),
+    "marineblue": (28, 30, 37),
+    "darkblue": (37, 43, 65),
+    "middleblue": (97, 119, 144),
+    "lightblue": (138, 154, 163),
+}
+PALETTE_NAMES = list(PALETTE)
+
+# images are analyzed at this size, enough for the color distribution and fast on any upload
+ANALYSIS_SIZE = 64
+# Lab distance from the border color under which a pixel counts as background
+BACKGROUND_DISTANCE = 12.0
+# below this share of foreground pixels the background guess is ignored (garment fills the photo)
+MIN_FOREGROUND = 0.05
+
+_RGB_TO_XYZ = np.array([
+    [0.4124, 0.3576, 0.1805],
+    [0.2126, 0.7152, 0.0722],
+    [0.0193, 0.1192, 0.9505],
+])
+_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+def to_lab(rgb):
+    """sRGB values (..., 3) in 0-255 -> CIELAB, distances in Lab follow perceived color differences"""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = (c @ _RGB_TO_XYZ.T) / _WHITE
+    f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16 / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+_PALETTE_LAB = to_lab(np.array(list(PALETTE.values())))
+
+def foreground_pixels(image):
+    """
+    Lab values of the garment pixels of a downsampled image
+    transparent pixels are background, otherwise pixels close to the median border color
+    """
+    image = image.convert("RGBA")
+    image.thumbnail((ANALYSIS_SIZE, ANALYSIS_SIZE))
+    pixels = np.asarray(image, dtype=np.float64)
+
+    lab = to_lab(pixels[..., :3])
+    mask = pixels[..., 3] >= 128
+
+    if mask.all():
+        border = np.concatenate([lab[0], lab[-1], lab[:, 0], lab[:, -1]])
+        background = np.median(border, axis=0)
+        mask = np.linalg.norm(lab - background, axis=-1) > BACKGROUND_DISTANCE
+        if mask.mean() < MIN_FOREGROUND:
+            mask[:] = True
+
+    return lab[mask]
+
+def quantize(lab):
+    """index of the nearest palette color for every Lab pixel (N, 3) -> (N,)"""
+    distances = np.linalg.norm(lab[:, None, :] - _PALETTE_LAB[None, :, :], axis=-1)
+    return distances.argmin(axis=1)
+
+def analyze_colors(image):
+    """
+    dominant palette color and color histogram of a PIL image
+    the histogram bins every garment pixel on the palette, the dominant color is the palette
+    color nearest to the median garment color (robust against shadows and folds)
+    returns (color name, [share per PALETTE_NAMES entry]), ("custom", []) for an empty image
+    """
+    lab = foreground_pixels(image)
+    if len(lab) == 0:
+        return "custom", []
+
+    counts = np.bincount(quantize(lab), minlength=len(PALETTE_NAMES))
+    histogram = counts / counts.sum()
+    dominant = quantize(np.median(lab, axis=0)[None, :])[0]
+    return PALETTE_NAMES[int(dominant)], [round(float(share), 3) for share in histogram]
+
+def analyze_file(path):
+    with Image.open(path) as image:
+        return analyze_colors(image)
@@ -0,0 +1,38 @@
+import numpy as np
+from PIL import Image, ImageOps
+from services.color_analysis import PALETTE_NAMES
+
+# downsampled grayscale silhouette, SHAPE_SIZE x SHAPE_SIZE pixels
+SHAPE_SIZE = 8
+EMBEDDING_SIZE = len(PALETTE_NAMES) + SHAPE_SIZE * SHAPE_SIZE
+# share of color and shape in the cosine similarity
+COLOR_WEIGHT = 0.7
+SHAPE_WEIGHT = 0.3
+
+def _unit(vector):
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+def shape_features(image):
+    """centered grayscale pixels of the image padded to a square on white, SHAPE_SIZE x SHAPE_SIZE"""
+    image = image.convert("RGBA")
+    background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+    gray = Image.alpha_composite(background, image).convert("L")
+    gray = ImageOps.pad(gray, (SHAPE_SIZE, SHAPE_SIZE), color=255)
+
+    pixels = np.asarray(gray, dtype=np.float64).ravel() / 255.0
+    return pixels - pixels.mean()
+
+def image_embedding(image, color_histogram):
+    """
+    compact CPU-only embedding of a PIL image for the similarity search (EMBEDDING_SIZE floats, unit length)
+    color_histogram: the histogram of analyze_colors(image), an empty histogram counts as no color
+    """
+    histogram = np.zeros(len(PALETTE_NAMES))
+    if len(color_histogram) == len(PALETTE_NAMES):
+        # sqrt: cosine of square-rooted histograms is the Bhattacharyya coefficient
+        histogram = _unit(np.sqrt(np.asarray(color_histogram, dtype=np.float64)))
+
+    shape = _unit(shape_features(image))
+    embedding = np.concatenate([COLOR_WEIGHT * histogram, SHAPE_WEIGHT * shape])
+    return [round(float(value), 4) for value in _unit(embedding)]
@@ -0,0 +1,111 @@
+import random
+import threading
+from collections import OrderedDict
+from services.catalog_cache import DEFAULTS_KEY
+
+GENERATOR_CATEGORIES = ["top", "bottom", "footwear"]
+
+class GarmentIndex:
+    """
+    in-memory arrays of garment ids per category and per color
+    drawing a garment is one random array index, O(1) for any catalog size
+    """
+
+    def __init__(self, catalog):
+        self.items = {}
+        self.ids = {}
+        self.by_color = {}
+
+        for category, items in catalog.items():
+            self.ids[category] = []
+            self.by_color[category] = {}
+            for item in items:
+                self.items[item['_id']] = item
+                self.ids[category].append(item['_id'])
+                if item.get('color'):
+                    self.by_color[category].setdefault(item['color'].lower(), []).append(item['_id'])
+
+    def draw(self, rng, category, color=None):
+        """random item of the category (optionally of one color), None if there is none"""
+        if color:
+            ids = self.by_color.get(category, {}).get(color.lower(), [])
+        else:
+            ids = self.ids.get(category, [])
+
+        if not ids:
+            return None
+        return self.items[ids[rng.randrange(len(ids))]]
+
+class GarmentIndexCache:
+    """GarmentIndex per user, rebuilt when the user's catalog versions (dao/catalog_version_dao.py) change"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max(max_entries, 1)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def get_entry(self, key):
+        """(version, index) even if outdated, for indexes that are updated instead of rebuilt"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version, index):
+        with self._lock:
+            self._entries[key] = (version, index)
+            self._entries.move_to_end(key)
+            # least recently used users go first, an index shared by all users (DEFAULTS_KEY) stays
+            while len(self._entries) > self.max_entries:
+                oldest = next((k for k in self._entries if k != DEFAULTS_KEY), None)
+                if oldest is None:
+                    break
+                del self._entries[oldest]
+
+class GeneratorService:
+    def __init__(self, clothing_service, index_cache=None):
+        self.clothing_service = clothing_service
+        self.index_cache = index_cache
+
+    def get_index(self, user_id):
+        """the user's GarmentIndex, built from the catalog on a miss"""
+        if not self.index_cache:
+            return GarmentIndex(self.clothing_service.get_catalog(user_id))
+
+        # versions from the database, changes made by other processes and the scripts count as well
+        versions = self.clothing_service.get_catalog_versions(user_id)
+        index = self.index_cache.get(user_id, versions)
+        if index is None:
+            index = GarmentIndex(self.clothing_service.get_catalog(user_id, versions))
+            self.index_cache.put(user_id, versions, index)
+        return index
+
+    def generate(self, user_id, count=1, seed=None, colors=None):
+        """
+        draws count random outfits (FR-S2), the same seed gives the same outfits
+        colors: optional {category: color} filter
+        returns (outfits, seed), a category without matching items is None
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        rng = random.Random(seed)
+        colors = colors or {}
+        index = self.get_index(user_id)
+
+        outfits = []
+        for _ in range(count):
+            outfits.append({
+                category: index.draw(rng, category, colors.get(category))
+                for category in GENERATOR_CATEGORIES
+            })
+
+        return outfits, seed
@@ -0,0 +1,70 @@
+import io
+import os
+from PIL import Image, features
+from services.storage import file_digest
+
+# fixed widths of the responsive thumbnails
+THUMBNAIL_WIDTHS = [160, 320, 640]
+
+# WebP works everywhere, AVIF only if this Pillow build supports it
+THUMBNAIL_FORMATS = ["webp"] + (["avif"] if features.check("avif") else [])
+
+SAVE_OPTIONS = {
+    "webp": {"quality": 80, "method": 6},
+    "avif": {"quality": 60},
+}
+
+def derivative_path(image_path, width, image_format):
+    """
+    static/images/clothing/tops/1a_black_round.png
+    -> static/images/derived/clothing/tops/1a_black_round-160.webp
+    """
+    relative = os.path.splitext(image_path)[0]
+    if relative.startswith("static/images/"):
+        relative = relative[len("static/images/"):]
+    return f"static/images/derived/{relative}-{width}.{image_format}"
+
+def generate_derivatives(storage, image_path, widths=THUMBNAIL_WIDTHS, formats=THUMBNAIL_FORMATS):
+    """
+    writes the thumbnails of a stored image (services/storage.py) next to the other derivatives
+    returns [{"width": 160, "format": "webp", "path": ..., "bytes": ..., "digest": sha256}, ...]
+    widths above the original width are skipped, the smallest one is always made
+    """
+    thumbnails = []
+
+    with Image.open(io.BytesIO(storage.get(image_path))) as image:
+        image = image.convert("RGBA")
+        sizes = [width for width in widths if width < image.width] or [min(widths)]
+
+        for width in sizes:
+            height = max(round(image.height * width / image.width), 1)
+            resized = image.resize((width, height), Image.LANCZOS)
+
+            for image_format in formats:
+                path = derivative_path(image_path, width, image_format)
+                out = io.BytesIO()
+                resized.save(out, image_format.upper(), **SAVE_OPTIONS.get(image_format, {}))
+                data = out.getvalue()
+                storage.put(path, data, f"image/{image_format}")
+
+                thumbnails.append({
+                    "width": width,
+                    "format": image_format,
+                    "path": path,
+                    "bytes": len(data),
+                    "digest": file_digest(data)
+                })
+
+    return thumbnails
+
+def srcset(item, image_format="webp", url=None):
+    """
+    srcset attribute of an item's thumbnails in one format ("" if it has none)
+    url: storage.url, maps a path (and its digest) to its public URL
+    """
+    url = url or (lambda path, digest=None: "/" + path)
+    return ", ".join(
+        f"{url(thumbnail['path'], thumbnail.get('digest'))} {thumbnail['width']}w"
+        for thumbnail in item.get("thumbnails") or []
+        if thumbnail["format"] == image_format
+    )
@@ -0,0 +1,248 @@
+import threading
+import time
+from contextvars import ContextVar
+from flask import g, request, template_rendered, before_render_template
+from pymongo import monitoring
+
+# seconds, shared by all latency histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# MongoDB commands issued by one request
+COMMAND_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+# work outside of a request (upload workers, scripts)
+BACKGROUND = "background"
+
+class Histogram:
+    """Prometheus histogram with labels, observations are counted into cumulative buckets on render"""
+
+    def __init__(self, name, help_text, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [count per bucket (+Inf last), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+
+        for label_values, counts, total in series:
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ["+Inf"], counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{{{labels + ',' if labels else ''}{le}}} {cumulative}")
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+class Counter:
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        lines.extend(f"{self.name}{{{_labels(self.labels, labels)}}} {value}" for labels, value in values)
+        return lines
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names, values):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+class RequestStats:
+    """what one request spent outside of Python: MongoDB commands, pool waits, template rendering"""
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.start = time.perf_counter()
+        self.commands = 0
+        self.checkout_started = None
+        self.render_started = None
+        self.recorded = False
+
+# stats of the request running in this thread / task, None outside of requests
+_current = ContextVar("request_stats", default=None)
+
+class MetricsListener(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    """
+    pymongo listener that attributes every command and pool wait to the request that issued it
+    pymongo publishes the events in the thread that runs the operation, so the request's context applies
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def started(self, event):
+        stats = _current.get()
+        if stats:
+            stats.commands += 1
+
+    def succeeded(self, event):
+        stats = _current.get()
+        self.metrics.mongo_duration.observe(
+            event.duration_micros / 1e6, stats.endpoint if stats else BACKGROUND, event.command_name)
+
+    def failed(self, event):
+        stats = _current.get()
+        endpoint = stats.endpoint if stats else BACKGROUND
+        self.metrics.mongo_duration.observe(event.duration_micros / 1e6, endpoint, event.command_name)
+        self.metrics.mongo_failures.inc(endpoint, event.command_name)
+
+    def connection_check_out_started(self, event):
+        stats = _current.get()
+        if stats:
+            stats.checkout_started = time.perf_counter()
+
+    def _checkout_done(self):
+        stats = _current.get()
+        if stats and stats.checkout_started is not None:
+            self.metrics.pool_wait.observe(time.perf_counter() - stats.checkout_started, stats.endpoint)
+            stats.checkout_started = None
+
+    def connection_checked_out(self, event):
+        self._checkout_done()
+
+    def connection_check_out_failed(self, event):
+        self._checkout_done()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+class Metrics:
+    """
+    request and MongoDB metrics of this process in the Prometheus text format (/metrics)
+    with several worker processes every process reports its own numbers
+    """
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            "mismatch_http_request_duration_seconds", "Request latency per route",
+            ("endpoint", "method", "status"))
+        self.request_commands = Histogram(
+            "mismatch_http_request_mongo_commands", "MongoDB commands issued per request",
+            ("endpoint",), COMMAND_COUNT_BUCKETS)
+        self.mongo_duration = Histogram(
+            "mismatch_mongo_command_duration_seconds", "MongoDB command latency per route and command",
+            ("endpoint", "command"))
+        self.mongo_failures = Counter(
+            "mismatch_mongo_command_failures_total", "Failed MongoDB commands per route and command",
+            ("endpoint", "command"))
+        self.pool_wait = Histogram(
+            "mismatch_mongo_pool_wait_seconds", "Time spent waiting for a pooled MongoDB connection",
+            ("endpoint",))
+        self.render_duration = Histogram(
+            "mismatch_template_render_seconds", "Jinja template rendering time", ("endpoint", "template"))
+        self.listener = MetricsListener(self)
+
+    def start_request(self):
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        g._metrics_token = _current.set(RequestStats(endpoint))
+
+    def finish_request(self, status):
+        stats = _current.get()
+        if stats is None or stats.recorded:
+            return
+        stats.recorded = True
+        self.request_duration.observe(time.perf_counter() - stats.start, stats.endpoint, request.method, status)
+        self.request_commands.observe(stats.commands, stats.endpoint)
+
+    def start_render(self, template):
+        stats = _current.get()
+        if stats:
+            stats.render_started = time.perf_counter()
+
+    def finish_render(self, template):
+        stats = _current.get()
+        if stats and stats.render_started is not None:
+            self.render_duration.observe(time.perf_counter() - stats.render_started, stats.endpoint, template.name)
+            stats.render_started = None
+
+    def render(self, pool_stats=None):
+        """the exposition text, pool_stats: config.get_pool_stats() snapshot"""
+        lines = []
+        for metric in [self.request_duration, self.request_commands, self.mongo_duration,
+                       self.mongo_failures, self.pool_wait, self.render_duration]:
+            lines.extend(metric.render())
+
+        if pool_stats:
+            lines.append("# HELP mismatch_mongo_pool_connections Connections of the MongoDB pool")
+            lines.append("# TYPE mismatch_mongo_pool_connections gauge")
+            for state in ["open", "checked_out", "idle"]:
+                lines.append(f'mismatch_mongo_pool_connections{{state="{state}"}} {pool_stats[state]}')
+            lines.append("# HELP mismatch_mongo_pool_wait_queue_timeouts_total Check-outs that hit waitQueueTimeoutMS")
+            lines.append("# TYPE mismatch_mongo_pool_wait_queue_timeouts_total counter")
+            lines.append(f"mismatch_mongo_pool_wait_queue_timeouts_total {pool_stats['wait_queue_timeouts']}")
+
+        return "\n".join(lines) + "\n"
+
+# registry of this process, the MongoClient listener and the app hooks share it
+metrics = Metrics()
+
+def init_metrics(app):
+    """records request, MongoDB and rendering metrics for app, only called with METRICS_ENABLED"""
+
+    @app.before_request
+    def _start():
+        metrics.start_request()
+
+    @app.after_request
+    def _finish(response):
+        metrics.finish_request(response.status_code)
+        return response
+
+    @app.teardown_request
+    def _teardown(exception):
+        # unhandled exceptions skip after_request
+        if exception is not None:
+            metrics.finish_request(500)
+        token = g.pop("_metrics_token", None)
+        if token is not None:
+            _current.reset(token)
+
+    before_render_template.connect(lambda sender, template, context, **extra: metrics.start_render(template), app, weak=False)
+    template_rendered.connect(lambda sender, template, context, **extra: metrics.finish_render(template), app, weak=False)
@@ -1,55 +1,277 @@
-from bson import ObjectId
+import base64
+from bson import ObjectId, json_util
 from datetime import datetime
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from dao.counter_dao import CounterDAO
+from dao.projections import OUTFIT_SUMMARY, OUTFIT_THUMBNAIL
+
+PAGE_SIZE = 24
+BATCH_LIMIT = 100
+BATCH_OPS = ("create", "update", "delete")
+
+# sort option -> (key field, direction), _id breaks ties
+SORT_KEYS = {
+    "newest": ("created_at", -1),
+    "oldest": ("created_at", 1),
+    "az": ("outfit_name", 1),
+}
+
+def encode_cursor(value, outfit_id):
+    """opaque cursor pointing behind the outfit with the given sort value"""
+    raw = json_util.dumps([value, ObjectId(outfit_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    """returns (sort value, ObjectId) of a cursor, raises ValueError if invalid"""
+    try:
+        value, outfit_id = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(outfit_id, ObjectId):
+        raise ValueError("Invalid cursor")
+    return value, outfit_id
+
+def build_page_query(user_id, sort, cursor=None):
+    """keyset query and sort spec for one page of a user's outfits"""
+    field, direction = SORT_KEYS.get(sort, SORT_KEYS["newest"])
+    query = {"user_id": user_id}
+
+    if cursor:
+        value, outfit_id = decode_cursor(cursor)
+        op = "$lt" if direction == -1 else "$gt"
+        query["$or"] = [
+            {field: {op: value}},
+            {field: value, "_id": {op: outfit_id}}
+        ]
+
+    return query, [(field, direction), ("_id", direction)]
+
+def needs_default_name(outfit_name):
+    return not outfit_name or outfit_name.strip() == "" or outfit_name == "My Outfit"
+
+def new_outfit_document(user_id, outfit_name, top_id, bottom_id, footwear_id):
+    return {
+        "user_id": user_id,
+        "outfit_name": outfit_name,
+        "top_id": top_id,
+        "bottom_id": bottom_id,
+        "footwear_id": footwear_id,
+        "created_at": datetime.utcnow()
+    }
+
+def outfit_update(outfit_name, top_id, bottom_id, footwear_id):
+    """$set update for an edited outfit (FR-M8)"""
+    return {"$set": {
+        "outfit_name": outfit_name,
+        "top_id": top_id,
+        "bottom_id": bottom_id,
+        "footwear_id": footwear_id,
+        "updated_at": datetime.utcnow()
+    }}
+
+def parse_batch(operations):
+    """
+    validates a batch of outfit operations ({"op": "create"|"update"|"delete", "outfit_id", fields})
+    returns (ops, results): ops as (index, op, ObjectId or None, operation) for the valid ones,
+    results with one entry per operation, invalid ones already carry their error
+    raises ValueError if the batch itself is invalid
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations must be a non-empty list")
+    if len(operations) > BATCH_LIMIT:
+        raise ValueError(f"At most {BATCH_LIMIT} operations per batch")
+
+    ops, results, seen = [], [], set()
+    for index, operation in enumerate(operations):
+        op = operation.get("op") if isinstance(operation, dict) else None
+        result = {"index": index, "op": op, "success": False}
+        results.append(result)
+
+        if op not in BATCH_OPS:
+            result["error"] = "Unknown operation"
+            continue
+
+        outfit_id = None
+        if op != "create":
+            if not isinstance(operation.get("outfit_id"), str) or not ObjectId.is_valid(operation["outfit_id"]):
+                result["error"] = "Invalid outfit_id"
+                continue
+            outfit_id = ObjectId(operation["outfit_id"])
+            # an unordered bulk write gives no order between two writes to the same outfit
+            if outfit_id in seen:
+                result["error"] = "Outfit appears more than once in the batch"
+                continue
+            seen.add(outfit_id)
+
+        ops.append((index, op, outfit_id, operation))
+
+    return ops, results
+
+def batch_requests(user_id, ops, owned, number, results):
+    """
+    bulk write requests for the parsed ops, returns (requests, index of the operation of each request)
+    owned: ids of the user's outfits, number: counter number of the first created outfit
+    """
+    requests, indexes = [], []
+    for index, op, outfit_id, operation in ops:
+        result = results[index]
+        fields = (operation.get("top_id"), operation.get("bottom_id"), operation.get("footwear_id"))
+
+        if op == "create":
+            outfit_name = operation.get("outfit_name")
+            if needs_default_name(outfit_name):
+                outfit_name = f"My Outfit {number}"
+            number += 1
+            document = new_outfit_document(user_id, outfit_name, *fields)
+            document["_id"] = ObjectId()
+            requests.append(InsertOne(document))
+            outfit_id = document["_id"]
+        elif outfit_id not in owned:
+            result["error"] = "Outfit not found"
+            continue
+        elif op == "update":
+            # user_id in the filter as well, in case the outfit changed hands since the ownership check
+            requests.append(UpdateOne({"_id": outfit_id, "user_id": user_id},
+                                      outfit_update(operation.get("outfit_name"), *fields)))
+        else:
+            requests.append(DeleteOne({"_id": outfit_id, "user_id": user_id}))
+
+        result["success"] = True
+        result["outfit_id"] = str(outfit_id)
+        indexes.append(index)
+
+    return requests, indexes
+
+def apply_write_errors(details, indexes, results):
+    """marks the operations whose write failed, returns how many of them were inserts"""
+    failed_inserts = 0
+    for error in details.get("writeErrors", []):
+        result = results[indexes[error["index"]]]
+        result["success"] = False
+        result["error"] = "Write failed"
+        if result["op"] == "create":
+            del result["outfit_id"]
+            failed_inserts += 1
+    return failed_inserts
+
+def written_updates(results):
+    """ObjectIds of the updates that went through the bulk write without an error"""
+    return [ObjectId(result["outfit_id"]) for result in results if result["op"] == "update" and result["success"]]
+
+def mark_unmatched_updates(results, existing):
+    """updates whose outfit was deleted between the ownership check and the write failed"""
+    for result in results:
+        if result["op"] == "update" and result["success"] and ObjectId(result["outfit_id"]) not in existing:
+            result["success"] = False
+            result["error"] = "Outfit not found"
+
+def split_page(outfits, sort, limit):
+    """cuts the extra lookahead document off, returns (outfits, next_cursor)"""
+    field, _ = SORT_KEYS.get(sort, SORT_KEYS["newest"])
+
+    next_cursor = None
+    if len(outfits) > limit:
+        outfits = outfits[:limit]
+        last = outfits[-1]
+        next_cursor = encode_cursor(last.get(field), last['_id'])
+
+    for outfit in outfits:
+        outfit['_id'] = str(outfit['_id'])
+
+    return outfits, next_cursor
+
+def garment_ids(outfits):
+    """ObjectIds of all tops/bottoms/footwear referenced by the outfits"""
+    ids = set()
+    for outfit in outfits:
+        for field in ('top_id', 'bottom_id', 'footwear_id'):
+            if ObjectId.is_valid(outfit.get(field)):
+                ids.add(ObjectId(outfit[field]))
+    return list(ids)
+
+def attach_garments(outfits, clothing):
+    """attaches the garments (str id -> item), missing ones as None"""
+    for outfit in outfits:
+        outfit['top'] = clothing.get(str(outfit.get('top_id')))
+        outfit['bottom'] = clothing.get(str(outfit.get('bottom_id')))
+        outfit['footwear'] = clothing.get(str(outfit.get('footwear_id')))
 
 class OutfitService:
     def __init__(self, db):
         self.collection = db.outfits
         self.clothing = db.clothing
+        self.counters = CounterDAO(db)
 
     def save_outfit(self, user_id, outfit_name, top_id, bottom_id, footwear_id):
         """Save a new outfit"""
-        if not outfit_name or outfit_name.strip() == "" or outfit_name == "My Outfit":
-          count = self.collection.count_documents({"user_id": user_id})
-          outfit_name = f"My Outfit {count + 1}"  
-        
-        document = {
-            "user_id": user_id,
-            "outfit_name": outfit_name,
-            "top_id": top_id,
-            "bottom_id": bottom_id,
-            "footwear_id": footwear_id,
-            "created_at": datetime.utcnow()
-        }
-        result = self.collection.insert_one(document)
+        number = self.counters.outfit_saved(user_id)
+        if needs_default_name(outfit_name):
+            outfit_name = f"My Outfit {number}"
+
+        document = new_outfit_document(user_id, outfit_name, top_id, bottom_id, footwear_id)
+        try:
+            result = self.collection.insert_one(document)
+        except Exception:
+            # the outfit was counted before the insert, the number stays used
+            self.counters.outfits_deleted(user_id)
+            raise
         return str(result.inserted_id)
 
     def get_user_outfits(self, user_id, sort="newest"):
         query = {"user_id": user_id}
         
         if sort == "newest":
-            cursor = self.collection.find(query).sort("created_at", -1)
+            cursor = self.collection.find(query, OUTFIT_SUMMARY).sort("created_at", -1)
         elif sort == "oldest":
-            cursor = self.collection.find(query).sort("created_at", 1)
+            cursor = self.collection.find(query, OUTFIT_SUMMARY).sort("created_at", 1)
         elif sort =="az":
-            cursor = self.collection.find(query).sort("outfit_name", 1)
+            cursor = self.collection.find(query, OUTFIT_SUMMARY).sort("outfit_name", 1)
         else:
-            cursor = self.collection.find(query)
+            cursor = self.collection.find(query, OUTFIT_SUMMARY)
             
         """Get all outfits for a user with clothing details"""
         outfits = list(cursor)
 
         for outfit in outfits:
             outfit['_id'] = str(outfit['_id'])
-            # Get clothing details
-            outfit['top'] = self.clothing.find_one({"_id": ObjectId(outfit['top_id'])})
-            outfit['bottom'] = self.clothing.find_one({"_id": ObjectId(outfit['bottom_id'])})
-            outfit['footwear'] = self.clothing.find_one({"_id": ObjectId(outfit['footwear_id'])})
+
+        self._attach_clothing(outfits)
 
         return outfits
 
+    def get_user_outfits_page(self, user_id, sort="newest", cursor=None, limit=PAGE_SIZE):
+        """
+        Get one page of outfits with clothing details (keyset pagination)
+        returns (outfits, next_cursor), next_cursor is None on the last page
+        """
+        query, sort_spec = build_page_query(user_id, sort, cursor)
+
+        # one extra document tells whether another page exists
+        outfits = list(self.collection.find(query, OUTFIT_SUMMARY).sort(sort_spec).limit(limit + 1))
+        outfits, next_cursor = split_page(outfits, sort, limit)
+
+        self._attach_clothing(outfits)
+
+        return outfits, next_cursor
+
+    def _attach_clothing(self, outfits):
+        """
+        resolves top/bottom/footwear of all given outfits with one $in query
+        garments that no longer exist are attached as None
+        """
+        ids = garment_ids(outfits)
+
+        clothing = {}
+        if ids:
+            for item in self.clothing.find({"_id": {"$in": ids}}, OUTFIT_THUMBNAIL):
+                clothing[str(item['_id'])] = item
+
+        attach_garments(outfits, clothing)
+
     def get_outfit_by_id(self, outfit_id):
         """Get a single outfit by ID"""
-        outfit = self.collection.find_one({"_id": ObjectId(outfit_id)})
+        outfit = self.collection.find_one({"_id": ObjectId(outfit_id)}, OUTFIT_SUMMARY)
         if outfit:
             outfit['_id'] = str(outfit['_id'])
         return outfit
@@ -58,15 +280,54 @@ class OutfitService:
         """Update an existing outfit (FR-M8)"""
         self.collection.update_one(
             {"_id": ObjectId(outfit_id)},
-            {"$set": {
-                "outfit_name": outfit_name,
-                "top_id": top_id,
-                "bottom_id": bottom_id,
-                "footwear_id": footwear_id,
-                "updated_at": datetime.utcnow()
-            }}
+            outfit_update(outfit_name, top_id, bottom_id, footwear_id)
         )
 
     def delete_outfit(self, outfit_id):
         """Delete an outfit"""
-        self.collection.delete_one({"_id": ObjectId(outfit_id)})
\ No newline at end of file
+        outfit = self.collection.find_one_and_delete({"_id": ObjectId(outfit_id)}, {"user_id": 1})
+        if outfit:
+            self.counters.outfits_deleted(outfit["user_id"])
+
+    def apply_batch(self, user_id, operations):
+        """
+        creates, updates and deletes outfits of the user with one ownership query and one
+        unordered bulk_write, returns one result per operation (in order)
+        """
+        ops, results = parse_batch(operations)
+
+        ids = [outfit_id for _, _, outfit_id, _ in ops if outfit_id]
+        owned = set()
+        if ids:
+            owned = {outfit["_id"] for outfit in
+                     self.collection.find({"_id": {"$in": ids}, "user_id": user_id}, {"_id": 1})}
+
+        creates = sum(1 for _, op, _, _ in ops if op == "create")
+        number = self.counters.outfits_saved(user_id, creates) if creates else None
+
+        requests, indexes = batch_requests(user_id, ops, owned, number, results)
+        if not requests:
+            return results
+
+        try:
+            details = self.collection.bulk_write(requests, ordered=False).bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+
+        # inserts that failed were counted in advance
+        removed = details.get("nRemoved", 0) + apply_write_errors(details, indexes, results)
+        if removed:
+            self.counters.outfits_deleted(user_id, removed)
+
+        # the match count only tells how many updates missed, one more query tells which
+        updates = written_updates(results)
+        if details.get("nMatched", 0) < len(updates):
+            existing = {outfit["_id"] for outfit in
+                        self.collection.find({"_id": {"$in": updates}, "user_id": user_id}, {"_id": 1})}
+            mark_unmatched_updates(results, existing)
+
+        return results
+
+    def get_outfit_total(self, user_id):
+        """number of saved outfits of the user (from the counter, no count over the outfits)"""
+        return self.counters.total(user_id)
\ No newline at end of file
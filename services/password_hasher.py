@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from argon2 import PasswordHasher
+
+class HasherBusyError(RuntimeError):
+    """raised when the hash pool is full, the request should be answered with 503"""
+
+class PasswordHashPool:
+    """
+    runs Argon2 hashing and verification in a bounded thread pool
+    argon2-cffi releases the GIL while hashing, so workers run in parallel
+    at most workers + max_queue jobs are accepted, further calls fail fast
+    """
+
+    def __init__(self, time_cost=3, memory_cost=65536, parallelism=4,
+                 workers=2, max_queue=16, timeout=10):
+        self.hasher = PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism
+        )
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def hash(self, password):
+        return self._run(self.hasher.hash, password)
+
+    def verify(self, password_hash, password):
+        """raises argon2's VerifyMismatchError if the password is wrong"""
+        return self._run(self.hasher.verify, password_hash, password)
+
+    def check_needs_rehash(self, password_hash):
+        """True if the hash was made with other parameters than the configured ones"""
+        return self.hasher.check_needs_rehash(password_hash)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusyError("Server is busy, please try again in a moment")
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HasherBusyError("Server is busy, please try again in a moment")
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+def default_hasher():
+    """process wide pool with default parameters (used if no pool is passed in)"""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = PasswordHashPool()
+        return _default_pool
@@ -0,0 +1,406 @@
+import heapq
+import threading
+import numpy as np
+from dao.projections import COMPATIBILITY_FEATURES
+from services.catalog_cache import DEFAULTS_KEY
+from services.color_analysis import PALETTE_NAMES
+
+RECOMMENDATION_CATEGORIES = ["top", "bottom", "footwear"]
+PAIRS = [("top", "bottom"), ("bottom", "footwear"), ("top", "footwear")]
+
+COLOR_WEIGHT = 0.7
+STYLE_WEIGHT = 0.3
+
+NEUTRALS = ["black", "darkgray", "grey", "lightgray", "white", "beige"]
+BLUES = ["marineblue", "darkblue", "middleblue", "lightblue"]
+WARM = ["brown", "bordeaux", "red", "yellow"]
+
+# (colors, colors, score) rules applied in order, later rules win
+COLOR_RULES = [
+    (NEUTRALS, PALETTE_NAMES, 0.8),
+    (BLUES, BLUES, 0.7),
+    (BLUES, WARM, 0.7),
+    (["green"], ["brown", "beige", "white", "marineblue"], 0.75),
+    (["red"], ["bordeaux", "yellow", "green"], 0.2),
+    (["bordeaux"], ["yellow", "green"], 0.3),
+    (["black"], ["white"], 1.0),
+    (["marineblue"], ["white", "beige"], 0.95),
+    (["brown"], ["beige", "lightblue"], 0.9),
+]
+
+def color_compatibility():
+    """symmetric palette x palette score matrix (0.5 if no rule applies, same color 0.4)"""
+    index = {name: i for i, name in enumerate(PALETTE_NAMES)}
+    matrix = np.full((len(PALETTE_NAMES), len(PALETTE_NAMES)), 0.5)
+
+    for left, right, score in COLOR_RULES:
+        for a in left:
+            for b in right:
+                matrix[index[a], index[b]] = matrix[index[b], index[a]] = score
+
+    # head-to-toe in one color looks flat, except for neutrals
+    for name, i in index.items():
+        matrix[i, i] = 0.6 if name in NEUTRALS else 0.4
+    return matrix
+
+COLOR_COMPATIBILITY = color_compatibility()
+
+STYLES = ["casual", "smart", "sporty"]
+# subcategory_name -> weight per style, uploads (custom_upload) fit every style a bit
+SUBCATEGORY_STYLES = {
+    "oversized_tshirt": (1, 0, 0.3),
+    "slimfit_tshirt": (1, 0.3, 0),
+    "longsleeve": (1, 0.3, 0),
+    "sweatshirt": (0.8, 0, 0.6),
+    "hoodie": (0.6, 0, 1),
+    "shirt_blouse": (0.3, 1, 0),
+    "tanktop": (0.8, 0, 0.6),
+    "jeans": (1, 0.3, 0),
+    "jeans_skinny": (1, 0.3, 0),
+    "dress_pants": (0, 1, 0),
+    "leggings": (0.3, 0, 1),
+    "skirt": (0.6, 0.8, 0),
+    "shorts": (1, 0, 0.6),
+    "sweatpants": (0.3, 0, 1),
+    "sneakers": (1, 0, 0.8),
+    "loafer_mules": (0.5, 1, 0),
+    "heels": (0, 1, 0),
+    "boots": (0.8, 0.5, 0),
+}
+NEUTRAL_STYLE = (1, 1, 1)
+
+def color_features(item):
+    """color histogram of an item, one-hot of its color name for items without one"""
+    histogram = item.get("color_histogram")
+    if histogram and len(histogram) == len(PALETTE_NAMES):
+        return histogram
+    features = [0.0] * len(PALETTE_NAMES)
+    if item.get("color") in PALETTE_NAMES:
+        features[PALETTE_NAMES.index(item["color"])] = 1.0
+    else:
+        # unknown color, compatible on average
+        features = [1.0 / len(PALETTE_NAMES)] * len(PALETTE_NAMES)
+    return features
+
+def style_features(item):
+    """unit style vector of an item"""
+    vector = np.array(SUBCATEGORY_STYLES.get(item.get("subcategory_name"), NEUTRAL_STYLE), dtype=np.float64)
+    return vector / np.linalg.norm(vector)
+
+def pair_scores(colors_a, styles_a, colors_b, styles_b):
+    """compatibility of every a with every b, (len(a), len(b)) in 0..1"""
+    return COLOR_WEIGHT * (colors_a @ COLOR_COMPATIBILITY @ colors_b.T) + STYLE_WEIGHT * (styles_a @ styles_b.T)
+
+class CompatibilityIndex:
+    """
+    dense pairwise compatibility matrices (tops x bottoms, bottoms x footwear, tops x footwear)
+    of one wardrobe, items are added and removed incrementally (one row/column each)
+    """
+
+    def __init__(self):
+        self.ids = {category: [] for category in RECOMMENDATION_CATEGORIES}
+        self.colors = {category: np.zeros((0, len(PALETTE_NAMES))) for category in RECOMMENDATION_CATEGORIES}
+        self.styles = {category: np.zeros((0, len(STYLES))) for category in RECOMMENDATION_CATEGORIES}
+        self.scores = {pair: np.zeros((0, 0)) for pair in PAIRS}
+        self.lock = threading.Lock()
+
+    def item_ids(self):
+        return {item_id for ids in self.ids.values() for item_id in ids}
+
+    def add(self, items):
+        """adds feature documents (_id, category, subcategory_name, color, color_histogram)"""
+        for category in RECOMMENDATION_CATEGORIES:
+            new = [item for item in items if item.get("category") == category]
+            if not new:
+                continue
+
+            colors = np.array([color_features(item) for item in new], dtype=np.float64)
+            styles = np.array([style_features(item) for item in new])
+
+            # only the scores of the new items against the other categories are computed
+            for left, right in PAIRS:
+                if left == category:
+                    rows = pair_scores(colors, styles, self.colors[right], self.styles[right])
+                    self.scores[(left, right)] = np.vstack([self.scores[(left, right)], rows])
+                elif right == category:
+                    columns = pair_scores(self.colors[left], self.styles[left], colors, styles)
+                    self.scores[(left, right)] = np.hstack([self.scores[(left, right)], columns])
+
+            self.ids[category].extend(str(item["_id"]) for item in new)
+            self.colors[category] = np.vstack([self.colors[category], colors])
+            self.styles[category] = np.vstack([self.styles[category], styles])
+
+    def remove(self, item_ids):
+        """drops the rows/columns of the given item ids"""
+        for category in RECOMMENDATION_CATEGORIES:
+            positions = [i for i, item_id in enumerate(self.ids[category]) if item_id in item_ids]
+            if not positions:
+                continue
+
+            for left, right in PAIRS:
+                if left == category:
+                    self.scores[(left, right)] = np.delete(self.scores[(left, right)], positions, axis=0)
+                elif right == category:
+                    self.scores[(left, right)] = np.delete(self.scores[(left, right)], positions, axis=1)
+
+            self.colors[category] = np.delete(self.colors[category], positions, axis=0)
+            self.styles[category] = np.delete(self.styles[category], positions, axis=0)
+            removed = set(positions)
+            self.ids[category] = [item_id for i, item_id in enumerate(self.ids[category]) if i not in removed]
+
+    def copy(self):
+        """
+        copy to update while readers keep using this one
+        add and remove replace the arrays instead of changing them, so they are shared
+        """
+        index = CompatibilityIndex()
+        index.ids = {category: list(ids) for category, ids in self.ids.items()}
+        index.colors = dict(self.colors)
+        index.styles = dict(self.styles)
+        index.scores = dict(self.scores)
+        return index
+
+    def top_k(self, k, anchors=None):
+        """the k best outfits, see top_k()"""
+        return top_k(self.ids, self.scores, k, anchors)
+
+class WardrobeIndex:
+    """
+    compatibility of one user's wardrobe: the CompatibilityIndex of the default items (shared by
+    all users) plus the user's uploads, only the scores involving an upload are stored per user
+    """
+
+    def __init__(self, defaults):
+        self.defaults = defaults
+        self.uploads = CompatibilityIndex()
+        # (left, right) -> uploads of left x default items of right / default items of left x uploads of right
+        self.rows = {}
+        self.columns = {}
+        self.lock = threading.Lock()
+
+    def rebase(self, defaults):
+        """scores of the uploads against the (current) default items, call after the uploads changed"""
+        self.defaults = defaults
+        uploads = self.uploads
+        for left, right in PAIRS:
+            self.rows[(left, right)] = pair_scores(
+                uploads.colors[left], uploads.styles[left], defaults.colors[right], defaults.styles[right])
+            self.columns[(left, right)] = pair_scores(
+                defaults.colors[left], defaults.styles[left], uploads.colors[right], uploads.styles[right])
+
+    def top_k(self, k, anchors=None):
+        """the k best outfits of default items and uploads, see top_k()"""
+        if not any(self.uploads.ids.values()):
+            return self.defaults.top_k(k, anchors)
+
+        # uploads come after the default items in every category, the shared matrices are not copied
+        ids = {category: self.defaults.ids[category] + self.uploads.ids[category]
+               for category in RECOMMENDATION_CATEGORIES}
+        scores = {
+            pair: BlockScores(self.defaults.scores[pair], self.columns[pair], self.rows[pair], self.uploads.scores[pair])
+            for pair in PAIRS
+        }
+        return top_k(ids, scores, k, anchors)
+
+class BlockScores:
+    """
+    read-only view of [[defaults, columns], [rows, uploads]] as one pair score matrix,
+    rows are only assembled when top_k() asks for them
+    """
+
+    def __init__(self, defaults, columns, rows, uploads):
+        self.blocks = ((defaults, columns), (rows, uploads))
+        self.split = defaults.shape
+        self.shape = (defaults.shape[0] + rows.shape[0], defaults.shape[1] + columns.shape[1])
+
+    def __getitem__(self, indexes):
+        """the rows at indexes (array of row numbers)"""
+        indexes = np.asarray(indexes)
+        split_row, split_column = self.split
+        result = np.empty((len(indexes), self.shape[1]))
+        for (left, right), part, first in [(self.blocks[0], indexes < split_row, 0),
+                                           (self.blocks[1], indexes >= split_row, split_row)]:
+            rows = indexes[part] - first
+            result[part, :split_column] = left[rows]
+            result[part, split_column:] = right[rows]
+        return result
+
+    def take(self, rows, columns):
+        """dense submatrix of the given row and column numbers"""
+        return self[rows][:, columns]
+
+    def row_maxima(self, offset=0):
+        """maximum of every row of the matrix + offset (one value per column)"""
+        offset = np.broadcast_to(offset, (self.shape[1],))
+        maxima = []
+        for left, right in self.blocks:
+            best = np.full(left.shape[0], -np.inf)
+            for block, part in [(left, offset[:self.split[1]]), (right, offset[self.split[1]:])]:
+                if block.shape[1]:
+                    best = np.maximum(best, (block + part).max(axis=1))
+            maxima.append(best)
+        return np.concatenate(maxima)
+
+def row_maxima(matrix, offset=0):
+    """maximum of every row of matrix + offset, for arrays and BlockScores"""
+    if isinstance(matrix, BlockScores):
+        return matrix.row_maxima(offset)
+    return (matrix + offset).max(axis=1)
+
+def submatrix(matrix, rows, columns):
+    """the rows x columns (index arrays) of a pair score matrix, the matrix itself if all are kept"""
+    if rows is None and columns is None:
+        return matrix
+    rows = np.arange(matrix.shape[0]) if rows is None else rows
+    columns = np.arange(matrix.shape[1]) if columns is None else columns
+    if isinstance(matrix, BlockScores):
+        return matrix.take(rows, columns)
+    return matrix[np.ix_(rows, columns)]
+
+def top_k(ids, scores, k, anchors=None):
+    """
+    the k best (score, top_id, bottom_id, footwear_id) of the pair score matrices, score = mean of the three pair scores
+    ids: {category: [item_id]} of the rows/columns, scores: {(left, right): matrix or BlockScores}
+    anchors: optional {category: item_id} the outfits must contain
+    visits the tops from the best upper bound (best bottom + its best footwear + best footwear of the top)
+    and scores the bottoms that can still beat the k-th best outfit against all footwear at once,
+    a min-heap keeps the k best, the search stops when no top can beat it anymore
+    """
+    anchors = anchors or {}
+    candidates = {}
+    for category in RECOMMENDATION_CATEGORIES:
+        if not ids[category]:
+            return []
+        if category in anchors:
+            if anchors[category] not in ids[category]:
+                return []
+            candidates[category] = np.array([ids[category].index(anchors[category])])
+        else:
+            # all items, the matrices are used as they are
+            candidates[category] = None
+
+    tops, bottoms, footwear = (candidates[category] for category in RECOMMENDATION_CATEGORIES)
+    top_bottom = submatrix(scores[("top", "bottom")], tops, bottoms)
+    bottom_footwear = submatrix(scores[("bottom", "footwear")], bottoms, footwear)
+    top_footwear = submatrix(scores[("top", "footwear")], tops, footwear)
+
+    # best footwear per bottom, best bottom (with its best footwear) + best footwear per top
+    bottom_bounds = row_maxima(bottom_footwear)
+    top_footwear_best = row_maxima(top_footwear)
+    bounds = row_maxima(top_bottom, bottom_bounds) + top_footwear_best
+    heap = []
+
+    for t in np.argsort(-bounds):
+        threshold = heap[0][0] if len(heap) == k else -np.inf
+        if bounds[t] <= threshold:
+            break
+
+        top_bottom_row = top_bottom[[t]][0]
+        top_footwear_row = top_footwear[[t]][0]
+        # bottoms whose best outfit with this top can still get into the heap
+        selected = np.flatnonzero(top_bottom_row + bottom_bounds + top_footwear_best[t] > threshold)
+
+        outfits = top_bottom_row[selected][:, None] + bottom_footwear[selected] + top_footwear_row[None, :]
+        flat = outfits.ravel()
+        best = np.argpartition(-flat, k - 1)[:k] if flat.size > k else np.arange(flat.size)
+
+        for position in best:
+            b, f = divmod(int(position), outfits.shape[1])
+            entry = (float(flat[position]), int(t), int(selected[b]), f)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+    def item_id(category, position):
+        chosen = candidates[category]
+        return ids[category][position if chosen is None else chosen[position]]
+
+    return [
+        (score / 3, item_id("top", t), item_id("bottom", b), item_id("footwear", f))
+        for score, t, b, f in sorted(heap, reverse=True)
+    ]
+
+class RecommendationService:
+    def __init__(self, clothing_service, index_cache=None):
+        self.clothing_service = clothing_service
+        self.index_cache = index_cache
+
+    def _sync(self, index, catalog):
+        """brings the index in line with the catalog, only changed items are (re)scored"""
+        catalog_ids = {item["_id"] for items in catalog.values() for item in items}
+        indexed = index.item_ids()
+
+        removed = indexed - catalog_ids
+        if removed:
+            index.remove(removed)
+
+        added = catalog_ids - indexed
+        if added:
+            index.add(self.clothing_service.get_items(added, COMPATIBILITY_FEATURES))
+
+    def get_defaults(self, versions):
+        """
+        the CompatibilityIndex of the default items shared by all users, updated incrementally
+        (on a copy, requests may still use the old one) when their version changes
+        """
+        entry = self.index_cache.get_entry(DEFAULTS_KEY)
+        if entry and entry[0] == versions[0]:
+            return entry[1]
+
+        index = entry[1].copy() if entry else CompatibilityIndex()
+        self._sync(index, self.clothing_service.get_catalog(None, versions))
+        self.index_cache.put(DEFAULTS_KEY, versions[0], index)
+        return index
+
+    def get_index(self, user_id, versions=None):
+        """
+        the user's WardrobeIndex, updated incrementally when the catalog versions
+        (dao/catalog_version_dao.py, so changes of other processes count too) changed
+        """
+        if not self.index_cache:
+            index = CompatibilityIndex()
+            self._sync(index, self.clothing_service.get_catalog(user_id))
+            return index
+
+        versions = versions or self.clothing_service.get_catalog_versions(user_id)
+        entry = self.index_cache.get_entry(user_id)
+        if entry and entry[0] == versions:
+            return entry[1]
+
+        defaults = self.get_defaults(versions)
+        index = entry[1] if entry else WardrobeIndex(defaults)
+
+        with index.lock:
+            default_ids = defaults.item_ids()
+            uploads = {
+                category: [item for item in items if item["_id"] not in default_ids]
+                for category, items in self.clothing_service.get_catalog(user_id, versions).items()
+            }
+            self._sync(index.uploads, uploads)
+            index.rebase(defaults)
+        self.index_cache.put(user_id, versions, index)
+        return index
+
+    def recommend(self, user_id, k=10, anchors=None):
+        """
+        the k most compatible outfits
+        returns [{"score": 0..1, "top": item, "bottom": item, "footwear": item}, ...]
+        """
+        versions = self.clothing_service.get_catalog_versions(user_id)
+        index = self.get_index(user_id, versions)
+        with index.lock:
+            best = index.top_k(k, anchors)
+
+        catalog = self.clothing_service.get_catalog(user_id, versions)
+        items = {item["_id"]: item for entries in catalog.values() for item in entries}
+
+        return [
+            {
+                "score": round(score, 4),
+                "top": items.get(top_id),
+                "bottom": items.get(bottom_id),
+                "footwear": items.get(footwear_id)
+            }
+            for score, top_id, bottom_id, footwear_id in best
+        ]
@@ -0,0 +1,219 @@
+import json
+import os
+import threading
+import numpy as np
+from dao.projections import SIMILARITY_FEATURES
+from services.catalog_cache import DEFAULTS_KEY
+from services.embeddings import EMBEDDING_SIZE
+
+SIMILARITY_CATEGORIES = ["top", "bottom", "footwear"]
+# candidates fetched per requested result, more are fetched if too many are hidden or deleted
+CANDIDATE_FACTOR = 4
+
+class SimilarityIndex:
+    """
+    embeddings of the clothing catalog in one float32 array (one row per item, unit length)
+    the array built by scripts/build_similarity_index.py is memory-mapped from disk (embeddings.npy,
+    categories.npy, ids.json), items added later (uploads) are appended to an in-memory array
+    a query is one matrix-vector product over all rows, deleted items are filtered by the caller
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.ids = []
+        self.positions = {}
+        self.vectors = np.zeros((0, EMBEDDING_SIZE), dtype=np.float32)
+        self.categories = np.zeros(0, dtype=np.uint8)
+        self.added = np.zeros((0, EMBEDDING_SIZE), dtype=np.float32)
+        self.added_categories = np.zeros(0, dtype=np.uint8)
+        # item id -> catalog version at which it had no embedding (legacy items before
+        # scripts/build_similarity_index.py --backfill), tried again at another version
+        self.missing = {}
+        self.lock = threading.Lock()
+
+        if directory and os.path.exists(os.path.join(directory, "ids.json")):
+            self.load()
+
+    def load(self):
+        vectors = np.load(os.path.join(self.directory, "embeddings.npy"), mmap_mode="r")
+        if vectors.shape[1] != EMBEDDING_SIZE:
+            # built with a different embedding, rebuild with scripts/build_similarity_index.py
+            return
+
+        with open(os.path.join(self.directory, "ids.json")) as f:
+            self.ids = json.load(f)
+        self.positions = {item_id: i for i, item_id in enumerate(self.ids)}
+        self.vectors = vectors
+        self.categories = np.load(os.path.join(self.directory, "categories.npy"), mmap_mode="r")
+
+    def save(self, directory=None):
+        """writes all rows (mapped and added) as the new on-disk index"""
+        directory = directory or self.directory
+        os.makedirs(directory, exist_ok=True)
+
+        # write + rename, a running app keeps its mapping of the previous files
+        for name, array in [("embeddings.npy", np.concatenate([self.vectors, self.added])),
+                            ("categories.npy", np.concatenate([self.categories, self.added_categories]))]:
+            partial = os.path.join(directory, f"{name}.part")
+            with open(partial, "wb") as f:
+                np.save(f, array)
+            os.replace(partial, os.path.join(directory, name))
+
+        partial = os.path.join(directory, "ids.json.part")
+        with open(partial, "w") as f:
+            json.dump(self.ids, f)
+        os.replace(partial, os.path.join(directory, "ids.json"))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def unknown(self, item_ids, version=None):
+        """the item ids that were never added, or had no embedding at another catalog version"""
+        return [
+            item_id for item_id in item_ids
+            if item_id not in self.positions and (item_id not in self.missing or self.missing[item_id] != version)
+        ]
+
+    def add(self, items, version=None):
+        """
+        adds documents with _id, category and embedding
+        items without embedding are remembered as missing at the given catalog version
+        """
+        rows, categories = [], []
+        with self.lock:
+            for item in items:
+                item_id = str(item["_id"])
+                embedding = item.get("embedding")
+                if item_id in self.positions:
+                    continue
+                if not embedding or len(embedding) != EMBEDDING_SIZE or item.get("category") not in SIMILARITY_CATEGORIES:
+                    self.missing[item_id] = version
+                    continue
+
+                self.positions[item_id] = len(self.ids)
+                self.ids.append(item_id)
+                rows.append(embedding)
+                categories.append(SIMILARITY_CATEGORIES.index(item["category"]))
+
+            if rows:
+                self.added = np.vstack([self.added, np.asarray(rows, dtype=np.float32)])
+                self.added_categories = np.concatenate([self.added_categories, np.asarray(categories, dtype=np.uint8)])
+
+    def _row(self, position):
+        if position < len(self.vectors):
+            return self.vectors[position], self.categories[position]
+        return self.added[position - len(self.vectors)], self.added_categories[position - len(self.vectors)]
+
+    def search(self, item_id, k, visible=None):
+        """
+        the k most similar items of the same category as [(similarity, item_id)], best first
+        visible: optional set/dict of item ids allowed in the result (deleted and other users' items are not)
+        returns None if item_id has no embedding
+        """
+        position = self.positions.get(item_id)
+        if position is None:
+            return None
+
+        # the arrays only grow, a snapshot stays consistent while uploads are added
+        with self.lock:
+            vectors, categories = self.vectors, self.categories
+            added, added_categories = self.added, self.added_categories
+            ids = self.ids
+
+        query, category = self._row(position)
+        scores = np.concatenate([vectors @ query, added @ query])
+        scores[np.concatenate([categories, added_categories]) != category] = -np.inf
+        scores[position] = -np.inf
+
+        wanted = k * CANDIDATE_FACTOR
+        while True:
+            count = min(wanted, len(scores))
+            candidates = np.argpartition(-scores, count - 1)[:count] if count < len(scores) else np.arange(len(scores))
+            candidates = candidates[np.argsort(-scores[candidates])]
+
+            results = [
+                (float(scores[i]), ids[i]) for i in candidates
+                if scores[i] > -np.inf and (visible is None or ids[i] in visible)
+            ]
+            if len(results) >= k or count == len(scores):
+                return results[:k]
+            wanted *= CANDIDATE_FACTOR
+
+class CatalogView:
+    """the items a user can see by id: the default items (shared by all users) and their uploads"""
+
+    def __init__(self, defaults, uploads):
+        self.defaults = defaults
+        self.uploads = uploads
+
+    def __contains__(self, item_id):
+        return item_id in self.uploads or item_id in self.defaults
+
+    def get(self, item_id):
+        return self.uploads.get(item_id) or self.defaults.get(item_id)
+
+class SimilarityService:
+    def __init__(self, clothing_service, index, view_cache=None):
+        self.clothing_service = clothing_service
+        self.index = index
+        self.view_cache = view_cache
+
+    def _sync(self, items, version):
+        """adds catalog items the index doesn't know yet (uploads), with one query"""
+        unknown = self.index.unknown(items, version)
+        if unknown:
+            self.index.add(self.clothing_service.get_items(unknown, SIMILARITY_FEATURES), version)
+
+    def _defaults(self, versions):
+        """the default items by id, shared by all views of the same version"""
+        if self.view_cache:
+            defaults = self.view_cache.get(DEFAULTS_KEY, versions[0])
+            if defaults is not None:
+                return defaults
+
+        catalog = self.clothing_service.get_catalog(None, versions)
+        defaults = {item["_id"]: item for items in catalog.values() for item in items}
+        self._sync(defaults, versions[0])
+        if self.view_cache:
+            self.view_cache.put(DEFAULTS_KEY, versions[0], defaults)
+        return defaults
+
+    def get_view(self, user_id):
+        """
+        the CatalogView of the user, rebuilt (and synced with the index) only when the catalog
+        versions (dao/catalog_version_dao.py) changed, a request otherwise costs one version lookup
+        """
+        versions = self.clothing_service.get_catalog_versions(user_id)
+        if self.view_cache:
+            view = self.view_cache.get(user_id, versions)
+            if view is not None:
+                return view
+
+        defaults = self._defaults(versions)
+        catalog = self.clothing_service.get_catalog(user_id, versions)
+        uploads = {
+            item["_id"]: item for items in catalog.values() for item in items
+            if item["_id"] not in defaults
+        }
+        self._sync(uploads, versions)
+
+        view = CatalogView(defaults, uploads)
+        if self.view_cache:
+            self.view_cache.put(user_id, versions, view)
+        return view
+
+    def similar(self, user_id, item_id, k=12):
+        """
+        the k items of the user's catalog that look most like item_id (same category)
+        returns [{"similarity": -1..1, "item": item}, ...], None if the item is not in the catalog
+        """
+        view = self.get_view(user_id)
+        if item_id not in view:
+            return None
+
+        results = self.index.search(item_id, k, visible=view) or []
+
+        return [
+            {"similarity": round(similarity, 4), "item": view.get(similar_id)}
+            for similarity, similar_id in results
+        ]
@@ -0,0 +1,222 @@
+import hashlib
+import mimetypes
+import os
+import threading
+import uuid
+from config import _setting
+
+# fingerprinted image URLs never change their content, browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# length of the content hash in the URL (the full sha256 is the ETag)
+FINGERPRINT_LENGTH = 16
+
+def fingerprint(digest):
+    return digest[:FINGERPRINT_LENGTH]
+
+def file_digest(data):
+    """sha256 of stored bytes, saved as image_digest / thumbnails.digest"""
+    return hashlib.sha256(data).hexdigest()
+
+class LocalStorage:
+    """
+    stores files below the app folder, keys are paths like static/images/uploads/<sha256>.jpg
+    fingerprinted URLs (/img/<hash>/<key>) are served by controllers/image_controller.py,
+    URLs without a known digest fall back to Flask's static folder
+    """
+
+    def __init__(self, root_path, base_url="/"):
+        self.root_path = os.path.abspath(root_path)
+        self.base_url = base_url
+        # key -> (mtime_ns, size, sha256), hashed once per file version
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        path = os.path.abspath(os.path.join(self.root_path, key))
+        if not path.startswith(self.root_path + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def local_path(self, key):
+        """absolute file path of a key (raises ValueError for keys outside the storage folder)"""
+        return self._path(key)
+
+    def digest(self, key):
+        """sha256 of the file, None if it doesn't exist"""
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            cached = self._digests.get(key)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        with open(path, "rb") as f:
+            digest = file_digest(f.read())
+
+        with self._lock:
+            self._digests[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def put(self, key, data, content_type=None):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # write + rename, so a concurrent reader never sees half a file
+        partial = f"{path}.{uuid.uuid4().hex}.part"
+        with open(partial, "wb") as out:
+            out.write(data)
+        os.replace(partial, path)
+
+    def get(self, key):
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def exists(self, key):
+        return os.path.isfile(self._path(key))
+
+    def size(self, key):
+        """size in bytes, None if the file doesn't exist"""
+        path = self._path(key)
+        return os.path.getsize(path) if os.path.isfile(path) else None
+
+    def delete(self, key):
+        path = self._path(key)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def list(self, prefix):
+        """yields (key, size, modified timestamp) of the files directly below the prefix folder"""
+        directory = self._path(prefix.rstrip("/"))
+        if not os.path.isdir(directory):
+            return
+        for entry in os.scandir(directory):
+            if entry.is_file():
+                stat = entry.stat()
+                yield f"{prefix.rstrip('/')}/{entry.name}", stat.st_size, stat.st_mtime
+
+    def url(self, key, digest=None):
+        """public URL, fingerprinted (and cached forever) if the content hash is known"""
+        if digest:
+            return f"{self.base_url}img/{fingerprint(digest)}/{key}"
+        return self.base_url + key
+
+class S3Storage:
+    """
+    stores files in an S3 bucket (AWS or any S3-compatible server like MinIO), keys are the same
+    as with LocalStorage, images are served by the bucket or a CDN in front of it (public_url)
+    needs boto3 (pip install boto3)
+    """
+
+    def __init__(self, bucket, prefix="", endpoint_url=None, region=None,
+                 access_key_id=None, secret_access_key=None, public_url=None):
+        try:
+            import boto3
+            from botocore.config import Config as BotoConfig
+        except ImportError:
+            raise RuntimeError("STORAGE_BACKEND=s3 needs boto3: pip install boto3")
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            # S3-compatible servers usually don't have per-bucket hostnames
+            config=BotoConfig(s3={"addressing_style": "path"}) if endpoint_url else None
+        )
+
+        if public_url:
+            self.base_url = public_url.rstrip("/") + "/" + prefix
+        elif endpoint_url:
+            self.base_url = f"{endpoint_url.rstrip('/')}/{bucket}/{prefix}"
+        else:
+            self.base_url = f"https://{bucket}.s3.{region or 'us-east-1'}.amazonaws.com/{prefix}"
+
+    def _is_missing(self, error):
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def put(self, key, data, content_type=None):
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self.prefix + key,
+            Body=data,
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
+            ContentType=content_type or mimetypes.guess_type(key)[0] or "application/octet-stream"
+        )
+
+    def get(self, key):
+        return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"].read()
+
+    def exists(self, key):
+        return self.size(key) is not None
+
+    def size(self, key):
+        """size in bytes, None if the object doesn't exist"""
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)["ContentLength"]
+        except ClientError as e:
+            if self._is_missing(e):
+                return None
+            raise
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+
+    def list(self, prefix):
+        """yields (key, size, modified timestamp) of the objects directly below the prefix folder"""
+        folder = self.prefix + prefix.rstrip("/") + "/"
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=folder, Delimiter="/"):
+            for obj in page.get("Contents", []):
+                yield obj["Key"][len(self.prefix):], obj["Size"], obj["LastModified"].timestamp()
+
+    def url(self, key, digest=None):
+        """public URL, the fingerprint makes a changed object a new URL for browsers and CDNs"""
+        if digest:
+            return f"{self.base_url}{key}?v={fingerprint(digest)}"
+        return self.base_url + key
+
+def image_url(storage, item):
+    """URL of a clothing item's image"""
+    return storage.url(item["image_path"], item.get("image_digest")) if item.get("image_path") else None
+
+def with_image_urls(storage, item):
+    """copy of a clothing item with image_url and a url per thumbnail, for JSON and the templates' JS"""
+    if not item:
+        return item
+    item = dict(item)
+    item["image_url"] = image_url(storage, item)
+    item["thumbnails"] = [
+        {**thumbnail, "url": storage.url(thumbnail["path"], thumbnail.get("digest"))}
+        for thumbnail in item.get("thumbnails") or []
+    ]
+    return item
+
+def create_storage(config, root_path):
+    """
+    storage backend selected by STORAGE_BACKEND ("local" or "s3")
+    config: Flask app.config or the Config class
+    """
+    backend = _setting(config, "STORAGE_BACKEND")
+
+    if backend == "local":
+        return LocalStorage(root_path)
+    if backend == "s3":
+        return S3Storage(
+            _setting(config, "S3_BUCKET"),
+            prefix=_setting(config, "S3_PREFIX"),
+            endpoint_url=_setting(config, "S3_ENDPOINT_URL"),
+            region=_setting(config, "S3_REGION"),
+            access_key_id=_setting(config, "S3_ACCESS_KEY_ID"),
+            secret_access_key=_setting(config, "S3_SECRET_ACCESS_KEY"),
+            public_url=_setting(config, "S3_PUBLIC_URL")
+        )
+
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,194 @@
+import hashlib
+import io
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from bson import ObjectId
+from PIL import Image, ImageOps
+from dao.blob_dao import BlobDAO
+from dao.catalog_version_dao import CatalogVersionDAO
+from services.color_analysis import analyze_colors
+from services.embeddings import image_embedding
+from services.image_derivatives import generate_derivatives
+from services.storage import file_digest
+
+class UploadTooLargeError(ValueError):
+    """raised while streaming an upload that exceeds the size limit (answered with 413)"""
+
+INTERRUPTED_ERROR = "Processing was interrupted, please upload the image again"
+
+class UploadPipeline:
+    """
+    receives uploads in chunks into a temp folder and processes them in background workers:
+    decode + validate with Pillow, fix EXIF rotation, downscale, write to the storage backend
+    (services/storage.py), generate the responsive thumbnails, detect the color
+    the clothing document is "pending" until its worker marks it "ready" (or "failed")
+
+    files are content-addressed (key static/images/uploads/<sha256>.<ext>) and reference counted
+    in the blobs collection, the same image uploaded again is stored only once
+
+    the queue lives in the process, jobs of a crashed or redeployed worker are lost,
+    sweep() (run by scripts/gc_uploads.py) fails their items and removes their temp files
+    """
+
+    def __init__(self, db, storage, cache=None, tmp_dir=None, max_bytes=10 * 1024 * 1024,
+                 chunk_size=64 * 1024, max_dimension=1600, workers=2):
+        self.collection = db.clothing
+        self.blobs = BlobDAO(db)
+        self.versions = CatalogVersionDAO(db)
+        self.storage = storage
+        self.cache = cache
+        self.tmp_dir = tmp_dir or os.path.join(tempfile.gettempdir(), "mismatch-uploads")
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.max_dimension = max_dimension
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload")
+
+    def receive(self, file):
+        """streams the uploaded file to a temp file, returns (path, sha256 of the bytes)"""
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(self.tmp_dir, uuid.uuid4().hex)
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as out:
+                while True:
+                    chunk = file.stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLargeError(f"Image is larger than {self.max_bytes / (1024 * 1024):.1f} MB")
+                    digest.update(chunk)
+                    out.write(chunk)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        return tmp_path, digest.hexdigest()
+
+    def submit(self, item_id, user_id, tmp_path, source_digest):
+        """queues the processing of a received upload"""
+        self._executor.submit(self.process, item_id, user_id, tmp_path, source_digest)
+
+    def sweep(self, max_age):
+        """
+        fails uploads still pending after max_age seconds and removes temp files that old,
+        a job that is still queued somewhere finds its item failed and leaves it alone
+        returns (failed items, removed temp files)
+        """
+        now = datetime.utcnow()
+        result = self.collection.update_many(
+            {"status": "pending", "created_at": {"$lt": now - timedelta(seconds=max_age)}},
+            {"$set": {"status": "failed", "error": INTERRUPTED_ERROR, "processed_at": now}}
+        )
+
+        removed = 0
+        cutoff = time.time() - max_age
+        if os.path.isdir(self.tmp_dir):
+            for name in os.listdir(self.tmp_dir):
+                path = os.path.join(self.tmp_dir, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    # processed and removed in the meantime
+                    continue
+
+        return result.modified_count, removed
+
+    def process(self, item_id, user_id, tmp_path, source_digest):
+        blob = None
+        try:
+            blob = self._store(tmp_path, source_digest)
+            update = {
+                "status": "ready",
+                "image_path": blob["path"],
+                "image_digest": blob["_id"],
+                "thumbnails": blob["thumbnails"],
+                "color": blob.get("color", "custom"),
+                "color_histogram": blob.get("color_histogram", []),
+                "embedding": blob.get("embedding", []),
+                "blob": blob["_id"]
+            }
+        except Exception as e:
+            update = {"status": "failed", "error": f"Invalid image: {e}"}
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        update["processed_at"] = datetime.utcnow()
+        result = self.collection.update_one({"_id": ObjectId(item_id), "status": "pending"}, {"$set": update})
+
+        # the item was deleted or failed by sweep() while it was processed
+        if result.matched_count == 0:
+            if blob:
+                self.blobs.release(blob["_id"])
+            return
+
+        self.versions.bump(user_id)
+        if self.cache:
+            self.cache.invalidate(user_id)
+
+    def _store(self, tmp_path, source_digest):
+        """normalizes the upload and takes a reference on its blob, returns the blob"""
+        data, extension = self._normalize(tmp_path)
+        digest = file_digest(data)
+        image_path = f"static/images/uploads/{digest}.{extension}"
+
+        # a different upload can normalize to the same bytes, its file and thumbnails are reused
+        known = self.blobs.get(digest)
+        if known and self.storage.exists(image_path):
+            blob = self.blobs.acquire(digest, source_digest)
+            if "path" in blob:
+                return blob
+            # the garbage collection deleted the blob (and its files) before the reference was
+            # taken, acquire() inserted it again without attributes, store the files once more
+            return self.blobs.fill(digest, self._put(image_path, data, extension))
+
+        return self.blobs.acquire(digest, source_digest, self._put(image_path, data, extension))
+
+    def _put(self, image_path, data, extension):
+        """stores the file and its thumbnails, returns the attributes of its blob"""
+        self.storage.put(image_path, data, "image/png" if extension == "png" else "image/jpeg")
+
+        with Image.open(io.BytesIO(data)) as image:
+            color, color_histogram = analyze_colors(image)
+            embedding = image_embedding(image, color_histogram)
+
+        return {
+            "path": image_path,
+            "size": len(data),
+            "thumbnails": generate_derivatives(self.storage, image_path),
+            "color": color,
+            "color_histogram": color_histogram,
+            "embedding": embedding
+        }
+
+    def _normalize(self, tmp_path):
+        """decodes, validates and re-encodes the image, returns (bytes, extension)"""
+        # verify() checks the file structure, the image has to be reopened afterwards
+        with Image.open(tmp_path) as image:
+            image.verify()
+
+        with Image.open(tmp_path) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((self.max_dimension, self.max_dimension))
+
+            # keep transparency as PNG, everything else becomes JPEG
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                extension, options = "png", {"optimize": True}
+            else:
+                image = image.convert("RGB")
+                extension, options = "jpg", {"quality": 85, "optimize": True}
+
+            out = io.BytesIO()
+            image.save(out, format="PNG" if extension == "png" else "JPEG", **options)
+
+        return out.getvalue(), extension
@@ -0,0 +1,94 @@
+import os
+from datetime import datetime
+from bson import ObjectId
+from dao.blob_dao import BlobDAO
+from dao.catalog_version_dao import CatalogVersionDAO
+
+class UploadService:
+    def __init__(self, db, pipeline, cache=None):
+        self.collection = db.clothing
+        self.blobs = BlobDAO(db)
+        self.versions = CatalogVersionDAO(db)
+        self.pipeline = pipeline
+        self.cache = cache
+
+    def save_upload(self, user_id, category, file):
+        """
+        streams the upload to a temp file and queues its processing
+        an image that was uploaded before reuses the stored file and is ready at once
+        returns (item_id, status) of the clothing document, status is "pending" or "ready"
+        raises UploadTooLargeError if the file exceeds the size limit
+        """
+        tmp_path, source_digest = self.pipeline.receive(file)
+        blob = self.blobs.acquire_source(source_digest)
+
+        document = {
+            "category": category,
+            "subcategory": "custom",
+            "subcategory_name": "custom_upload",
+            "color": "custom",
+            "neckline": None,
+            "length": None,
+            "image_path": None,
+            "status": "pending",
+            "is_default": False,
+            "user_id": user_id,
+            "created_at": datetime.utcnow()
+        }
+
+        if blob:
+            os.remove(tmp_path)
+            document.update({
+                "image_path": blob["path"],
+                "image_digest": blob["_id"],
+                "thumbnails": blob["thumbnails"],
+                "color": blob.get("color", "custom"),
+                "color_histogram": blob.get("color_histogram", []),
+                "embedding": blob.get("embedding", []),
+                "blob": blob["_id"],
+                "status": "ready",
+                "processed_at": document["created_at"]
+            })
+
+        result = self.collection.insert_one(document)
+        item_id = str(result.inserted_id)
+
+        if blob:
+            self.versions.bump(user_id)
+            if self.cache:
+                self.cache.invalidate(user_id)
+            return item_id, "ready"
+
+        # the item shows up in the catalog once the worker marked it ready
+        self.pipeline.submit(item_id, user_id, tmp_path, source_digest)
+
+        return item_id, "pending"
+
+    def get_status(self, user_id, item_id):
+        """processing state of an own upload or None"""
+        return self.collection.find_one(
+            {"_id": ObjectId(item_id), "user_id": user_id},
+            {"status": 1, "image_path": 1, "error": 1}
+        )
+
+    def delete_upload(self, user_id, item_id):
+        """
+        deletes an upload of the user, False if it doesn't exist or isn't theirs
+        the file itself is removed by scripts/gc_uploads.py once no item uses it
+        """
+        # Nur eigene Uploads löschen (mit user_id)
+        deleted = self.collection.find_one_and_delete(
+            {"_id": ObjectId(item_id), "user_id": user_id},
+            projection={"blob": 1}
+        )
+
+        if not deleted:
+            return False
+
+        if deleted.get("blob"):
+            self.blobs.release(deleted["blob"])
+        self.versions.bump(user_id)
+        if self.cache:
+            self.cache.invalidate(user_id)
+
+        return True
@@ -1,52 +1,59 @@
-from argon2 import PasswordHasher
 from dao.user_dao import UserDAO
+from dao.projections import AUTH_CHECK, ID_ONLY, USER_SESSION
 from argon2.exceptions import VerifyMismatchError
-
-ph = PasswordHasher()
+from services.password_hasher import HasherBusyError, default_hasher
 
 class UserService:
-    def __init__(self, db):
+    def __init__(self, db, hasher=None):
         self.user_dao = UserDAO(db)
+        self.hasher = hasher or default_hasher()
 
     def register_user(self, username, password):
 
-        if self.user_dao.get_by_username(username):
+        if self.user_dao.get_by_username(username, ID_ONLY):
             raise ValueError("Username already exists")
 
-        password_hash = ph.hash(password)
+        password_hash = self.hasher.hash(password)
         self.user_dao.create_user(username, password_hash)
 
-        return self.user_dao.get_by_username(username)
+        return self.user_dao.get_by_username(username, USER_SESSION)
 
     def authenticate_user(self, username, password):
-        user = self.user_dao.get_by_username(username)
+        user = self.user_dao.get_by_username(username, AUTH_CHECK)
 
         if not user:
             raise ValueError("Invalid username or password")
         
         try:
-            ph.verify(user["password_hash"], password)
+            self.hasher.verify(user["password_hash"], password)
         except VerifyMismatchError:
             raise ValueError("Invalid username or password")
 
+        # upgrade hashes made with older Argon2 parameters
+        if self.hasher.check_needs_rehash(user["password_hash"]):
+            try:
+                self.user_dao.update_password(user["_id"], self.hasher.hash(password))
+            except HasherBusyError:
+                pass  # login still succeeds, the next one will rehash
+
         return user
     
     def change_username(self, user_id, new_username):
-        if self.user_dao.get_by_username(new_username):
+        if self.user_dao.get_by_username(new_username, ID_ONLY):
             raise ValueError("username already exists")
         
         self.user_dao.update_username(user_id, new_username)
         
     def change_password(self, user_id, old_password, new_password):
-        user = self.user_dao.get_by_id(user_id)
+        user = self.user_dao.get_by_id(user_id, AUTH_CHECK)
         
         try:
-            ph.verify(user["password_hash"], old_password)
+            self.hasher.verify(user["password_hash"], old_password)
         except VerifyMismatchError:
             raise ValueError("Old Password is incorrect")
         
-        new_hash = ph.hash(new_password)
+        new_hash = self.hasher.hash(new_password)
         self.user_dao.update_password(user_id, new_hash)
         
     def change_avatar(self, user_id, avatar):
-        self.user_dao.update_avatar(user_id, avatar)
\ No newline at end of file
+        self.user_dao.update_avatar(user_id, avatar)
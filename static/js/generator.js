@@ -8,19 +8,75 @@ function shuffleArray(array) {
   return shuffled;
 }
 
-// randomize clothing data - randomize when loaded (only one time)
-const shuffledClothing = {
-  tops: shuffleArray(clothingData.tops),
-  bottoms: shuffleArray(clothingData.bottoms),
-  footwear: shuffleArray(clothingData.footwear)
-};
+// clothing catalog from /api/catalog, filled by loadCatalog()
+const clothingData = { tops: [], bottoms: [], footwear: [] };
+const shuffledClothing = { tops: [], bottoms: [], footwear: [] };
+const activeClothing = { tops: [], bottoms: [], footwear: [] };
+
+// the catalog is kept in localStorage and only fetched again when catalogVersion (from the page) changed
+const CATALOG_STORAGE_KEY = 'mismatch-catalog';
+
+function readStoredCatalog() {
+  try {
+    return JSON.parse(localStorage.getItem(CATALOG_STORAGE_KEY));
+  } catch (error) {
+    return null;
+  }
+}
+
+function storeCatalog(catalog) {
+  try {
+    localStorage.setItem(CATALOG_STORAGE_KEY, JSON.stringify(catalog));
+  } catch (error) {
+    // storage full or disabled, the catalog is fetched again next time
+  }
+}
+
+function fetchCatalog(stored) {
+  // the ETag is the version, a 304 means the stored items are still current
+  const headers = stored ? { 'If-None-Match': `"${stored.version}"` } : {};
 
-const activeClothing = {
-  tops: [...shuffledClothing.tops],
-  bottoms: [...shuffledClothing.bottoms],
-  footwear: [...shuffledClothing.footwear],
+  return fetch('/api/catalog', { headers: headers, cache: 'no-cache' })
+      .then(response => {
+        if (response.status === 304) {
+          return stored;
+        }
+        if (!response.ok) {
+          throw new Error('HTTP ' + response.status);
+        }
+        return response.json();
+      })
+      .then(catalog => {
+        storeCatalog(catalog);
+        return catalog;
+      });
+}
+
+function loadCatalog() {
+  const stored = readStoredCatalog();
+  const catalog = stored && stored.version === catalogVersion ? Promise.resolve(stored) : fetchCatalog(stored);
+
+  return catalog.then(data => {
+    // randomize clothing data - randomize when loaded (only one time)
+    Object.keys(clothingData).forEach(category => {
+      clothingData[category] = data[category] || [];
+      shuffledClothing[category] = shuffleArray(clothingData[category]);
+      activeClothing[category] = [...shuffledClothing[category]];
+    });
+
+    // Debugging
+    console.log('Original Daten:', clothingData);
+    console.log('Geshuffelte Daten:', shuffledClothing);
+    console.log('Tops:', shuffledClothing.tops.length);
+    console.log('Bottoms:', shuffledClothing.bottoms.length);
+    console.log('Footwear:', shuffledClothing.footwear.length);
+  });
 }
 
+loadCatalog().catch(error => {
+  alert('Error loading clothing: ' + error);
+});
+
 // current index for each category
 let currentIndex = {
   tops: -1,      // -1 = no item yet (box shows "?") 
@@ -80,37 +136,45 @@ function displayClothing(category, forcedItem = null) {
 
   box.innerHTML = `
     ${isCustom ? `<button class="delete-btn" onclick="deleteClothingItem('${item._id}', '${category}')">🗑️</button>` : ''}
-    <img src="/${item.image_path}" class="clothing-image">
+    <button class="similar-btn" title="Show similar items" onclick="showSimilar('${category}', '${item._id}')">≈</button>
+    <img src="${item.image_url}" srcset="${thumbnailSrcset(item)}" sizes="280px" class="clothing-image">
   `;
 }
 
-// Debugging
-console.log('Original Daten:', clothingData);
-console.log('Geshuffelte Daten:', shuffledClothing);
-console.log('Tops:', shuffledClothing.tops.length);
-console.log('Bottoms:', shuffledClothing.bottoms.length);
-console.log('Footwear:', shuffledClothing.footwear.length);
-
-// MisMatch Button 
-function generateMismatchOutfit() {
-  const categories = ['tops', 'bottoms', 'footwear'];
+// WebP thumbnails of an item as srcset ("" falls back to src)
+function thumbnailSrcset(item) {
+  return (item.thumbnails || [])
+    .filter(t => t.format === 'webp')
+    .map(t => `${t.url} ${t.width}w`)
+    .join(', ');
+}
 
-  categories.forEach(category => {
-    const items = shuffledClothing[category];
+// MisMatch Button - the outfit is drawn on the server (/api/generate-outfit)
+const apiCategories = { tops: 'top', bottoms: 'bottom', footwear: 'footwear' };
 
-    if (!items || items.length === 0) return;
+function generateMismatchOutfit() {
+  fetch('/api/generate-outfit')
+      .then(response => response.json())
+      .then(data => {
+        const outfit = data.outfits[0];
 
-    const randomItem = items[Math.floor(Math.random() * items.length)];
+        Object.entries(apiCategories).forEach(([category, apiCategory]) => {
+          const randomItem = outfit[apiCategory];
+          if (!randomItem) return;
 
-    displayClothing(category, randomItem);
+          displayClothing(category, randomItem);
 
-    // optional: Index sauber setzen für Save-Logik
-    currentIndex[category] = items.findIndex(
-      i => i._id === randomItem._id
-    );
-  });
+          // optional: Index sauber setzen für Save-Logik
+          currentIndex[category] = shuffledClothing[category].findIndex(
+            i => i._id === randomItem._id
+          );
+        });
 
-  console.log('MisMatch Outfit generated!');
+        console.log('MisMatch Outfit generated! (seed ' + data.seed + ')');
+      })
+      .catch(error => {
+        alert('Error generating outfit: ' + error);
+      });
 }
 
 // Save Outfit Function
@@ -174,9 +238,8 @@ document.getElementById('upload-form').addEventListener('submit', function(e) {
       .then(response => response.json())
       .then(data => {
         if (data.success) {
-          alert('Clothing uploaded successfully! Refresh to see it.');
           closeUploadModal();
-          location.reload();
+          waitForUpload(data.item_id);
         } else {
           alert('Error: ' + data.error);
         }
@@ -186,6 +249,32 @@ document.getElementById('upload-form').addEventListener('submit', function(e) {
       });
 });
 
+// The image is processed in the background, poll until it is ready (at most UPLOAD_POLL_LIMIT times)
+const UPLOAD_POLL_INTERVAL = 1000;
+const UPLOAD_POLL_LIMIT = 120;
+
+function waitForUpload(itemId, attempts = 0) {
+  if (attempts >= UPLOAD_POLL_LIMIT) {
+    alert('Your upload is still being processed, reload the page in a moment to see it.');
+    return;
+  }
+  fetch('/api/upload-status/' + itemId)
+      .then(response => response.json())
+      .then(data => {
+        if (data.status === 'pending') {
+          setTimeout(() => waitForUpload(itemId, attempts + 1), UPLOAD_POLL_INTERVAL);
+        } else if (data.status === 'ready') {
+          alert('Clothing uploaded successfully!');
+          location.reload();
+        } else {
+          alert('Error: ' + (data.error || 'Upload failed'));
+        }
+      })
+      .catch(error => {
+        alert('Error checking the upload: ' + error);
+      });
+}
+
 // Close modal when clicking outside
 window.onclick = function(event) {
   const modal = document.getElementById('upload-modal');
@@ -269,7 +358,10 @@ function renderGrid(category, items) {
 
   items.forEach(item => {
     const img = document.createElement('img');
-    img.src = '/' + item.image_path;
+    img.src = item.image_url;
+    img.srcset = thumbnailSrcset(item);
+    img.sizes = '110px';
+    img.loading = 'lazy';
 
     img.onclick = () => {
       displayClothing(category, item);
@@ -280,6 +372,28 @@ function renderGrid(category, items) {
   });
 }
 
+// Items that look like the shown one (/api/similar), listed in the filter panel
+function showSimilar(category, itemId) {
+  fetch('/api/similar/' + itemId)
+      .then(response => response.json())
+      .then(data => {
+        if (data.error) {
+          alert('Error: ' + data.error);
+          return;
+        }
+
+        const panel = document.getElementById(`panel-${category}`);
+        if (panel.style.display !== 'block') {
+          togglePanel(category);
+        }
+        activeClothing[category] = data.items.map(result => result.item);
+        renderGrid(category, activeClothing[category]);
+      })
+      .catch(error => {
+        alert('Error: ' + error);
+      });
+}
+
 // ============================================
 // HAMBURGER MENU
 // ============================================